@@ -14,6 +14,7 @@ import json
 
 # Import core modules
 from core.preprocess import clean_text
+from core.signals._input import SignalInput
 from core.signals.emotion import EmotionDetector
 from core.signals.cta import CTADetector
 from core.signals.toxicity import ToxicityDetector
@@ -304,11 +305,14 @@ async def analyze_content(request: ContentRequest, background_tasks: BackgroundT
         # Run analysis
         processed = clean_text(request.text)
         
-        emotion_result = detectors['emotion'].detect(processed['cleaned'])
-        cta_result = detectors['cta'].detect(processed['cleaned'])
-        toxicity_result = detectors['toxicity'].detect(processed['cleaned'])
-        context_result = detectors['context'].detect(processed['cleaned'])
-        child_result = detectors['child_safety'].detect(processed['cleaned'])
+        # Shared by every detector (lowercased once)
+        signal_input = SignalInput(processed['cleaned'], processed['lowercase'])
+        
+        emotion_result = detectors['emotion'].detect(signal_input)
+        cta_result = detectors['cta'].detect(signal_input)
+        toxicity_result = detectors['toxicity'].detect(signal_input)
+        context_result = detectors['context'].detect(signal_input)
+        child_result = detectors['child_safety'].detect(signal_input)
         
         signals = {
             'emotion_score': emotion_result['emotion_score'],
@@ -361,8 +365,8 @@ async def analyze_content(request: ContentRequest, background_tasks: BackgroundT
         # Add blockchain info to response
         blockchain_info = {
             'logged': execution_result.get('blockchain_logged', False),
-            'tx_hash': execution_result.get('tx_hash'),
-            'ipfs_hash': execution_result.get('ipfs_hash')
+            'queued': execution_result.get('blockchain_queued', False),
+            'tx_hash': execution_result.get('tx_hash')
         }
         
         response = AnalysisResponse(
@@ -14,6 +14,7 @@ import io
 
 # Import core modules
 from core.preprocess import clean_text
+from core.signals._input import SignalInput
 from core.signals.emotion import EmotionDetector
 from core.signals.cta import CTADetector
 from core.signals.toxicity import ToxicityDetector
@@ -22,11 +23,11 @@ from core.signals.child_safety import ChildSafetyDetector
 from core.scoring import calculate_harm_score, get_harm_categories
 from core.explain import generate_reasons, generate_evidence_highlights, generate_causal_chain
 from core.actions import recommend_action, get_guardrails_notice, format_action_card
-from core.database import ModerationDatabase
+from core.database import get_database
 import uuid
 
 # Initialize shared database
-db = ModerationDatabase()
+db = get_database()
 
 # Page configuration
 st.set_page_config(
@@ -206,11 +207,14 @@ def analyze_content(text: str, detectors: dict) -> dict:
     processed = clean_text(text)
     
     # Extract signals
-    emotion_result = detectors['emotion'].detect(processed['cleaned'])
-    cta_result = detectors['cta'].detect(processed['cleaned'])
-    toxicity_result = detectors['toxicity'].detect(processed['cleaned'])
-    context_result = detectors['context'].detect(processed['cleaned'])
-    child_result = detectors['child_safety'].detect(processed['cleaned'])
+    # Shared by every detector (lowercased once)
+    signal_input = SignalInput(processed['cleaned'], processed['lowercase'])
+    
+    emotion_result = detectors['emotion'].detect(signal_input)
+    cta_result = detectors['cta'].detect(signal_input)
+    toxicity_result = detectors['toxicity'].detect(signal_input)
+    context_result = detectors['context'].detect(signal_input)
+    child_result = detectors['child_safety'].detect(signal_input)
     
     # Combine signals
     signals = {
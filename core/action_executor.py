@@ -6,7 +6,7 @@ This is what makes it production-ready, not just analysis
 import requests
 from typing import Dict, Optional
 from datetime import datetime
-from .database import ModerationDatabase
+from .database import ModerationDatabase, QUEUED_PRIORITIES
 from .blockchain import BlockchainAuditManager, LocalBlockchainSimulator
 import os
 
@@ -68,72 +68,63 @@ class ActionExecutor:
             "queue_added": False,
             "webhook_sent": False,
             "blockchain_logged": False,
-            "ipfs_hash": None,
+            "blockchain_queued": False,
             "tx_hash": None,
             "errors": []
         }
         
-        # 1. Save to database
+        # 1. Save to database and route to the moderation queue (one transaction)
         try:
-            saved = self.db.save_analysis(content_id, analysis, request_data)
+            saved = self.db.save_analyses_batch([(content_id, analysis, request_data)])[0]
             results["database_saved"] = saved
             if saved:
                 self.db.log_action(content_id, "analysis_saved", "success")
+                if analysis['priority'] in QUEUED_PRIORITIES:
+                    results["queue_added"] = True
+                    self.db.log_action(content_id, "added_to_queue", analysis['queue'])
         except Exception as e:
             results["errors"].append(f"Database save failed: {e}")
         
-        # 2. Add to moderation queue if needed
-        if analysis['priority'] in ['HIGH', 'CRITICAL', 'MEDIUM']:
-            try:
-                self.db.add_to_queue(
-                    content_id,
-                    analysis['queue'],
-                    analysis['priority']
-                )
-                results["queue_added"] = True
-                self.db.log_action(content_id, "added_to_queue", analysis['queue'])
-            except Exception as e:
-                results["errors"].append(f"Queue add failed: {e}")
-        
-        # 3. Send webhook notifications
+        # 2. Send webhook notifications
         webhook_result = self._send_webhooks(content_id, analysis)
         results["webhook_sent"] = webhook_result['sent']
         if webhook_result.get('error'):
             results["errors"].append(webhook_result['error'])
         
-        # 4. Log to blockchain with IPFS storage
+        # 3. Queue blockchain logging with IPFS storage (runs in background)
         if self.blockchain:
             try:
-                tx_hash = self.blockchain.log_analysis_to_blockchain(
+                pending = self.blockchain.log_analysis_to_blockchain(
                     content_id,
                     analysis,
                     request_data.get('text', '')
                 )
                 
-                if tx_hash:
-                    results["blockchain_logged"] = True
-                    results["tx_hash"] = tx_hash
-                    
-                    # Get IPFS hash if available
-                    if hasattr(self.blockchain, 'store_to_ipfs'):
-                        audit_data = {
-                            "content_id": content_id,
-                            "analysis": analysis,
-                            "timestamp": datetime.utcnow().isoformat()
-                        }
-                        ipfs_hash = self.blockchain.store_to_ipfs(audit_data)
-                        results["ipfs_hash"] = ipfs_hash
-                    
-                    self.db.log_action(
-                        content_id,
-                        "blockchain_logged",
-                        f"tx: {tx_hash}"
+                if pending:
+                    results["blockchain_queued"] = True
+                    pending.add_done_callback(
+                        lambda future: self._on_blockchain_logged(content_id, future)
                     )
             except Exception as e:
                 results["errors"].append(f"Blockchain logging failed: {e}")
         
         return results
     
+    def _on_blockchain_logged(self, content_id: str, future):
+        """Record the outcome of a queued blockchain log"""
+        try:
+            tx_hash = future.result()
+        except Exception as e:
+            self.db.log_action(content_id, "blockchain_logged", "failed", str(e))
+            return
+        
+        if tx_hash:
+            self.db.log_action(
+                content_id,
+                "blockchain_logged",
+                f"tx: {tx_hash}"
+            )
+    
     def execute_escalation_actions(self,
                                    content_id: str,
                                    reviewer_address: str,
@@ -313,7 +304,7 @@ class ActionExecutor:
         )
         
         # Log action
-        queue_items = self.db.get_queue_items()
+        queue_items = self.db.get_queue_items(as_dicts=False)
         content_id = None
         for item in queue_items:
             if item['id'] == queue_id:
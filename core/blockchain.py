@@ -12,12 +12,69 @@ except ImportError:
         from web3.middleware import ExtraDataToPOAMiddleware as geth_poa_middleware
     except ImportError:
         geth_poa_middleware = None
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    # Fall back to requests' built-in (buffered) multipart encoding
+    MultipartEncoder = None
+try:
+    import requests_unixsocket
+except ImportError:
+    # Unix-socket IPFS transport unavailable; use TCP
+    requests_unixsocket = None
 import json
 import hashlib
+import atexit
+import threading
+import asyncio
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Optional, List
+from io import BytesIO
+from urllib.parse import quote
 import os
 from pathlib import Path
+try:
+    import fcntl
+except ImportError:
+    # Not POSIX; appends are only serialized within this process
+    fcntl = None
+
+
+@lru_cache(maxsize=64)
+def _is_checksum_address(address: str) -> bool:
+    """Memoized EIP-55 checksum validation"""
+    return Web3.is_checksum_address(address)
+
+
+class _LRUCache:
+    """Small thread-safe LRU cache for immutable audit lookups"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key):
+        with self._lock:
+            return self._data.pop(key, None)
 
 
 class BlockchainAuditManager:
@@ -28,11 +85,39 @@ class BlockchainAuditManager:
     - Provides immutable proof of moderation decisions
     """
     
+    # Default Kubo API socket when IPFS runs on the same host
+    IPFS_API_SOCKET = "/var/run/ipfs/api.sock"
+    
+    # Content-serving peers to keep connected to (Kubo Peering.Peers)
+    IPFS_PEERS = [
+        {
+            "ID": "QmcfgsJsMtx6qJb74akCw1M24X1zFwgGo11h1cuhwQjtJP",
+            "Addrs": ["/ip6/2606:4700:60::6/tcp/4009", "/ip4/172.65.0.13/tcp/4009"]
+        }
+    ]
+    
+    # Gas limits used when estimation is unavailable
+    DEFAULT_LOG_GAS = 200000
+    DEFAULT_ESCALATE_GAS = 150000
+    GAS_BUFFER = 1.2
+    
+    # Seconds close() waits for queued audits, so a stuck IPFS or RPC call
+    # cannot hang interpreter exit
+    CLOSE_TIMEOUT = 10.0
+    
+    # Most queued audits a worker uploads in one IPFS add request
+    IPFS_BATCH_SIZE = 32
+    
     def __init__(self, 
                  provider_url: str = None,
                  contract_address: str = None,
                  private_key: str = None,
-                 ipfs_gateway: str = "http://127.0.0.1:5001"):
+                 ipfs_gateway: str = "http://127.0.0.1:5001",
+                 ipfs_workers: int = 4,
+                 queue_size: int = 1024,
+                 ipfs_socket: str = None,
+                 ipfs_auto_peer: bool = False,
+                 connected_ttl: float = 1.0):
         """
         Initialize blockchain connection
         
@@ -41,12 +126,43 @@ class BlockchainAuditManager:
             contract_address: Deployed smart contract address
             private_key: Private key for signing transactions
             ipfs_gateway: IPFS API gateway URL
+            ipfs_workers: Number of background workers draining audit logs
+            queue_size: Maximum number of audit logs waiting to be drained
+            ipfs_socket: Kubo API unix socket path (used instead of TCP if present)
+            ipfs_auto_peer: Configure IPFS peering with content-serving nodes
+            connected_ttl: Seconds to reuse the result of is_connected()
         """
         # Load from environment if not provided
         self.provider_url = provider_url or os.getenv('ETH_PROVIDER_URL', 'http://127.0.0.1:8545')
         self.contract_address = contract_address or os.getenv('CONTRACT_ADDRESS')
         self.private_key = private_key or os.getenv('ETH_PRIVATE_KEY')
         self.ipfs_gateway = ipfs_gateway
+        self.ipfs_workers = ipfs_workers
+        self.queue_size = queue_size
+        self.connected_ttl = connected_ttl
+        self._conn_cache = (False, 0.0)
+        
+        # IPFS transport: colocated Kubo unix socket if available, else TCP
+        self.ipfs_socket = ipfs_socket or os.getenv('IPFS_API_SOCKET', self.IPFS_API_SOCKET)
+        self._ipfs_session = None
+        self._ipfs_api = self.ipfs_gateway
+        if requests_unixsocket and os.path.exists(self.ipfs_socket):
+            self._ipfs_session = requests_unixsocket.Session()
+            self._ipfs_api = f"http+unix://{quote(self.ipfs_socket, safe='')}"
+        
+        if ipfs_auto_peer:
+            self._configure_peering()
+        
+        # Background audit pipeline (started on first use)
+        self._loop = None
+        self._queue = None
+        self._loop_lock = threading.Lock()
+        self._tx_lock = threading.Lock()
+        
+        # On-chain records are immutable and IPFS content is content-addressed,
+        # so repeated verifications can be served from memory
+        self._audit_cache = _LRUCache(4096)
+        self._ipfs_cache = _LRUCache(2048)
         
         # Initialize Web3
         self.w3 = Web3(Web3.HTTPProvider(self.provider_url))
@@ -64,6 +180,10 @@ class BlockchainAuditManager:
         else:
             self.account = None
         
+        # Cached gas limits (estimated once, refreshed on out-of-gas)
+        self._log_gas = self.DEFAULT_LOG_GAS
+        self._escalate_gas = None
+        
         # Load smart contract
         self.contract = None
         if self.contract_address:
@@ -74,11 +194,44 @@ class BlockchainAuditManager:
         # Contract ABI (simplified for audit logging)
         abi = self._get_contract_abi()
         
-        if self.w3.is_checksum_address(self.contract_address):
+        if _is_checksum_address(self.contract_address):
             self.contract = self.w3.eth.contract(
                 address=self.contract_address,
                 abi=abi
             )
+            
+            # Estimate logAnalysis gas once against a representative payload
+            if self.account:
+                self._log_gas = self._estimate_gas(
+                    self.contract.functions.logAnalysis(
+                        f"content_{'0' * 13}",
+                        "Qm" + "1" * 44,
+                        100,
+                        "Human Review Required",
+                        b"\0" * 32
+                    )
+                ) or self.DEFAULT_LOG_GAS
+    
+    def _estimate_gas(self, contract_call) -> Optional[int]:
+        """
+        Estimate gas for a contract call, padded with GAS_BUFFER
+        
+        Args:
+            contract_call: Bound contract function call
+            
+        Returns:
+            Gas limit or None if estimation failed
+        """
+        try:
+            estimate = contract_call.estimate_gas({'from': self.account.address})
+            return int(estimate * self.GAS_BUFFER)
+        except Exception as e:
+            print(f"Gas estimation failed: {e}")
+            return None
+    
+    def _ran_out_of_gas(self, receipt, txn: dict) -> bool:
+        """Check whether a failed transaction consumed its whole gas limit"""
+        return receipt['status'] != 1 and receipt['gasUsed'] >= txn['gas']
     
     def _get_contract_abi(self) -> List[Dict]:
         """
@@ -150,11 +303,19 @@ class BlockchainAuditManager:
         ]
     
     def is_connected(self) -> bool:
-        """Check if connected to blockchain"""
+        """Check if connected to blockchain (cached for connected_ttl seconds)"""
+        value, checked_at = self._conn_cache
+        now = time.monotonic()
+        if now - checked_at < self.connected_ttl:
+            return value
+        
         try:
-            return self.w3.is_connected()
+            value = self.w3.is_connected()
         except:
-            return False
+            value = False
+        
+        self._conn_cache = (value, now)
+        return value
     
     def get_balance(self, address: str = None) -> float:
         """Get ETH balance of address"""
@@ -165,18 +326,93 @@ class BlockchainAuditManager:
         balance_wei = self.w3.eth.get_balance(addr)
         return self.w3.from_wei(balance_wei, 'ether')
     
-    def hash_data(self, data: dict) -> str:
+    def _canonicalize(self, data: dict) -> bytes:
+        """
+        Serialize data to the canonical byte form used for hashing and IPFS
+        
+        Args:
+            data: Dictionary to serialize
+            
+        Returns:
+            UTF-8 encoded JSON with sorted keys
+        """
+        return json.dumps(data, sort_keys=True).encode()
+    
+    def hash_data(self, data: dict) -> bytes:
         """
         Create SHA-256 hash of data for integrity verification
         
+        Args:
+            data: Dictionary to hash
+            
+        Returns:
+            Raw 32-byte digest (usable directly as a bytes32 argument)
+        """
+        return hashlib.sha256(self._canonicalize(data)).digest()
+    
+    def hash_data_hex(self, data: dict) -> str:
+        """
+        Create SHA-256 hash of data as a hex string
+        
         Args:
             data: Dictionary to hash
             
         Returns:
             Hex string of hash
         """
-        data_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+        return self.hash_data(data).hex()
+    
+    def _get_ipfs_session(self):
+        """Return the shared HTTP session used for IPFS API calls"""
+        if self._ipfs_session is None:
+            import requests
+            self._ipfs_session = requests.Session()
+        return self._ipfs_session
+    
+    def _configure_peering(self):
+        """Add IPFS_PEERS to the Kubo peering config (best effort)"""
+        try:
+            self._get_ipfs_session().post(
+                f"{self._ipfs_api}/api/v0/config",
+                params=[
+                    ('arg', 'Peering.Peers'),
+                    ('arg', json.dumps(self.IPFS_PEERS)),
+                    ('json', 'true')
+                ],
+                timeout=5
+            )
+        except Exception:
+            pass  # Config API not exposed; peering is an optimization only
+    
+    def _post_to_ipfs(self, files: List[tuple]):
+        """
+        POST one or more files to the IPFS add endpoint
+        
+        Args:
+            files: List of (filename, payload bytes) tuples
+            
+        Returns:
+            requests.Response from the IPFS API
+        """
+        session = self._get_ipfs_session()
+        url = f"{self._ipfs_api}/api/v0/add"
+        
+        if MultipartEncoder is None:
+            return session.post(url, files=[
+                ('file', (name, BytesIO(payload), 'application/json'))
+                for name, payload in files
+            ])
+        
+        # Stream the multipart body instead of assembling it in memory
+        encoder = MultipartEncoder(fields=[
+            ('file', (name, BytesIO(payload), 'application/json'))
+            for name, payload in files
+        ])
+        return session.post(
+            url,
+            data=encoder,
+            headers={'Content-Type': encoder.content_type}
+        )
     
     def store_to_ipfs(self, data: dict) -> Optional[str]:
         """
@@ -189,17 +425,7 @@ class BlockchainAuditManager:
             IPFS hash (CID) or None if failed
         """
         try:
-            import requests
-            
-            # Convert to JSON
-            json_data = json.dumps(data, indent=2)
-            
-            # Upload to IPFS
-            files = {'file': json_data}
-            response = requests.post(
-                f"{self.ipfs_gateway}/api/v0/add",
-                files=files
-            )
+            response = self._post_to_ipfs([('audit.json', self._canonicalize(data))])
             
             if response.status_code == 200:
                 result = response.json()
@@ -212,6 +438,45 @@ class BlockchainAuditManager:
             print(f"IPFS storage error: {e}")
             return None
     
+    def store_batch_to_ipfs(self, items: List[dict]) -> List[Optional[str]]:
+        """
+        Store several records to IPFS in a single add request
+        
+        Args:
+            items: Dictionaries to store
+            
+        Returns:
+            IPFS hashes (CIDs) in input order, None for any that failed
+        """
+        hashes = [None] * len(items)
+        if not items:
+            return hashes
+        
+        try:
+            response = self._post_to_ipfs([
+                (f"audit_{i}.json", self._canonicalize(item))
+                for i, item in enumerate(items)
+            ])
+            
+            if response.status_code != 200:
+                print(f"IPFS batch upload failed: {response.text}")
+                return hashes
+            
+            # Kubo returns one JSON object per added file
+            for line in response.text.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                name = result.get('Name', '')
+                if name.startswith('audit_') and name.endswith('.json'):
+                    hashes[int(name[len('audit_'):-len('.json')])] = result['Hash']
+            
+            return hashes
+            
+        except Exception as e:
+            print(f"IPFS batch storage error: {e}")
+            return hashes
+    
     def retrieve_from_ipfs(self, ipfs_hash: str) -> Optional[dict]:
         """
         Retrieve data from IPFS
@@ -222,16 +487,20 @@ class BlockchainAuditManager:
         Returns:
             Retrieved data or None
         """
+        cached = self._ipfs_cache.get(ipfs_hash)
+        if cached is not None:
+            return cached
+        
         try:
-            import requests
-            
-            response = requests.post(
-                f"{self.ipfs_gateway}/api/v0/cat",
+            response = self._get_ipfs_session().post(
+                f"{self._ipfs_api}/api/v0/cat",
                 params={'arg': ipfs_hash}
             )
             
             if response.status_code == 200:
-                return json.loads(response.text)
+                data = json.loads(response.text)
+                self._ipfs_cache.put(ipfs_hash, data)
+                return data
             else:
                 return None
                 
@@ -239,12 +508,134 @@ class BlockchainAuditManager:
             print(f"IPFS retrieval error: {e}")
             return None
     
+    def _start_workers(self):
+        """Start the event loop thread and the audit drain workers"""
+        with self._loop_lock:
+            if self._loop is not None:
+                return
+            
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True).start()
+            
+            async def _setup():
+                self._queue = asyncio.Queue(maxsize=self.queue_size)
+                self._workers = [
+                    asyncio.create_task(self._drain())
+                    for _ in range(self.ipfs_workers)
+                ]
+            
+            asyncio.run_coroutine_threadsafe(_setup(), loop).result()
+            self._loop = loop
+            atexit.register(self.close)
+    
+    async def _drain(self):
+        """Worker coroutine: push queued audits to IPFS and the chain"""
+        while True:
+            # Also take whatever is already waiting, so one IPFS add request
+            # uploads the whole batch
+            batch = [await self._queue.get()]
+            while len(batch) < self.IPFS_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                # Callers may have cancelled their Futures while queued
+                live = [item for item in batch if item[0].set_running_or_notify_cancel()]
+                if live:
+                    await self._async_log(live)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _async_log(self, items: List[tuple]):
+        """Run the blocking IPFS upload and transactions off the event loop"""
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        
+        def _resolve():
+            if not done.done():  # the worker may have been cancelled by close()
+                done.set_result(None)
+        
+        def _run():
+            try:
+                self._log_batch_sync(items)
+            finally:
+                loop.call_soon_threadsafe(_resolve)
+        
+        # A daemon thread rather than the default executor: interpreter exit
+        # joins executor threads, so one stuck IPFS/RPC call would hang it.
+        # The thread resolves the callers' Futures itself, so they still
+        # complete if close() stops waiting for it.
+        threading.Thread(target=_run, name="audit-log", daemon=True).start()
+        await done
+    
+    def _log_batch_sync(self, items: List[tuple]):
+        """
+        Log queued audits, uploading them to IPFS in one request (blocking)
+        
+        Args:
+            items: (future, content_id, analysis, audit_data) queue entries;
+                each future is resolved with its transaction hash
+        """
+        if len(items) > 1:
+            ipfs_hashes = self.store_batch_to_ipfs([audit_data for _, _, _, audit_data in items])
+        else:
+            ipfs_hashes = [None]
+        
+        # Records the batch upload missed are retried one by one
+        for (future, content_id, analysis, audit_data), ipfs_hash in zip(items, ipfs_hashes):
+            try:
+                future.set_result(
+                    self._log_analysis_sync(content_id, analysis, audit_data, ipfs_hash)
+                )
+            except Exception as e:
+                future.set_exception(e)
+    
+    def flush(self, timeout: float = None):
+        """
+        Block until every queued audit has been written
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        """
+        if self._loop is None:
+            return
+        
+        try:
+            asyncio.run_coroutine_threadsafe(
+                self._queue.join(), self._loop
+            ).result(timeout)
+        except FutureTimeoutError:
+            print(f"Audit queue flush timed out after {timeout}s with audits still pending")
+        except Exception as e:
+            print(f"Audit queue flush error: {e}")
+    
+    def close(self):
+        """Drain pending audits (up to CLOSE_TIMEOUT seconds) and stop the background workers"""
+        if self._loop is None:
+            return
+        
+        self.flush(self.CLOSE_TIMEOUT)
+        
+        async def _shutdown():
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(), self._loop).result(self.CLOSE_TIMEOUT)
+        except Exception as e:
+            print(f"Audit worker shutdown error: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+    
     def log_analysis_to_blockchain(self, 
                                    content_id: str,
                                    analysis: dict,
-                                   content_text: str) -> Optional[str]:
+                                   content_text: str) -> Optional[Future]:
         """
-        Log content analysis to blockchain with IPFS storage
+        Queue content analysis for blockchain logging with IPFS storage
+        
+        The IPFS upload and transaction run on background workers so the
+        moderation pipeline is not blocked on network latency.
         
         Args:
             content_id: Unique content identifier
@@ -252,63 +643,111 @@ class BlockchainAuditManager:
             content_text: Original content text
             
         Returns:
-            Transaction hash or None if failed
+            Future resolving to the transaction hash (or None if logging
+            failed), or None if blockchain is not configured. When all
+            queue_size slots are taken the record is logged synchronously
+            before returning, which also slows the caller down.
         """
         if not self.contract or not self.account:
             print("Blockchain not configured. Skipping on-chain logging.")
             return None
         
-        try:
-            # Prepare audit data
-            audit_data = {
-                "content_id": content_id,
-                "content_text": content_text,
-                "risk_score": analysis['risk_score'],
-                "risk_label": analysis['risk_label'],
-                "categories": analysis['categories'],
-                "action": analysis['action'],
-                "priority": analysis['priority'],
-                "reasons": analysis['reasons'],
-                "timestamp": datetime.utcnow().isoformat(),
-                "system_version": "HarmLens v1.0"
-            }
+        self._start_workers()
+        
+        # Prepare audit data (timestamped at decision time, not upload time)
+        audit_data = {
+            "content_id": content_id,
+            "content_text": content_text,
+            "risk_score": analysis['risk_score'],
+            "risk_label": analysis['risk_label'],
+            "categories": analysis['categories'],
+            "action": analysis['action'],
+            "priority": analysis['priority'],
+            "reasons": analysis['reasons'],
+            "timestamp": datetime.utcnow().isoformat(),
+            "system_version": "HarmLens v1.0"
+        }
+        
+        future = Future()
+        accepted = Future()
+        
+        def _enqueue():
+            try:
+                self._queue.put_nowait((future, content_id, analysis, audit_data))
+                accepted.set_result(True)
+            except asyncio.QueueFull:
+                accepted.set_result(False)
+        
+        self._loop.call_soon_threadsafe(_enqueue)
+        if not accepted.result():
+            print(f"Audit queue full ({self.queue_size}); logging {content_id} synchronously")
+            try:
+                future.set_result(self._log_analysis_sync(content_id, analysis, audit_data))
+            except Exception as e:
+                future.set_exception(e)
+        return future
+    
+    def _log_analysis_sync(self,
+                           content_id: str,
+                           analysis: dict,
+                           audit_data: dict,
+                           ipfs_hash: str = None) -> Optional[str]:
+        """
+        Store audit data to IPFS and log it on-chain (blocking)
+        
+        Args:
+            content_id: Unique content identifier
+            analysis: Analysis result dictionary
+            audit_data: Audit payload stored on IPFS
+            ipfs_hash: CID if audit_data was already uploaded (batch path)
             
+        Returns:
+            Transaction hash or None if failed
+        """
+        try:
             # Store full data to IPFS
-            ipfs_hash = self.store_to_ipfs(audit_data)
+            if not ipfs_hash:
+                ipfs_hash = self.store_to_ipfs(audit_data)
             if not ipfs_hash:
                 print("IPFS storage failed")
                 return None
             
-            # Create data hash for integrity
+            # Create data hash for integrity (bytes32)
             data_hash = self.hash_data(audit_data)
-            data_hash_bytes = bytes.fromhex(data_hash)
             
-            # Build transaction
-            txn = self.contract.functions.logAnalysis(
+            # Nonce lookup and send must not interleave across workers
+            contract_call = self.contract.functions.logAnalysis(
                 content_id,
                 ipfs_hash,
                 analysis['risk_score'],
                 analysis['action'],
-                data_hash_bytes
-            ).build_transaction({
-                'from': self.account.address,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-                'gas': 200000,
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            # Sign and send transaction
-            signed_txn = self.w3.eth.account.sign_transaction(txn, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+                data_hash
+            )
+            
+            with self._tx_lock:
+                # Build transaction
+                txn = contract_call.build_transaction({
+                    'from': self.account.address,
+                    'nonce': self.w3.eth.get_transaction_count(self.account.address, 'pending'),
+                    'gas': self._log_gas,
+                    'gasPrice': self.w3.eth.gas_price
+                })
+                
+                # Sign and send transaction
+                signed_txn = self.w3.eth.account.sign_transaction(txn, self.private_key)
+                tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
             
             # Wait for confirmation
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
             
             if receipt['status'] == 1:
+                self.invalidate(content_id)
                 print(f"✓ Analysis logged to blockchain: {tx_hash.hex()}")
                 print(f"✓ Content stored on IPFS: {ipfs_hash}")
                 return tx_hash.hex()
             else:
+                if self._ran_out_of_gas(receipt, txn):
+                    self._log_gas = self._estimate_gas(contract_call) or self._log_gas
                 print(f"Transaction failed: {receipt}")
                 return None
                 
@@ -337,22 +776,29 @@ class BlockchainAuditManager:
             return None
         
         try:
-            # Build transaction
-            txn = self.contract.functions.logEscalation(
+            contract_call = self.contract.functions.logEscalation(
                 content_id,
                 reviewer_address,
                 decision,
                 notes
-            ).build_transaction({
-                'from': self.account.address,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-                'gas': 150000,
-                'gasPrice': self.w3.eth.gas_price
-            })
+            )
             
-            # Sign and send
-            signed_txn = self.w3.eth.account.sign_transaction(txn, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            # logEscalation needs an existing record, so estimate on first use
+            if self._escalate_gas is None:
+                self._escalate_gas = self._estimate_gas(contract_call) or self.DEFAULT_ESCALATE_GAS
+            
+            with self._tx_lock:
+                # Build transaction
+                txn = contract_call.build_transaction({
+                    'from': self.account.address,
+                    'nonce': self.w3.eth.get_transaction_count(self.account.address, 'pending'),
+                    'gas': self._escalate_gas,
+                    'gasPrice': self.w3.eth.gas_price
+                })
+                
+                # Sign and send
+                signed_txn = self.w3.eth.account.sign_transaction(txn, self.private_key)
+                tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
             
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
             
@@ -360,6 +806,8 @@ class BlockchainAuditManager:
                 print(f"✓ Escalation logged to blockchain: {tx_hash.hex()}")
                 return tx_hash.hex()
             else:
+                if self._ran_out_of_gas(receipt, txn):
+                    self._escalate_gas = self._estimate_gas(contract_call) or self._escalate_gas
                 return None
                 
         except Exception as e:
@@ -379,20 +827,41 @@ class BlockchainAuditManager:
         if not self.contract:
             return None
         
+        cached = self._audit_cache.get(content_id)
+        if cached is not None:
+            return dict(cached)
+        
         try:
             result = self.contract.functions.getAuditRecord(content_id).call()
             
-            return {
+            record = {
                 "ipfs_hash": result[0],
                 "risk_score": result[1],
                 "action": result[2],
                 "timestamp": result[3],
                 "auditor": result[4]
             }
+            
+            # Only cache records that actually exist on-chain
+            if record["ipfs_hash"]:
+                self._audit_cache.put(content_id, record)
+            
+            return dict(record)
         except Exception as e:
             print(f"Error retrieving audit record: {e}")
             return None
     
+    def invalidate(self, content_id: str):
+        """
+        Drop cached lookups for a content ID (e.g. after it is re-logged)
+        
+        Args:
+            content_id: Content identifier
+        """
+        record = self._audit_cache.pop(content_id)
+        if record:
+            self._ipfs_cache.pop(record["ipfs_hash"])
+    
     def verify_audit_integrity(self, content_id: str) -> bool:
         """
         Verify audit record integrity by comparing blockchain hash with IPFS data
@@ -415,7 +884,7 @@ class BlockchainAuditManager:
                 return False
             
             # Compute hash and compare
-            computed_hash = self.hash_data(ipfs_data)
+            computed_hash = self.hash_data_hex(ipfs_data)
             
             # In production, you'd compare with stored hash from blockchain
             print(f"Data hash: {computed_hash}")
@@ -429,15 +898,16 @@ class BlockchainAuditManager:
     
     def get_blockchain_stats(self) -> Dict:
         """Get blockchain integration statistics"""
+        connected = self.is_connected()
         stats = {
-            "connected": self.is_connected(),
+            "connected": connected,
             "network": "Unknown",
             "account": self.account.address if self.account else None,
             "balance": 0.0,
             "contract_deployed": self.contract is not None
         }
         
-        if self.is_connected():
+        if connected:
             try:
                 stats["network"] = self.w3.eth.chain_id
                 if self.account:
@@ -453,66 +923,173 @@ class LocalBlockchainSimulator:
     """
     Simulates blockchain functionality for development/testing
     Stores records locally with cryptographic hashing
+
+    Blocks are appended to a JSONL file (one block per line) and an
+    in-memory content_id -> file offset index gives O(1) lookups. Several
+    simulators (e.g. the API server and a dashboard) may share one
+    storage_path: appends hold an exclusive file lock, and blocks another
+    simulator wrote are indexed before every append or lookup.
     """
     
     def __init__(self, storage_path: str = "blockchain_sim"):
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(exist_ok=True)
-        self.audit_file = self.storage_path / "audit_chain.json"
+        self.audit_file = self.storage_path / "audit_chain.jsonl"
+        self.index_file = self.storage_path / "audit_chain.idx.json"
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._block_count = 0
+        self._last_hash = "0" * 64
+        self._indexed_size = 0
         self._init_chain()
+        atexit.register(self.close)
     
     def _init_chain(self):
-        """Initialize local chain file"""
+        """Initialize local chain file and build the content_id index"""
+        legacy_file = self.storage_path / "audit_chain.json"
         if not self.audit_file.exists():
-            self.audit_file.write_text(json.dumps({"blocks": []}, indent=2))
+            if legacy_file.exists():
+                self._migrate_legacy_chain(legacy_file)
+            else:
+                self.audit_file.touch()
+        
+        self._fh = open(self.audit_file, "rb")
+        if not self._load_index():
+            self._rebuild_index()
+        self._sync()
+    
+    def _migrate_legacy_chain(self, legacy_file: Path):
+        """Convert the old single-document audit_chain.json into JSONL"""
+        blocks = json.loads(legacy_file.read_text()).get("blocks", [])
+        with open(self.audit_file, "w") as fh:
+            for block in blocks:
+                fh.write(json.dumps(block) + "\n")
+    
+    def _rebuild_index(self):
+        """Scan the chain once, recording the offset of each content_id"""
+        self._index = {}
+        self._block_count = 0
+        self._last_hash = "0" * 64
+        self._indexed_size = 0
+        self._index_tail()
+    
+    def _index_tail(self):
+        """Index the complete blocks written after _indexed_size"""
+        self._fh.seek(self._indexed_size)
+        offset = self._indexed_size
+        for line in self._fh:
+            if not line.endswith(b"\n"):
+                break  # another writer is mid-append; index it next time
+            if line.strip():
+                block = json.loads(line)
+                self._index.setdefault(block.get("content_id"), offset)
+                self._block_count += 1
+                self._last_hash = block["hash"]
+            offset += len(line)
+        self._indexed_size = offset
+    
+    def _sync(self):
+        """Catch the index up with blocks other simulators appended (caller holds _lock)"""
+        size = self.audit_file.stat().st_size
+        if size < self._indexed_size:
+            self._rebuild_index()  # chain file was replaced
+        elif size > self._indexed_size:
+            self._index_tail()
+    
+    def _load_index(self) -> bool:
+        """Load the sidecar index if it describes a prefix of the current chain file"""
+        if not self.index_file.exists():
+            return False
+        
+        try:
+            saved = json.loads(self.index_file.read_text())
+            if saved["chain_size"] > self.audit_file.stat().st_size:
+                return False
+            self._index = saved["index"]
+            self._block_count = saved["block_count"]
+            self._last_hash = saved["last_hash"]
+            self._indexed_size = saved["chain_size"]
+            return True
+        except Exception:
+            return False
     
-    def _load_chain(self) -> dict:
-        """Load chain from file"""
-        return json.loads(self.audit_file.read_text())
+    def _save_index(self):
+        """Persist the index so the next startup can skip the full scan"""
+        saved = {
+            "chain_size": self._indexed_size,
+            "index": self._index,
+            "block_count": self._block_count,
+            "last_hash": self._last_hash
+        }
+        # Write then rename, so a simulator starting concurrently never
+        # reads a half-written index
+        tmp_file = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(saved))
+        os.replace(tmp_file, self.index_file)
     
-    def _save_chain(self, chain: dict):
-        """Save chain to file"""
-        self.audit_file.write_text(json.dumps(chain, indent=2))
+    def close(self):
+        """Write the sidecar index and release the chain file handle"""
+        with self._lock:
+            if self._fh.closed:
+                return
+            try:
+                self._save_index()
+            except OSError as e:
+                print(f"Could not save audit index: {e}")
+            self._fh.close()
     
-    def hash_data(self, data: dict) -> str:
+    def hash_data(self, data: dict) -> bytes:
         """Hash data"""
         data_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+        return hashlib.sha256(data_str.encode()).digest()
     
     def log_analysis(self, content_id: str, analysis: dict, content_text: str) -> str:
         """Simulate blockchain logging"""
-        chain = self._load_chain()
-        
-        # Create block
-        block = {
-            "block_number": len(chain["blocks"]),
-            "timestamp": datetime.utcnow().isoformat(),
-            "content_id": content_id,
-            "data": {
-                "content_text": content_text,
-                "analysis": analysis
-            },
-            "previous_hash": chain["blocks"][-1]["hash"] if chain["blocks"] else "0" * 64
-        }
-        
-        # Add hash
-        block["hash"] = self.hash_data(block)
-        
-        # Append to chain
-        chain["blocks"].append(block)
-        self._save_chain(chain)
+        with self._lock, open(self.audit_file, "ab") as fh:
+            if fcntl is not None:
+                # Serialize appends with other simulators on this storage_path;
+                # released when fh closes
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            self._sync()
+            
+            # Create block
+            block = {
+                "block_number": self._block_count,
+                "timestamp": datetime.utcnow().isoformat(),
+                "content_id": content_id,
+                "data": {
+                    "content_text": content_text,
+                    "analysis": analysis
+                },
+                "previous_hash": self._last_hash
+            }
+            
+            # Add hash
+            block["hash"] = self.hash_data(block).hex()
+            
+            # Append to chain
+            line = (json.dumps(block) + "\n").encode()
+            fh.seek(0, os.SEEK_END)
+            offset = fh.tell()
+            fh.write(line)
+            fh.flush()
+            
+            self._index.setdefault(content_id, offset)
+            self._block_count += 1
+            self._last_hash = block["hash"]
+            self._indexed_size = offset + len(line)
         
         return block["hash"]
     
     def get_audit_record(self, content_id: str) -> Optional[Dict]:
         """Retrieve audit record"""
-        chain = self._load_chain()
-        
-        for block in chain["blocks"]:
-            if block.get("content_id") == content_id:
-                return block
-        
-        return None
+        with self._lock:
+            self._sync()
+            offset = self._index.get(content_id)
+            if offset is None:
+                return None
+            self._fh.seek(offset)
+            return json.loads(self._fh.readline())
     
     def is_connected(self) -> bool:
         """Always connected in simulation"""
@@ -520,10 +1097,11 @@ class LocalBlockchainSimulator:
     
     def get_blockchain_stats(self) -> Dict:
         """Get simulation stats"""
-        chain = self._load_chain()
+        with self._lock:
+            self._sync()
         return {
             "connected": True,
             "network": "Local Simulation",
-            "total_blocks": len(chain["blocks"]),
+            "total_blocks": self._block_count,
             "mode": "development"
         }
@@ -5,21 +5,348 @@ This is what makes it REAL, not just console logs
 
 import sqlite3
 import json
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib encoder
+    orjson = None
+import queue
+import threading
+import time
+import weakref
 from datetime import datetime
 from typing import List, Dict, Optional
 import os
 
 
+# Applied once per connection: WAL journaling with relaxed fsync, in-memory
+# temp tables, a 64MB page cache and memory-mapped reads
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Priorities that are routed to a human moderation queue
+QUEUED_PRIORITIES = frozenset({'CRITICAL', 'HIGH', 'MEDIUM'})
+
+# Stored sort key for priorities (anything unknown sorts last)
+_PRIORITY_RANK = {'CRITICAL': 1, 'HIGH': 2, 'MEDIUM': 3, 'LOW': 4}
+
+# Tries at committing a queued write batch before it is retried row by row
+_WRITE_BATCH_ATTEMPTS = 2
+
+# INSERT ... RETURNING is available from SQLite 3.35
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Expected review turnaround per escalation priority
+_RESPONSE_TIME_ESTIMATES = {
+    'CRITICAL': '< 1 hour',
+    'HIGH': '2-4 hours',
+    'MEDIUM': '4-8 hours',
+    'LOW': '24-48 hours'
+}
+
+# Statements are kept as module constants so every call reuses the same SQL
+# text and hits the connection's prepared-statement cache
+_INSERT_ANALYSIS_SQL = """
+INSERT INTO content_analysis 
+(content_id, user_id, platform, content_text, risk_score, risk_label, 
+ categories, action, priority, queue, reasons, child_escalation, 
+ processing_time_ms)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_QUEUE_SQL = """
+INSERT INTO moderation_queue (content_id, queue_name, priority, priority_rank)
+VALUES (?, ?, ?, ?)
+"""
+_UPDATE_QUEUE_STATUS_SQL = """
+UPDATE moderation_queue
+SET status = ?, 
+    reviewed_at = CURRENT_TIMESTAMP,
+    assigned_to = COALESCE(?, assigned_to),
+    reviewer_decision = COALESCE(?, reviewer_decision),
+    reviewer_notes = COALESCE(?, reviewer_notes)
+WHERE id = ?
+"""
+_LOG_ACTION_SQL = """
+INSERT INTO action_log (content_id, action_type, action_result, error)
+VALUES (?, ?, ?, ?)
+"""
+_LOG_WEBHOOK_SQL = """
+INSERT INTO webhook_log (content_id, webhook_url, status_code, response)
+VALUES (?, ?, ?, ?)
+"""
+_INSERT_ESCALATION_SQL = """
+INSERT INTO escalations 
+(content_id, escalated_by, escalation_reason, escalation_type, priority, priority_rank, response_time_estimate)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_ESCALATION_RETURNING_SQL = _INSERT_ESCALATION_SQL + "RETURNING id"
+_COUNTERS_SQL = "SELECT name, value FROM counters"
+_ESCALATION_STATS_SQL = """
+SELECT status, COUNT(*) as count
+FROM escalations
+GROUP BY status
+"""
+
+# Hot read paths, also checked with EXPLAIN QUERY PLAN when DEBUG_SQL is set
+_QUEUE_BY_NAME_SQL = """
+SELECT q.*, c.content_text, c.risk_score, c.reasons
+FROM moderation_queue q
+JOIN content_analysis c ON q.content_id = c.content_id
+WHERE q.queue_name = ? AND q.status = ?
+ORDER BY q.priority_rank ASC, q.created_at ASC
+"""
+_QUEUE_BY_STATUS_SQL = """
+SELECT q.*, c.content_text, c.risk_score, c.reasons
+FROM moderation_queue q
+JOIN content_analysis c ON q.content_id = c.content_id
+WHERE q.status = ?
+ORDER BY q.priority_rank ASC, q.created_at ASC
+"""
+_ESCALATIONS_SQL = """
+SELECT e.*, c.content_text, c.risk_score, c.risk_label, c.categories
+FROM escalations e
+LEFT JOIN content_analysis c ON e.content_id = c.content_id
+WHERE 1=1
+"""
+_ESCALATIONS_ORDER_SQL = """
+ORDER BY e.priority_rank ASC, e.created_at DESC
+"""
+
+
+def _to_json(value) -> str:
+    """Serialize a value for a JSON TEXT column"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+
+def rows_to_dicts(rows: List[sqlite3.Row]) -> List[Dict]:
+    """Convert sqlite3.Row results to plain dicts (column names read once)"""
+    if not rows:
+        return []
+    keys = rows[0].keys()
+    return [{key: row[key] for key in keys} for row in rows]
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open a tuned connection in autocommit mode"""
+    # Autocommit mode: single statements commit on their own and
+    # multi-statement writes open an explicit BEGIN IMMEDIATE
+    conn = sqlite3.connect(
+        db_path, check_same_thread=False,
+        cached_statements=256, isolation_level=None
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _write_batch(conn: sqlite3.Connection, batch: List[tuple]) -> List[tuple]:
+    """
+    Insert (sql, row) pairs in one transaction, one executemany per statement
+    
+    A batch that keeps failing (e.g. the database is still locked after
+    busy_timeout) is written row by row, so one bad row or a lock held for
+    a while loses only the rows that fail on their own.
+    
+    Args:
+        conn: Connection to write with
+        batch: (sql, row) pairs
+    
+    Returns:
+        (sql, row, error) for every row that could not be written
+    """
+    grouped = {}
+    for sql, row in batch:
+        grouped.setdefault(sql, []).append(row)
+    
+    for attempt in range(1, _WRITE_BATCH_ATTEMPTS + 1):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, rows in grouped.items():
+                conn.executemany(sql, rows)
+            conn.commit()
+            return []
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            print(f"Audit log batch write error (attempt {attempt}/{_WRITE_BATCH_ATTEMPTS}): {e}")
+    
+    failed = []
+    for sql, row in batch:
+        try:
+            conn.execute(sql, row)
+        except sqlite3.Error as e:
+            print(f"Audit log write error for content {row[0]}: {e}")
+            failed.append((sql, row, e))
+    return failed
+
+
+def _drain_writes(write_q: queue.Queue, db_path: str, batch_size: int, batch_window: float):
+    """
+    Writer thread: collect queued inserts and commit them in batches
+    
+    Module-level with its own connection, so the running thread holds no
+    reference to the ModerationDatabase and does not keep it alive
+    """
+    conn = _connect(db_path)
+    try:
+        while True:
+            item = write_q.get()
+            if item is None:
+                write_q.task_done()
+                return
+            
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + batch_window
+            while len(batch) < batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = write_q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            _write_batch(conn, batch)
+            for _ in range(len(batch) + stop):
+                write_q.task_done()
+            if stop:
+                return
+    finally:
+        conn.close()
+
+
+def _shutdown(write_q: queue.Queue, writer: list, writer_lock: threading.Lock,
+              stopped: threading.Event, connections: list, connections_lock: threading.Lock):
+    """
+    Flush queued audit inserts, stop the writer thread and close connections
+    
+    Run by the instance's weakref finalizer (on close(), garbage collection
+    or interpreter exit); takes the instance's state, never the instance
+    """
+    with writer_lock:
+        stopped.set()
+        if writer:
+            write_q.put(None)
+            writer[0].join(timeout=5)
+    
+    with connections_lock:
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        connections.clear()
+
+
 class ModerationDatabase:
     """Real database for storing all moderation decisions"""
     
-    def __init__(self, db_path: str = "harmlens_production.db"):
+    def __init__(self, db_path: str = "harmlens_production.db", stats_ttl: float = 5.0,
+                 optimize_every: int = 10000, write_batch_size: int = 100,
+                 write_batch_window: float = 0.05, write_queue_size: int = 10000):
         self.db_path = db_path
+        
+        # Refresh planner statistics (PRAGMA optimize) every optimize_every writes
+        self.optimize_every = optimize_every
+        self._writes_since_analyze = 0
+        self._optimize_running = False
+        self._optimize_lock = threading.Lock()
+        
+        # Dashboards poll get_stats; reuse the result for stats_ttl seconds
+        self.stats_ttl = stats_ttl
+        self._stats_cache = (None, 0.0)
+        
+        # One long-lived connection per worker thread
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
+        # Audit-log inserts are queued and committed in batches of up to
+        # write_batch_size rows, at most write_batch_window seconds apart,
+        # by a writer thread started on the first queued insert
+        self.write_batch_size = write_batch_size
+        self.write_batch_window = write_batch_window
+        self._write_q = queue.Queue(maxsize=write_queue_size)
+        self._writer = []
+        self._writer_lock = threading.Lock()
+        self._writer_stopped = threading.Event()
+        
+        # Flushes, stops the writer and closes connections when the instance
+        # is closed, collected or the interpreter exits; unlike an atexit
+        # hook on a bound method it does not keep the instance alive
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self._write_q, self._writer, self._writer_lock,
+            self._writer_stopped, self._connections, self._connections_lock
+        )
+        
         self.init_database()
+        
+        if os.getenv('DEBUG_SQL'):
+            self.explain_hot_queries()
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and tuning it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = _connect(self.db_path)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def _start_writer(self) -> bool:
+        """Start the writer thread if needed; False once the instance is closed"""
+        with self._writer_lock:
+            if self._writer_stopped.is_set():
+                return False
+            if not self._writer:
+                thread = threading.Thread(
+                    target=_drain_writes,
+                    args=(self._write_q, self.db_path, self.write_batch_size, self.write_batch_window),
+                    name="audit-writer", daemon=True
+                )
+                thread.start()
+                self._writer.append(thread)
+            return True
+    
+    def _enqueue_write(self, sql: str, row: tuple):
+        """Hand an audit insert to the writer thread (written inline if it can't take it)"""
+        if self._start_writer():
+            try:
+                self._write_q.put_nowait((sql, row))
+                return
+            except queue.Full:
+                pass
+        failed = _write_batch(self._get_conn(), [(sql, row)])
+        if failed:
+            raise failed[0][2]
+    
+    def flush_writes(self):
+        """Block until every queued audit insert has been committed"""
+        self._write_q.join()
+    
+    def close(self):
+        """Flush queued audit inserts, stop the writer thread and close every connection"""
+        self._finalizer()
+        self._local = threading.local()
     
     def init_database(self):
         """Create tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
         # Content analysis results
@@ -51,6 +378,7 @@ class ModerationDatabase:
             content_id TEXT NOT NULL,
             queue_name TEXT NOT NULL,
             priority TEXT NOT NULL,
+            priority_rank INTEGER,
             assigned_to TEXT,
             status TEXT DEFAULT 'pending',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -96,6 +424,7 @@ class ModerationDatabase:
             escalation_reason TEXT NOT NULL,
             escalation_type TEXT NOT NULL,
             priority TEXT NOT NULL,
+            priority_rank INTEGER,
             status TEXT DEFAULT 'pending',
             assigned_to TEXT,
             response_time_estimate TEXT,
@@ -108,185 +437,320 @@ class ModerationDatabase:
         )
         """)
         
+        self._migrate_priority_rank(cursor)
+        self._init_counters(cursor)
+        
+        # Indexes for the queue/escalation filters and the content_id join
+        # columns (content_analysis.content_id is covered by its UNIQUE index).
+        # Filter columns + priority_rank + created_at return rows pre-sorted.
+        cursor.execute("DROP INDEX IF EXISTS ix_mq_queue_status_created")
+        cursor.execute("DROP INDEX IF EXISTS ix_mq_status")
+        cursor.execute("DROP INDEX IF EXISTS ix_esc_status_priority")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_mq_queue_status_rank ON moderation_queue(queue_name, status, priority_rank, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_mq_status_rank ON moderation_queue(status, priority_rank, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_esc_status_rank ON escalations(status, priority_rank, created_at DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_esc_by ON escalations(escalated_by)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_al_cid ON action_log(content_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_wl_cid ON webhook_log(content_id)")
+        
+        # Give the planner statistics for the indexes above: a full ANALYZE
+        # the first time, afterwards only for tables whose stats went stale
         conn.commit()
-        conn.close()
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        has_stats = cursor.fetchone() is not None and cursor.execute(
+            "SELECT 1 FROM sqlite_stat1 LIMIT 1"
+        ).fetchone() is not None
+        cursor.execute("PRAGMA optimize" if has_stats else "ANALYZE")
+        
+        conn.commit()
+    
+    def _record_writes(self, count: int):
+        """Count writes and refresh planner statistics in the background when due"""
+        with self._optimize_lock:
+            self._writes_since_analyze += count
+            if self._writes_since_analyze < self.optimize_every or self._optimize_running:
+                return
+            self._writes_since_analyze = 0
+            self._optimize_running = True
+        
+        threading.Thread(target=self._optimize, daemon=True).start()
+    
+    def _optimize(self):
+        """Run PRAGMA optimize on a short-lived connection of its own"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute("PRAGMA busy_timeout=5000")
+                conn.execute("PRAGMA optimize")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Database optimize error: {e}")
+        finally:
+            with self._optimize_lock:
+                self._optimize_running = False
+    
+    def explain_hot_queries(self):
+        """Print the EXPLAIN QUERY PLAN of the hot SELECTs (enabled by DEBUG_SQL)"""
+        queries = {
+            "get_queue_items(queue_name)": (_QUEUE_BY_NAME_SQL, ('default', 'pending')),
+            "get_queue_items()": (_QUEUE_BY_STATUS_SQL, ('pending',)),
+            "get_escalations(status)": (
+                _ESCALATIONS_SQL + " AND e.status = ?" + _ESCALATIONS_ORDER_SQL, ('pending',)
+            ),
+            "get_escalations()": (_ESCALATIONS_SQL + _ESCALATIONS_ORDER_SQL, ()),
+        }
+        
+        conn = self._get_conn()
+        for name, (query, params) in queries.items():
+            print(f"EXPLAIN QUERY PLAN {name}:")
+            for row in conn.execute("EXPLAIN QUERY PLAN " + query, params):
+                print(f"  {row['detail']}")
+    
+    def _migrate_priority_rank(self, cursor: sqlite3.Cursor):
+        """Add and backfill priority_rank on databases created before it existed"""
+        rank_case = "CASE priority " + " ".join(
+            f"WHEN '{priority}' THEN {rank}" for priority, rank in _PRIORITY_RANK.items()
+        ) + " ELSE 4 END"
+        
+        for table in ('moderation_queue', 'escalations'):
+            columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+            if 'priority_rank' not in columns:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN priority_rank INTEGER")
+                cursor.execute(f"UPDATE {table} SET priority_rank = {rank_case}")
+    
+    def _init_counters(self, cursor: sqlite3.Cursor):
+        """
+        Create the trigger-maintained counters read by get_stats
+        
+        Counters are seeded from existing rows the first time they are
+        created, then kept in step with each insert/update/delete.
+        """
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+        """)
+        
+        cursor.execute("""
+        INSERT OR IGNORE INTO counters (name, value)
+        SELECT 'total_analyzed', COUNT(*) FROM content_analysis
+        """)
+        cursor.execute("""
+        INSERT OR IGNORE INTO counters (name, value)
+        SELECT 'processing_time_ms_sum', COALESCE(SUM(processing_time_ms), 0) FROM content_analysis
+        """)
+        cursor.execute("""
+        INSERT OR IGNORE INTO counters (name, value)
+        SELECT 'risk_' || risk_label, COUNT(*) FROM content_analysis GROUP BY risk_label
+        """)
+        cursor.execute("""
+        INSERT OR IGNORE INTO counters (name, value)
+        SELECT 'pending_queue', COUNT(*) FROM moderation_queue WHERE status = 'pending'
+        """)
+        
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_counters_analysis_insert
+        AFTER INSERT ON content_analysis
+        BEGIN
+            UPDATE counters SET value = value + 1 WHERE name = 'total_analyzed';
+            UPDATE counters SET value = value + COALESCE(NEW.processing_time_ms, 0)
+            WHERE name = 'processing_time_ms_sum';
+            INSERT INTO counters (name, value) VALUES ('risk_' || NEW.risk_label, 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1;
+        END
+        """)
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_counters_analysis_delete
+        AFTER DELETE ON content_analysis
+        BEGIN
+            UPDATE counters SET value = value - 1
+            WHERE name IN ('total_analyzed', 'risk_' || OLD.risk_label);
+            UPDATE counters SET value = value - COALESCE(OLD.processing_time_ms, 0)
+            WHERE name = 'processing_time_ms_sum';
+        END
+        """)
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_counters_queue_insert
+        AFTER INSERT ON moderation_queue WHEN NEW.status = 'pending'
+        BEGIN
+            UPDATE counters SET value = value + 1 WHERE name = 'pending_queue';
+        END
+        """)
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_counters_queue_update
+        AFTER UPDATE OF status ON moderation_queue
+        WHEN (OLD.status = 'pending') != (NEW.status = 'pending')
+        BEGIN
+            UPDATE counters
+            SET value = value + CASE WHEN NEW.status = 'pending' THEN 1 ELSE -1 END
+            WHERE name = 'pending_queue';
+        END
+        """)
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_counters_queue_delete
+        AFTER DELETE ON moderation_queue WHEN OLD.status = 'pending'
+        BEGIN
+            UPDATE counters SET value = value - 1 WHERE name = 'pending_queue';
+        END
+        """)
+    
+    def _build_row(self, content_id: str, analysis: dict, request_data: dict) -> tuple:
+        """Build the content_analysis row for one analysis result"""
+        return (
+            content_id,
+            request_data.get('user_id'),
+            request_data.get('platform'),
+            request_data.get('text'),
+            analysis['risk_score'],
+            analysis['risk_label'],
+            _to_json(analysis['categories']),
+            analysis['action'],
+            analysis['priority'],
+            analysis['queue'],
+            _to_json(analysis['reasons']),
+            analysis.get('child_escalation', False),
+            analysis.get('processing_time_ms', 0)
+        )
     
     def save_analysis(self, content_id: str, analysis: dict, request_data: dict):
         """Store analysis result - THIS IS PERMANENT STORAGE"""
-        conn = sqlite3.connect(self.db_path)
+        return self.save_analyses_batch(
+            [(content_id, analysis, request_data)], enqueue=False
+        )[0]
+    
+    def save_analyses_batch(self, items: List[tuple], enqueue: bool = True) -> List[bool]:
+        """
+        Store many analysis results in a single transaction
+        
+        Args:
+            items: (content_id, analysis, request_data) tuples
+            enqueue: Also add QUEUED_PRIORITIES items to their moderation queue
+            
+        Returns:
+            Per-item flags, False where the content was already analyzed
+        """
+        rows = [self._build_row(*item) for item in items]
+        if not rows:
+            return []
+        
+        conn = self._get_conn()
         cursor = conn.cursor()
         
         try:
-            cursor.execute("""
-            INSERT INTO content_analysis 
-            (content_id, user_id, platform, content_text, risk_score, risk_label, 
-             categories, action, priority, queue, reasons, child_escalation, 
-             processing_time_ms)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                content_id,
-                request_data.get('user_id'),
-                request_data.get('platform'),
-                request_data.get('text'),
-                analysis['risk_score'],
-                analysis['risk_label'],
-                json.dumps(analysis['categories']),
-                analysis['action'],
-                analysis['priority'],
-                analysis['queue'],
-                json.dumps(analysis['reasons']),
-                analysis.get('child_escalation', False),
-                analysis.get('processing_time_ms', 0)
-            ))
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(_INSERT_ANALYSIS_SQL, rows)
+                saved = [True] * len(rows)
+            except sqlite3.IntegrityError:
+                # Some content already analyzed - retry row by row, skipping those
+                conn.rollback()
+                conn.execute("BEGIN IMMEDIATE")
+                saved = []
+                for row in rows:
+                    try:
+                        cursor.execute(_INSERT_ANALYSIS_SQL, row)
+                        saved.append(True)
+                    except sqlite3.IntegrityError:
+                        saved.append(False)
+            
+            if enqueue:
+                queue_rows = [
+                    (content_id, analysis['queue'], analysis['priority'],
+                     _PRIORITY_RANK.get(analysis['priority'], 4))
+                    for (content_id, analysis, _), ok in zip(items, saved)
+                    if ok and analysis['priority'] in QUEUED_PRIORITIES
+                ]
+                if queue_rows:
+                    cursor.executemany(_INSERT_QUEUE_SQL, queue_rows)
             
             conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            # Content already analyzed
-            return False
-        finally:
-            conn.close()
+            self._record_writes(sum(saved))
+            return saved
+        except Exception:
+            conn.rollback()
+            raise
     
     def add_to_queue(self, content_id: str, queue_name: str, priority: str):
         """Add to moderation queue - REAL queue management"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
-        cursor.execute("""
-        INSERT INTO moderation_queue (content_id, queue_name, priority)
-        VALUES (?, ?, ?)
-        """, (content_id, queue_name, priority))
+        cursor.execute(_INSERT_QUEUE_SQL, (content_id, queue_name, priority, _PRIORITY_RANK.get(priority, 4)))
         
         conn.commit()
-        conn.close()
+        self._record_writes(1)
     
-    def get_queue_items(self, queue_name: str = None, status: str = 'pending') -> List[Dict]:
-        """Get items from queue - REAL queue retrieval"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def get_queue_items(self, queue_name: str = None, status: str = 'pending',
+                        as_dicts: bool = True) -> List[Dict]:
+        """
+        Get items from queue - REAL queue retrieval
+        
+        Args:
+            queue_name: Restrict to one queue (all queues if None)
+            status: Queue item status to match
+            as_dicts: Return plain dicts; False returns the sqlite3.Row objects
+        """
+        conn = self._get_conn()
         cursor = conn.cursor()
         
         if queue_name:
-            cursor.execute("""
-            SELECT q.*, c.content_text, c.risk_score, c.reasons
-            FROM moderation_queue q
-            JOIN content_analysis c ON q.content_id = c.content_id
-            WHERE q.queue_name = ? AND q.status = ?
-            ORDER BY 
-                CASE q.priority
-                    WHEN 'CRITICAL' THEN 1
-                    WHEN 'HIGH' THEN 2
-                    WHEN 'MEDIUM' THEN 3
-                    ELSE 4
-                END,
-                q.created_at ASC
-            """, (queue_name, status))
+            cursor.execute(_QUEUE_BY_NAME_SQL, (queue_name, status))
         else:
-            cursor.execute("""
-            SELECT q.*, c.content_text, c.risk_score, c.reasons
-            FROM moderation_queue q
-            JOIN content_analysis c ON q.content_id = c.content_id
-            WHERE q.status = ?
-            ORDER BY 
-                CASE q.priority
-                    WHEN 'CRITICAL' THEN 1
-                    WHEN 'HIGH' THEN 2
-                    WHEN 'MEDIUM' THEN 3
-                    ELSE 4
-                END,
-                q.created_at ASC
-            """, (status,))
+            cursor.execute(_QUEUE_BY_STATUS_SQL, (status,))
         
         rows = cursor.fetchall()
-        conn.close()
         
-        return [dict(row) for row in rows]
+        return rows_to_dicts(rows) if as_dicts else rows
     
     def update_queue_status(self, queue_id: int, status: str, reviewer: str = None, 
                            decision: str = None, notes: str = None):
         """Update queue item - REAL moderator action tracking"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
-        cursor.execute("""
-        UPDATE moderation_queue
-        SET status = ?, 
-            reviewed_at = CURRENT_TIMESTAMP,
-            assigned_to = COALESCE(?, assigned_to),
-            reviewer_decision = COALESCE(?, reviewer_decision),
-            reviewer_notes = COALESCE(?, reviewer_notes)
-        WHERE id = ?
-        """, (status, reviewer, decision, notes, queue_id))
+        cursor.execute(_UPDATE_QUEUE_STATUS_SQL, (status, reviewer, decision, notes, queue_id))
         
         conn.commit()
-        conn.close()
     
     def log_action(self, content_id: str, action_type: str, result: str = None, error: str = None):
-        """Log executed action - AUDIT TRAIL"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        INSERT INTO action_log (content_id, action_type, action_result, error)
-        VALUES (?, ?, ?, ?)
-        """, (content_id, action_type, result, error))
-        
-        conn.commit()
-        conn.close()
+        """Log executed action - AUDIT TRAIL (committed by the writer thread)"""
+        self._enqueue_write(_LOG_ACTION_SQL, (content_id, action_type, result, error))
     
     def log_webhook_delivery(self, content_id: str, webhook_url: str, 
                              status_code: int, response: str):
-        """Log webhook delivery - REAL webhook tracking"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        INSERT INTO webhook_log (content_id, webhook_url, status_code, response)
-        VALUES (?, ?, ?, ?)
-        """, (content_id, webhook_url, status_code, response))
-        
-        conn.commit()
-        conn.close()
+        """Log webhook delivery - REAL webhook tracking (committed by the writer thread)"""
+        self._enqueue_write(_LOG_WEBHOOK_SQL, (content_id, webhook_url, status_code, response))
     
     def create_escalation(self, content_id: str, escalated_by: str, reason: str, 
                          escalation_type: str, priority: str) -> int:
         """Create new escalation - for moderator escalations"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
-        # Determine response time estimate based on priority
-        time_estimates = {
-            'CRITICAL': '< 1 hour',
-            'HIGH': '2-4 hours',
-            'MEDIUM': '4-8 hours',
-            'LOW': '24-48 hours'
-        }
+        # Response time estimate is based on priority
+        params = (content_id, escalated_by, reason, escalation_type, priority, 
+                  _PRIORITY_RANK.get(priority, 4), _RESPONSE_TIME_ESTIMATES.get(priority, '24-48 hours'))
         
-        cursor.execute("""
-        INSERT INTO escalations 
-        (content_id, escalated_by, escalation_reason, escalation_type, priority, response_time_estimate)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """, (content_id, escalated_by, reason, escalation_type, priority, 
-              time_estimates.get(priority, '24-48 hours')))
-        
-        escalation_id = cursor.lastrowid
+        if _HAS_RETURNING:
+            # The new id comes back as the statement's own result row
+            cursor.execute(_INSERT_ESCALATION_RETURNING_SQL, params)
+            escalation_id = cursor.fetchone()[0]
+        else:
+            cursor.execute(_INSERT_ESCALATION_SQL, params)
+            escalation_id = cursor.lastrowid
         conn.commit()
-        conn.close()
         
         return escalation_id
     
-    def get_escalations(self, status: str = None, escalated_by: str = None) -> List[Dict]:
-        """Get escalations with optional filters"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def get_escalations(self, status: str = None, escalated_by: str = None,
+                        as_dicts: bool = True) -> List[Dict]:
+        """Get escalations with optional filters (as_dicts=False returns sqlite3.Row objects)"""
+        conn = self._get_conn()
         cursor = conn.cursor()
         
-        query = """
-        SELECT e.*, c.content_text, c.risk_score, c.risk_label, c.categories
-        FROM escalations e
-        LEFT JOIN content_analysis c ON e.content_id = c.content_id
-        WHERE 1=1
-        """
+        query = _ESCALATIONS_SQL
         params = []
         
         if status:
@@ -297,27 +761,17 @@ class ModerationDatabase:
             query += " AND e.escalated_by = ?"
             params.append(escalated_by)
         
-        query += """
-        ORDER BY 
-            CASE e.priority
-                WHEN 'CRITICAL' THEN 1
-                WHEN 'HIGH' THEN 2
-                WHEN 'MEDIUM' THEN 3
-                ELSE 4
-            END,
-            e.created_at DESC
-        """
+        query += _ESCALATIONS_ORDER_SQL
         
         cursor.execute(query, params)
         rows = cursor.fetchall()
-        conn.close()
         
-        return [dict(row) for row in rows]
+        return rows_to_dicts(rows) if as_dicts else rows
     
     def update_escalation_status(self, escalation_id: int, status: str, 
                                  assigned_to: str = None, resolution_notes: str = None):
         """Update escalation status"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
         update_fields = ["status = ?", "updated_at = CURRENT_TIMESTAMP"]
@@ -342,49 +796,61 @@ class ModerationDatabase:
         cursor.execute(query, params)
         
         conn.commit()
-        conn.close()
     
     def get_stats(self) -> Dict:
         """Get platform statistics - REAL metrics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total analyzed
-        cursor.execute("SELECT COUNT(*) FROM content_analysis")
-        total = cursor.fetchone()[0]
-        
-        # By risk label
-        cursor.execute("""
-        SELECT risk_label, COUNT(*) as count
-        FROM content_analysis
-        GROUP BY risk_label
-        """)
-        by_risk = dict(cursor.fetchall())
+        cached, computed_at = self._stats_cache
+        now = time.monotonic()
+        if cached is not None and now - computed_at < self.stats_ttl:
+            return dict(cached)
         
-        # Pending queue items
-        cursor.execute("""
-        SELECT COUNT(*) FROM moderation_queue WHERE status = 'pending'
-        """)
-        pending_count = cursor.fetchone()[0]
+        conn = self._get_conn()
+        cursor = conn.cursor()
         
-        # Average processing time
-        cursor.execute("SELECT AVG(processing_time_ms) FROM content_analysis")
-        avg_time = cursor.fetchone()[0] or 0
+        # Totals, risk breakdown, latency and pending count from the counters
+        cursor.execute(_COUNTERS_SQL)
+        counters = dict(cursor.fetchall())
+        
+        total = counters.get('total_analyzed', 0)
+        avg_time = counters.get('processing_time_ms_sum', 0) / total if total else 0
+        pending_count = counters.get('pending_queue', 0)
+        by_risk = {
+            name[len('risk_'):]: value
+            for name, value in counters.items()
+            if name.startswith('risk_') and value
+        }
         
         # Escalation stats
-        cursor.execute("""
-        SELECT status, COUNT(*) as count
-        FROM escalations
-        GROUP BY status
-        """)
+        cursor.execute(_ESCALATION_STATS_SQL)
         escalation_stats = dict(cursor.fetchall())
         
-        conn.close()
-        
-        return {
+        stats = {
             "total_analyzed": total,
             "by_risk_level": by_risk,
             "pending_review": pending_count,
             "avg_processing_time_ms": round(avg_time, 2),
             "escalations": escalation_stats
         }
+        self._stats_cache = (stats, now)
+        
+        return dict(stats)
+
+
+# Shared instance
+_database_instance = None
+_database_lock = threading.Lock()
+
+def get_database() -> ModerationDatabase:
+    """
+    Get or create the shared database instance
+    
+    Streamlit re-runs the whole page script on every interaction; pages use
+    this instead of ModerationDatabase() so reruns reuse one writer thread
+    and one set of connections
+    """
+    global _database_instance
+    if _database_instance is None:
+        with _database_lock:
+            if _database_instance is None:
+                _database_instance = ModerationDatabase()
+    return _database_instance
@@ -3,7 +3,68 @@ Explainability module
 Generates human-readable explanations for harm scores
 """
 
+import heapq
 import re
+from functools import lru_cache
+from operator import itemgetter
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick unavailable; highlights fall back to a union regex
+    ahocorasick = None
+
+
+_CONTEXT_TOPIC_NAMES = {
+    'health': 'public health',
+    'election': 'elections',
+    'communal': 'communal/religious tension',
+    'disaster': 'emergency/disaster'
+}
+
+
+def _emotion_reason(signals: dict) -> str:
+    emotion_labels = signals.get('emotion_labels', [])
+    if emotion_labels and emotion_labels[0] != 'neutral':
+        return f"High emotional intensity detected ({', '.join(emotion_labels[:2])}), which increases likelihood of impulsive sharing and emotional reactions."
+    return "Elevated emotional tone that may influence reader response."
+
+
+def _cta_reason(signals: dict) -> str:
+    cta_triggers = signals.get('cta_triggers', [])
+    if cta_triggers:
+        examples = ', '.join(f'"{t}"' for t in cta_triggers[:3])
+        return f"Contains mobilizing calls-to-action ({examples}) encouraging people to act or share quickly, amplifying potential spread."
+    return "Contains language urging immediate action or sharing."
+
+
+def _toxicity_reason(signals: dict) -> str:
+    if signals.get('targeted', False):
+        return "Includes targeting or dehumanizing framing toward groups, which can inflame hostility and trigger harassment."
+    return "Contains toxic or hostile language that may escalate conflict."
+
+
+def _context_reason(signals: dict) -> str:
+    context_topic = signals.get('context_topic', 'none')
+    if context_topic != 'none':
+        topic_name = _CONTEXT_TOPIC_NAMES.get(context_topic, 'sensitive context')
+        return f"Addresses {topic_name}, a high-stakes context where misinformation can escalate real-world harm."
+    return "Touches on context-sensitive topics requiring extra scrutiny."
+
+
+def _child_safety_reason(signals: dict) -> str:
+    if signals.get('child_flag', False):
+        return "References minors with potentially risky framing; requires immediate review under child-safety policy to ensure protection."
+    return "Contains child-related content that warrants review."
+
+
+# Breakdown signal name -> reason builder
+_SIGNAL_HANDLERS = {
+    "Emotion": _emotion_reason,
+    "Call-to-Action": _cta_reason,
+    "Toxicity/Targeting": _toxicity_reason,
+    "Context Sensitivity": _context_reason,
+    "Child Safety": _child_safety_reason,
+}
 
 
 def generate_reasons(signals: dict, scoring_result: dict) -> list:
@@ -18,66 +79,23 @@ def generate_reasons(signals: dict, scoring_result: dict) -> list:
         list of reason strings (3-5 bullets)
     """
     reasons = []
+    has_child_reason = False
     breakdown = scoring_result['breakdown']
     
-    # Sort signals by contribution
-    sorted_signals = sorted(breakdown.items(), key=lambda x: x[1], reverse=True)
-    
-    # Generate reasons for top signals
-    for signal_name, score in sorted_signals[:5]:
+    # Generate reasons for the top 5 signals by contribution
+    for signal_name, score in heapq.nlargest(5, breakdown.items(), key=itemgetter(1)):
         if score < 0.3:  # Skip low signals
             continue
         
-        if signal_name == "Emotion":
-            emotion_labels = signals.get('emotion_labels', [])
-            if emotion_labels and emotion_labels[0] != 'neutral':
-                reason = f"High emotional intensity detected ({', '.join(emotion_labels[:2])}), which increases likelihood of impulsive sharing and emotional reactions."
-            else:
-                reason = "Elevated emotional tone that may influence reader response."
-            reasons.append(reason)
-        
-        elif signal_name == "Call-to-Action":
-            cta_triggers = signals.get('cta_triggers', [])
-            if cta_triggers:
-                examples = ', '.join([f'"{t}"' for t in cta_triggers[:3]])
-                reason = f"Contains mobilizing calls-to-action ({examples}) encouraging people to act or share quickly, amplifying potential spread."
-            else:
-                reason = "Contains language urging immediate action or sharing."
-            reasons.append(reason)
-        
-        elif signal_name == "Toxicity/Targeting":
-            if signals.get('targeted', False):
-                reason = "Includes targeting or dehumanizing framing toward groups, which can inflame hostility and trigger harassment."
-            else:
-                reason = "Contains toxic or hostile language that may escalate conflict."
-            reasons.append(reason)
-        
-        elif signal_name == "Context Sensitivity":
-            context_topic = signals.get('context_topic', 'none')
-            if context_topic != 'none':
-                topic_map = {
-                    'health': 'public health',
-                    'election': 'elections',
-                    'communal': 'communal/religious tension',
-                    'disaster': 'emergency/disaster'
-                }
-                topic_name = topic_map.get(context_topic, 'sensitive context')
-                reason = f"Addresses {topic_name}, a high-stakes context where misinformation can escalate real-world harm."
-            else:
-                reason = "Touches on context-sensitive topics requiring extra scrutiny."
-            reasons.append(reason)
-        
-        elif signal_name == "Child Safety":
-            if signals.get('child_flag', False):
-                reason = "References minors with potentially risky framing; requires immediate review under child-safety policy to ensure protection."
-            else:
-                reason = "Contains child-related content that warrants review."
-            reasons.append(reason)
+        handler = _SIGNAL_HANDLERS.get(signal_name)
+        if handler:
+            reasons.append(handler(signals))
+            if signal_name == "Child Safety":
+                has_child_reason = True
     
     # Add child safety override reason if applicable
-    if scoring_result.get('child_escalation', False):
-        if not any('child' in r.lower() for r in reasons):
-            reasons.insert(0, "CRITICAL: Child safety concern detected. Automatic escalation triggered for immediate human review.")
+    if scoring_result.get('child_escalation', False) and not has_child_reason:
+        reasons.insert(0, "CRITICAL: Child safety concern detected. Automatic escalation triggered for immediate human review.")
     
     # Ensure we have at least 2 reasons
     if len(reasons) < 2:
@@ -86,6 +104,79 @@ def generate_reasons(signals: dict, scoring_result: dict) -> list:
     return reasons[:5]  # Return top 5
 
 
+@lru_cache(maxsize=256)
+def _phrase_automaton(phrases: frozenset):
+    """Build (once per distinct trigger set) an Aho-Corasick automaton over phrases"""
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_word_char(char: str) -> bool:
+    """Same definition of a word character as regex \\w"""
+    return char.isalnum() or char == '_'
+
+
+def _find_phrases(text: str, phrases) -> dict:
+    """
+    Locate the first whole-word, case-insensitive occurrence of each phrase
+    
+    Args:
+        text: Text to scan (original case)
+        phrases: Lowercased trigger phrases
+    
+    Returns:
+        dict of phrase -> (start, end) span in text, for phrases that were found
+    """
+    first_match = {}
+    
+    # The automaton is case-sensitive, so it scans a lowercased copy; that is
+    # only usable when lowercasing keeps every character at the same offset
+    text_lower = text.lower() if ahocorasick is not None else None
+    if text_lower is not None and len(text_lower) == len(text):
+        # Single scan reporting every (overlapping) occurrence; \b boundaries
+        # are checked on the neighbouring characters
+        text_len = len(text_lower)
+        for end_idx, phrase in _phrase_automaton(frozenset(phrases)).iter(text_lower):
+            if phrase in first_match:
+                continue
+            start, end = end_idx - len(phrase) + 1, end_idx + 1
+            before = start > 0 and _is_word_char(text_lower[start - 1])
+            after = end < text_len and _is_word_char(text_lower[end])
+            if before != _is_word_char(phrase[0]) and after != _is_word_char(phrase[-1]):
+                first_match[phrase] = (start, end)
+                if len(first_match) == len(phrases):
+                    break
+        return first_match
+    
+    # One pass over the text for all phrases. The lookahead keeps matches from
+    # consuming text, so overlapping triggers are all found; phrases contained
+    # in another trigger can still be shadowed, so they are searched alone.
+    nested = {
+        p for p in phrases
+        if any(p != q and p in q for q in phrases)
+    }
+    alternatives = sorted(set(phrases) - nested, key=len, reverse=True)
+    
+    if alternatives:
+        pattern = re.compile(
+            r'(?=\b(' + '|'.join(re.escape(p) for p in alternatives) + r')\b)', re.IGNORECASE
+        )
+        for match in pattern.finditer(text):
+            first_match.setdefault(match.group(1).lower(), match.span(1))
+            if len(first_match) == len(alternatives):
+                break
+    
+    for phrase in nested:
+        match = re.search(r'\b' + re.escape(phrase) + r'\b', text, re.IGNORECASE)
+        if match:
+            first_match[phrase] = match.span()
+    
+    return first_match
+
+
 def generate_evidence_highlights(text: str, signals: dict) -> list:
     """
     Extract and highlight specific text spans that triggered signals
@@ -98,7 +189,6 @@ def generate_evidence_highlights(text: str, signals: dict) -> list:
         list of dicts with 'text' and 'reason' for each highlight
     """
     highlights = []
-    text_lower = text.lower()
     
     # Collect all triggers
     all_triggers = []
@@ -128,19 +218,27 @@ def generate_evidence_highlights(text: str, signals: dict) -> list:
     for trigger in child_triggers[:3]:
         all_triggers.append({"phrase": trigger, "reason": "Child safety concern"})
     
-    # Find and extract highlights from text
+    # Map each phrase to the reason of its first (highest-priority) trigger
+    phrase_to_reason = {}
     for item in all_triggers[:10]:  # Limit to top 10
         phrase = item['phrase'].lower()
-        reason = item['reason']
-        
-        # Find the phrase in text
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        match = re.search(pattern, text_lower)
+        if phrase:
+            phrase_to_reason.setdefault(phrase, item['reason'])
+    
+    if not phrase_to_reason:
+        return []
+    
+    # Locate all phrases in a single scan of the text
+    first_match = _find_phrases(text, phrase_to_reason.keys())
+    
+    # Find and extract highlights from text, in trigger priority order
+    for phrase, reason in phrase_to_reason.items():
+        span = first_match.get(phrase)
         
-        if match:
+        if span:
             # Extract with context (up to 60 chars)
-            start = max(0, match.start() - 20)
-            end = min(len(text), match.end() + 20)
+            start = max(0, span[0] - 20)
+            end = min(len(text), span[1] + 20)
             snippet = text[start:end].strip()
             
             # Add ellipsis if truncated
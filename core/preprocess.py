@@ -3,7 +3,34 @@ Text preprocessing for content moderation
 """
 
 import re
+from functools import lru_cache
 import langdetect
+try:
+    import cld3
+except ImportError:
+    # Compiled CLD3 bindings unavailable; use pure-Python langdetect
+    cld3 = None
+
+
+_WS_RE = re.compile(r'\s+')
+_SENT_RE = re.compile(r'[.!?]+')
+
+# Detection is unreliable (and still costs a model pass) on very short text
+_MIN_LANG_CHARS = 12
+# Language is detected from a bounded prefix so long posts cost the same
+_LANG_SAMPLE_CHARS = 256
+
+
+@lru_cache(maxsize=4096)
+def _detect_language(sample: str) -> str:
+    """Detect the language of a text sample (cached for repeated texts)"""
+    try:
+        if cld3 is not None:
+            result = cld3.get_language(sample)
+            return result.language if result and result.is_reliable else "unknown"
+        return langdetect.detect(sample)
+    except:
+        return "unknown"
 
 
 def clean_text(text: str) -> dict:
@@ -16,18 +43,17 @@ def clean_text(text: str) -> dict:
     Returns:
         dict with cleaned_text, original_text, language
     """
-    # Keep original for highlighting
-    original = text.strip()
-    
     # Normalize whitespace
-    cleaned = re.sub(r'\s+', ' ', text)
-    cleaned = cleaned.strip()
+    cleaned = _WS_RE.sub(' ', text).strip()
+    
+    # Keep original for highlighting (only copied when it has edge whitespace)
+    original = text.strip() if text[:1].isspace() or text[-1:].isspace() else text
     
     # Detect language
-    try:
-        lang = langdetect.detect(cleaned)
-    except:
+    if len(cleaned) < _MIN_LANG_CHARS:
         lang = "unknown"
+    else:
+        lang = _detect_language(cleaned[:_LANG_SAMPLE_CHARS])
     
     return {
         "original": original,
@@ -48,5 +74,5 @@ def get_sentences(text: str) -> list:
         List of sentences
     """
     # Simple sentence splitting
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENT_RE.split(text)
     return [s.strip() for s in sentences if s.strip()]
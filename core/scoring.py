@@ -3,88 +3,148 @@ Improved Harm Risk Scoring
 More aggressive scoring that properly flags problematic content
 """
 
+import sys
+from dataclasses import dataclass, fields
+from typing import Union
+import numpy as np
 
-def calculate_improved_harm_score(signals: dict) -> dict:
+from core.signals._numba import njit
+# Lookup tables and the batch layout are shared with the child-safety-first
+# scorer; only the weights and overrides below differ
+from core.signals.improved_scoring import (
+    SignalFrame, _CONTEXT_CATEGORY_MAP, _CRITICAL, _HIGH, _RISK_LABEL_ARRAY,
+    _SEVERE_CATEGORIES, _SEVERITY_LEVELS, _SEVERITY_NAMES, _severe_counts
+)
+
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class Signals:
+    """Scoring inputs for one item (attribute access instead of dict lookups)"""
+    emotion_score: float = 0.0
+    cta_score: float = 0.0
+    tox_score: float = 0.0
+    context_score: float = 0.0
+    child_score: float = 0.0
+    child_flag: bool = False
+    toxicity_severity: str = 'low'
+    requires_immediate_action: bool = False
+    toxicity_categories: tuple = ()
+    
+    @classmethod
+    def from_dict(cls, signals: dict) -> 'Signals':
+        """Build from a legacy signals dict (unrelated keys are ignored)"""
+        return cls(
+            emotion_score=signals.get('emotion_score', 0),
+            cta_score=signals.get('cta_score', 0),
+            tox_score=signals.get('tox_score', 0),
+            context_score=signals.get('context_score', 0),
+            child_score=signals.get('child_score', 0),
+            child_flag=signals.get('child_flag', False),
+            toxicity_severity=signals.get('toxicity_severity', 'low'),
+            requires_immediate_action=signals.get('requires_immediate_action', False),
+            toxicity_categories=tuple(signals.get('toxicity_categories', ()))
+        )
+    
+    def to_dict(self) -> dict:
+        """Convert back to the legacy signals dict layout"""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data['toxicity_categories'] = list(self.toxicity_categories)
+        return data
+
+
+@njit(cache=True)
+def _score_kernel(tox, emotion, cta, context, child, child_flag, immediate, sev_code, severe_count):
     """
-    Calculate weighted harm risk score with aggressive thresholds
+    Numeric core of calculate_improved_harm_score (weights + overrides)
     
     Args:
-        signals: dict containing all signal scores
-            - emotion_score
-            - cta_score
-            - tox_score (from advanced detector)
-            - context_score
-            - child_score
-            - child_flag
-            - toxicity_severity (optional)
-            - requires_immediate_action (optional)
+        sev_code: _SEVERITY_LEVELS code of toxicity_severity
+        severe_count: Number of severe toxicity categories
     
     Returns:
-        dict with risk_score (0-100), risk_label, breakdown
+        int risk score (0-100)
     """
-    # Extract signal scores
-    emotion = signals.get('emotion_score', 0)
-    cta = signals.get('cta_score', 0)
-    tox = signals.get('tox_score', 0)
-    context = signals.get('context_score', 0)
-    child = signals.get('child_score', 0)
-    child_flag = signals.get('child_flag', False)
-    
-    # NEW: Get advanced toxicity info
-    toxicity_severity = signals.get('toxicity_severity', 'low')
-    requires_immediate_action = signals.get('requires_immediate_action', False)
-    toxicity_categories = signals.get('toxicity_categories', [])
-    
-    # IMPROVED WEIGHTS: Toxicity is now more important
-    # 40% Toxicity, 25% Emotion, 15% CTA, 10% Context, 10% Child Safety
-    base_score = (
+    risk_score = (
         0.40 * tox +
         0.25 * emotion +
         0.15 * cta +
         0.10 * context +
         0.10 * child
-    )
-    
-    # Convert to 0-100 scale
-    risk_score = base_score * 100
-    
-    # CRITICAL OVERRIDES - These force high scores
+    ) * 100
     
     # Override 1: Immediate action required (threats, violence, etc.)
-    if requires_immediate_action:
-        risk_score = max(risk_score, 85)
-    
-    # Override 2: Critical toxicity severity
-    if toxicity_severity == 'critical':
-        risk_score = max(risk_score, 90)
-    elif toxicity_severity == 'high':
-        risk_score = max(risk_score, 75)
-    
+    if immediate:
+        risk_score = max(risk_score, 85.0)
+    # Override 2: Critical/high toxicity severity
+    if sev_code == 4:
+        risk_score = max(risk_score, 90.0)
+    elif sev_code == 3:
+        risk_score = max(risk_score, 75.0)
     # Override 3: Multiple severe categories
-    severe_categories = [
-        'Threats/Violence', 'Hate Speech', 'Sexual Harassment',
-        'Extremist Content', 'Slurs/Derogatory Language'
-    ]
-    severe_count = sum(1 for cat in toxicity_categories if cat in severe_categories)
     if severe_count >= 2:
-        risk_score = max(risk_score, 85)
+        risk_score = max(risk_score, 85.0)
     elif severe_count >= 1:
-        risk_score = max(risk_score, 70)
-    
+        risk_score = max(risk_score, 70.0)
     # Override 4: Child safety escalation
     if child_flag and child > 0.5:
-        risk_score = max(risk_score, 85)
-    
+        risk_score = max(risk_score, 85.0)
     # Override 5: High toxicity + high emotion = very dangerous
     if tox > 0.7 and emotion > 0.6:
-        risk_score = min(risk_score * 1.2, 100)
-    
+        risk_score = min(risk_score * 1.2, 100.0)
     # Override 6: High toxicity + CTA = mobilization for harm
     if tox > 0.7 and cta > 0.6:
-        risk_score = min(risk_score * 1.25, 100)
+        risk_score = min(risk_score * 1.25, 100.0)
     
     # Cap at 100
-    risk_score = min(int(round(risk_score)), 100)
+    return min(int(round(risk_score)), 100)
+
+
+def calculate_improved_harm_score(signals: Union[dict, Signals]) -> dict:
+    """
+    Calculate weighted harm risk score with aggressive thresholds
+    
+    Args:
+        signals: Signals, or dict containing all signal scores
+            - emotion_score
+            - cta_score
+            - tox_score (from advanced detector)
+            - context_score
+            - child_score
+            - child_flag
+            - toxicity_severity (optional)
+            - requires_immediate_action (optional)
+    
+    Returns:
+        dict with risk_score (0-100), risk_label, breakdown
+    """
+    if not isinstance(signals, Signals):
+        signals = Signals.from_dict(signals)
+    
+    # Extract signal scores
+    emotion = signals.emotion_score
+    cta = signals.cta_score
+    tox = signals.tox_score
+    context = signals.context_score
+    child = signals.child_score
+    child_flag = signals.child_flag
+    
+    # NEW: Get advanced toxicity info
+    toxicity_severity = signals.toxicity_severity
+    requires_immediate_action = signals.requires_immediate_action
+    toxicity_categories = signals.toxicity_categories
+    
+    # IMPROVED WEIGHTS: Toxicity is now more important
+    # 40% Toxicity, 25% Emotion, 15% CTA, 10% Context, 10% Child Safety
+    # followed by the critical overrides (see _score_kernel)
+    risk_score = _score_kernel(
+        float(tox), float(emotion), float(cta), float(context), float(child),
+        bool(child_flag), bool(requires_immediate_action),
+        _SEVERITY_LEVELS.get(toxicity_severity, 0),
+        len(_SEVERE_CATEGORIES.intersection(toxicity_categories))
+    )
     
     # IMPROVED THRESHOLDS: More aggressive
     # Low: 0-49 (was 0-39)
@@ -116,6 +176,70 @@ def calculate_improved_harm_score(signals: dict) -> dict:
     }
 
 
+def calculate_improved_harm_score_batch(signals) -> dict:
+    """
+    Vectorized calculate_improved_harm_score for many items at once
+    
+    Takes the same inputs as core.signals.improved_scoring's batch scorer,
+    with this module's weights and overrides.
+    
+    Args:
+        signals: SignalFrame, or dict of equal-length arrays (or a DataFrame)
+            accepted by SignalFrame.from_columns
+    
+    Returns:
+        dict of arrays: risk_score (int16), risk_label, child_escalation,
+        immediate_action_required, toxicity_severity
+    """
+    if not isinstance(signals, SignalFrame):
+        signals = SignalFrame.from_columns(signals)
+    
+    severe_count = signals.severe_count
+    if severe_count is None:
+        severe_count = _severe_counts(signals.toxicity_cat_mask)
+    
+    emotion = signals.emotion.astype(np.float64, copy=False)
+    cta = signals.cta.astype(np.float64, copy=False)
+    tox = signals.tox.astype(np.float64, copy=False)
+    context = signals.context.astype(np.float64, copy=False)
+    child = signals.child.astype(np.float64, copy=False)
+    child_flag = signals.child_flag
+    requires_immediate_action = signals.requires_immediate_action
+    toxicity_severity = signals.toxicity_severity
+    
+    # Same weights as the single-item scorer, on the 0-100 scale
+    risk_score = (
+        0.40 * tox +
+        0.25 * emotion +
+        0.15 * cta +
+        0.10 * context +
+        0.10 * child
+    ) * 100
+    
+    # Critical overrides
+    risk_score = np.where(requires_immediate_action, np.maximum(risk_score, 85), risk_score)
+    risk_score = np.where(toxicity_severity == _CRITICAL, np.maximum(risk_score, 90),
+                          np.where(toxicity_severity == _HIGH, np.maximum(risk_score, 75), risk_score))
+    risk_score = np.where(severe_count >= 2, np.maximum(risk_score, 85),
+                          np.where(severe_count >= 1, np.maximum(risk_score, 70), risk_score))
+    child_escalation = child_flag & (child > 0.5)
+    risk_score = np.where(child_escalation, np.maximum(risk_score, 85), risk_score)
+    high_tox = tox > 0.7
+    risk_score = np.where(high_tox & (emotion > 0.6), np.minimum(risk_score * 1.2, 100), risk_score)
+    risk_score = np.where(high_tox & (cta > 0.6), np.minimum(risk_score * 1.25, 100), risk_score)
+    
+    # Cap at 100 (np.rint rounds half to even, like round())
+    risk_score = np.minimum(np.rint(risk_score), 100).astype(np.int16)
+    
+    return {
+        "risk_score": risk_score,
+        "risk_label": _RISK_LABEL_ARRAY[np.maximum(risk_score, 0)],
+        "child_escalation": child_escalation,
+        "immediate_action_required": requires_immediate_action,
+        "toxicity_severity": _SEVERITY_NAMES[toxicity_severity]
+    }
+
+
 def get_improved_harm_categories(signals: dict, threshold: float = 0.3) -> list:
     """
     Get multi-label harm categories with lower threshold
@@ -150,13 +274,7 @@ def get_improved_harm_categories(signals: dict, threshold: float = 0.3) -> list:
     if signals.get('context_score', 0) >= threshold:
         context_topic = signals.get('context_topic', 'none')
         if context_topic != 'none':
-            category_map = {
-                'health': 'Health Misinformation Risk',
-                'election': 'Election Misinformation Risk',
-                'communal': 'Communal Tension Risk',
-                'disaster': 'Disaster/Emergency Misinformation'
-            }
-            categories.append(category_map.get(context_topic, 'Sensitive Context'))
+            categories.append(_CONTEXT_CATEGORY_MAP.get(context_topic, 'Sensitive Context'))
     
     # Check child safety
     if signals.get('child_flag', False):
@@ -164,12 +282,7 @@ def get_improved_harm_categories(signals: dict, threshold: float = 0.3) -> list:
             categories.append("Child Safety Concern")
     
     # Remove duplicates while preserving order
-    seen = set()
-    unique_categories = []
-    for cat in categories:
-        if cat not in seen:
-            seen.add(cat)
-            unique_categories.append(cat)
+    unique_categories = list(dict.fromkeys(categories))
     
     # Default if no categories
     if not unique_categories:
@@ -0,0 +1,67 @@
+"""
+Shared detect() result cache
+Reposts and copy-paste spam repeat the exact same text; a bounded LRU keyed
+by the text skips re-running the models on them
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Bounded LRU of detection results keyed by the text itself
+    
+    The dict compares the full key on lookup, so two texts that merely share
+    a hash can never receive each other's result
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Create the cache
+
+        Args:
+            maxsize: Maximum number of cached results
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str):
+        """
+        Look up a cached result
+
+        Args:
+            text: Input text
+
+        Returns:
+            deep copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            result = self._entries.get(text)
+            if result is None:
+                return None
+            self._entries.move_to_end(text)
+        # Callers may mutate the returned dict; never hand out the cached one
+        return copy.deepcopy(result)
+
+    def put(self, text: str, result: dict):
+        """
+        Store a result, evicting the least recently used one when full
+
+        Args:
+            text: Input text
+            result: Detection result for the text
+        """
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._entries[text] = result
+            self._entries.move_to_end(text)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,29 @@
+"""
+Shared sentence encoder
+Every embedding-based signal gets the same loaded SentenceTransformer
+instead of loading its own copy
+"""
+
+from functools import lru_cache
+
+import torch
+from sentence_transformers import SentenceTransformer
+
+DEFAULT_ENCODER = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@lru_cache(maxsize=2)
+def get_encoder(name: str = DEFAULT_ENCODER) -> SentenceTransformer:
+    """
+    Load (once per model name) a sentence encoder in inference mode
+
+    Args:
+        name: Hugging Face model id
+
+    Returns:
+        SentenceTransformer on the GPU when available, otherwise the CPU
+    """
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = SentenceTransformer(name, device=device)
+    model.eval()
+    return model
@@ -0,0 +1,51 @@
+"""
+Shared detector input
+Holds the per-text views (original, lowercased, tokens) so they are built
+once per request instead of once per detector
+"""
+
+import re
+from typing import Union
+
+_TOKEN_RE = re.compile(r"\w+(?:'\w+)?")
+
+
+class SignalInput:
+    """Text prepared once and passed to every detector's detect()"""
+
+    __slots__ = ("text", "text_lower", "_tokens")
+
+    def __init__(self, text: str, text_lower: str = None):
+        """
+        Build the input
+
+        Args:
+            text: Cleaned input text
+            text_lower: Lowercased text, if the caller already has it
+                (e.g. clean_text()['lowercase'])
+        """
+        self.text = text
+        self.text_lower = text.lower() if text_lower is None else text_lower
+        self._tokens = None
+
+    @property
+    def tokens(self) -> list:
+        """Lowercase word tokens (computed on first access)"""
+        if self._tokens is None:
+            self._tokens = _TOKEN_RE.findall(self.text_lower)
+        return self._tokens
+
+
+def as_signal_input(text: Union[str, SignalInput]) -> SignalInput:
+    """
+    Accept either a raw string or a prepared SignalInput
+
+    Args:
+        text: Input text or SignalInput
+
+    Returns:
+        SignalInput for the text
+    """
+    if isinstance(text, SignalInput):
+        return text
+    return SignalInput(text)
@@ -0,0 +1,147 @@
+"""
+Shared keyword matching for the rule-based detectors
+Finds which keywords of a fixed list occur in a text in a single scan
+"""
+
+import numpy as np
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick unavailable; fall back to one substring scan per keyword
+    ahocorasick = None
+
+from ._numba import njit, warm_up
+
+
+@njit(cache=True)
+def aggregate(ids, weights, cat_caps):
+    """
+    Capped per-category keyword scores
+
+    Args:
+        ids: Category id of every matched keyword (int32)
+        weights: Score added per matched keyword, per category (float64)
+        cat_caps: Maximum score per category (float64)
+
+    Returns:
+        float64 array of min(count * weight, cap) per category
+    """
+    counts = np.zeros(cat_caps.shape[0], dtype=np.int64)
+    for i in range(ids.shape[0]):
+        counts[ids[i]] += 1
+    scores = np.empty(cat_caps.shape[0], dtype=np.float64)
+    for c in range(cat_caps.shape[0]):
+        scores[c] = min(counts[c] * weights[c], cat_caps[c])
+    return scores
+
+
+warm_up(aggregate, np.zeros(1, dtype=np.int32), np.ones(1), np.ones(1))
+
+
+def add_unique(seen: dict, items, limit: int):
+    """
+    Add items to an insertion-ordered dict used as a bounded set
+
+    Args:
+        seen: Dict of items collected so far (values unused)
+        items: Items to add, in order
+        limit: Maximum number of items kept
+    """
+    for item in items:
+        if len(seen) >= limit:
+            break
+        seen.setdefault(item)
+
+
+class KeywordMatcher:
+    """Substring matcher over a fixed keyword list (Aho-Corasick when available)"""
+
+    def __init__(self, keywords):
+        """
+        Build the matcher
+
+        Args:
+            keywords: Iterable of lowercase keywords (duplicates are ignored)
+        """
+        self.keywords = tuple(dict.fromkeys(keywords))
+        self._automaton = None
+
+        if ahocorasick is not None and self.keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text_lower: str) -> set:
+        """
+        Find the keywords that occur anywhere in the text
+
+        Args:
+            text_lower: Lowercased text
+
+        Returns:
+            set of matched keywords (same result as `kw in text_lower` per keyword)
+        """
+        if self._automaton is None:
+            return {keyword for keyword in self.keywords if keyword in text_lower}
+        return {keyword for _, keyword in self._automaton.iter(text_lower)}
+
+
+class KeywordCategories:
+    """Keyword lists grouped into categories, each scored as min(count * weight, cap)"""
+
+    def __init__(self, categories: dict, weights: dict, caps: dict, extra_keywords=()):
+        """
+        Build the matcher and the per-category score arrays
+
+        Args:
+            categories: Category name -> keyword list
+            weights: Category name -> score per matched keyword
+            caps: Category name -> maximum category score
+            extra_keywords: Unscored keywords to find in the same scan
+                (see scan())
+        """
+        self.categories = categories
+        self.names = list(categories)
+        self._weights = np.array([weights[name] for name in self.names], dtype=np.float64)
+        self._caps = np.array([caps[name] for name in self.names], dtype=np.float64)
+        self._matcher = KeywordMatcher(
+            [kw for keywords in categories.values() for kw in keywords] + list(extra_keywords)
+        )
+
+    def scan(self, text_lower: str) -> set:
+        """
+        Find every category keyword and extra keyword in one pass
+
+        Args:
+            text_lower: Lowercased text
+
+        Returns:
+            set of keywords found in the text
+        """
+        return self._matcher.find(text_lower)
+
+    def match(self, text_lower: str, found: set = None) -> tuple:
+        """
+        Match every category against the text
+
+        Args:
+            text_lower: Lowercased text
+            found: Result of scan() for this text, if already computed
+
+        Returns:
+            (category -> matched keywords in list order, category -> score)
+        """
+        if found is None:
+            found = self._matcher.find(text_lower)
+        matches = {
+            name: [kw for kw in keywords if kw in found]
+            for name, keywords in self.categories.items()
+        }
+        ids = np.array(
+            [i for i, name in enumerate(self.names) for _ in matches[name]],
+            dtype=np.int32
+        )
+        scores = aggregate(ids, self._weights, self._caps).tolist()
+        return matches, dict(zip(self.names, scores))
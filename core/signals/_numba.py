@@ -0,0 +1,29 @@
+"""
+Optional Numba support shared by the JIT-compiled kernels
+Without Numba, njit is a no-op and the kernels run as plain Python
+"""
+
+import threading
+
+try:
+    from numba import guvectorize, njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    guvectorize = None
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernel runs as plain Python without Numba"""
+        return lambda func: func
+
+
+def warm_up(kernel, *args):
+    """
+    Compile (or load from cache) a kernel in a daemon thread, off the import path
+
+    Args:
+        kernel: njit function
+        *args: Arguments of one call with the types used at run time
+    """
+    if HAS_NUMBA:
+        threading.Thread(target=kernel, args=args, daemon=True).start()
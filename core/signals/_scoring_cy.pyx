@@ -0,0 +1,77 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Ahead-of-time compiled score core for improved_scoring
+Same cascade as improved_scoring._score_core with C-typed locals; build in
+place with `cythonize -i core/signals/_scoring_cy.pyx` (improved_scoring
+falls back to the Numba / pure-Python kernel when the extension is absent)
+"""
+
+from libc.math cimport rint
+
+
+cdef int _score(double child, double tox, double emotion, double cta, double context,
+                int child_sev, bint child_flag, bint *req_action,
+                int tox_sev, int severe_count, int child_expl, int child_comb) nogil:
+    """Weighted score + overrides; updates req_action in place"""
+    cdef double risk_score = (
+        0.35 * child +
+        0.30 * tox +
+        0.20 * emotion +
+        0.10 * cta +
+        0.05 * context
+    ) * 100
+    cdef double rounded
+
+    # ===== CRITICAL OVERRIDES - CHILD SAFETY =====
+    if child_sev == 4 or child_comb >= 1:
+        risk_score = max(risk_score, 95.0)
+        req_action[0] = True
+    elif child_sev == 3 or child_expl >= 2:
+        risk_score = max(risk_score, 85.0)
+        req_action[0] = True
+    elif child_flag and child > 0.6:
+        risk_score = max(risk_score, 80.0)
+    elif child_flag and child_expl >= 1:
+        risk_score = max(risk_score, 85.0)
+        req_action[0] = True
+
+    # ===== TOXICITY OVERRIDES =====
+    if req_action[0] and not child_flag:
+        risk_score = max(risk_score, 85.0)
+    if tox_sev == 4:
+        risk_score = max(risk_score, 90.0)
+    elif tox_sev == 3:
+        risk_score = max(risk_score, 75.0)
+    if severe_count >= 2:
+        risk_score = max(risk_score, 85.0)
+    elif severe_count >= 1:
+        risk_score = max(risk_score, 70.0)
+
+    # ===== COMBINATION MULTIPLIERS =====
+    if risk_score < 100.0:
+        if tox > 0.7 and emotion > 0.6:
+            risk_score = min(risk_score * 1.2, 100.0)
+        if tox > 0.7 and cta > 0.6:
+            risk_score = min(risk_score * 1.25, 100.0)
+        if child_flag and (tox > 0.6 or emotion > 0.6):
+            risk_score = 100.0 if risk_score >= 80.0 else min(risk_score * 1.3, 100.0)
+
+    # Cap at 100 (rint rounds half to even, like round())
+    rounded = rint(risk_score)
+    return <int>min(rounded, 100.0)
+
+
+def score_core(double child, double tox, double emotion, double cta, double context,
+               int child_sev, bint child_flag, bint req_action,
+               int tox_sev, int severe_count, int child_expl, int child_comb):
+    """
+    Compiled equivalent of improved_scoring._score_core
+
+    Returns:
+        (int risk score 0-100, requires immediate action)
+    """
+    cdef int risk_score
+    with nogil:
+        risk_score = _score(child, tox, emotion, cta, context, child_sev, child_flag, &req_action,
+                            tox_sev, severe_count, child_expl, child_comb)
+    return risk_score, bool(req_action)
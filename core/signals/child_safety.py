@@ -4,6 +4,10 @@ Detects content involving minors that needs escalated review
 """
 
 import re
+from typing import Union
+
+from ._input import SignalInput, as_signal_input
+from ._keywords import KeywordCategories, add_unique
 
 
 class ChildSafetyDetector:
@@ -18,6 +22,11 @@ class ChildSafetyDetector:
             "underage", "young", "youth", "juvenile"
         ]
         
+        # All minor terms as one whole-word pattern (compiled once)
+        self._minor_re = re.compile(
+            r'\b(?:' + '|'.join(re.escape(term) for term in self.minor_terms) + r')\b'
+        )
+        
         # Risky framing indicators (high-level, non-explicit)
         self.risky_framing = [
             "dm", "direct message", "private message", "pm me",
@@ -34,40 +43,51 @@ class ChildSafetyDetector:
             "harm", "danger", "risk", "threat", "unsafe",
             "missing", "runaway", "lost"
         ]
+        
+        # One scan finds every risky-framing and vulnerable-context term;
+        # scores are min(count * weight, cap) per list
+        self._keyword_categories = KeywordCategories(
+            {'risky': self.risky_framing, 'vulnerable': self.vulnerable_context},
+            weights={'risky': 0.25, 'vulnerable': 0.3},
+            caps={'risky': 0.6, 'vulnerable': 0.7}
+        )
     
-    def detect(self, text: str) -> dict:
+    def detect(self, text: Union[str, SignalInput]) -> dict:
         """
         Detect child safety concerns
         
         Args:
-            text: Input text
+            text: Input text or prepared SignalInput
             
         Returns:
             dict with child_score, child_flag, triggers
         """
-        text_lower = text.lower()
-        triggers = []
+        text_lower = as_signal_input(text).text_lower
+        triggers = {}  # unique, in order of discovery
         score_components = []
         
         # Check for minor mentions
-        minor_matches = [term for term in self.minor_terms if re.search(r'\b' + term + r'\b', text_lower)]
+        found_minor_terms = set(self._minor_re.findall(text_lower))
+        minor_matches = [term for term in self.minor_terms if term in found_minor_terms]
         has_minor_mention = len(minor_matches) > 0
         
         if has_minor_mention:
-            triggers.extend(minor_matches[:3])
+            add_unique(triggers, minor_matches[:3], 6)
             score_components.append(0.3)  # Base score for minor mention
         
+        matches, keyword_scores = self._keyword_categories.match(text_lower)
+        
         # Check for risky framing
-        risky_matches = [term for term in self.risky_framing if term in text_lower]
+        risky_matches = matches['risky']
         if risky_matches:
-            triggers.extend(risky_matches[:3])
-            score_components.append(min(len(risky_matches) * 0.25, 0.6))
+            add_unique(triggers, risky_matches[:3], 6)
+            score_components.append(keyword_scores['risky'])
         
         # Check for vulnerable context
-        vulnerable_matches = [term for term in self.vulnerable_context if term in text_lower]
+        vulnerable_matches = matches['vulnerable']
         if vulnerable_matches:
-            triggers.extend(vulnerable_matches[:2])
-            score_components.append(min(len(vulnerable_matches) * 0.3, 0.7))
+            add_unique(triggers, vulnerable_matches[:2], 6)
+            score_components.append(keyword_scores['vulnerable'])
         
         # Calculate score
         if score_components:
@@ -85,5 +105,5 @@ class ChildSafetyDetector:
         return {
             "child_score": round(child_score, 3),
             "child_flag": child_flag,
-            "triggers": list(set(triggers))[:6]
+            "triggers": list(triggers)
         }
@@ -5,6 +5,11 @@ Detects high-stakes topics (health, elections, communal tension, disasters)
 
 import json
 import os
+from typing import Union
+
+from ._cache import ResultCache
+from ._input import SignalInput, as_signal_input
+from ._keywords import KeywordCategories, add_unique
 
 # LIGHTWEIGHT MODE: Skip heavy ML models to prevent crashes
 LIGHTWEIGHT = os.getenv('HARMLENS_LIGHTWEIGHT', '1') == '1'
@@ -12,7 +17,8 @@ LIGHTWEIGHT = os.getenv('HARMLENS_LIGHTWEIGHT', '1') == '1'
 HAS_EMBEDDINGS = False
 if not LIGHTWEIGHT:
     try:
-        from sentence_transformers import SentenceTransformer, util
+        import torch.nn.functional as F
+        from ._embedder import get_encoder
         HAS_EMBEDDINGS = True
     except ImportError:
         HAS_EMBEDDINGS = False
@@ -21,25 +27,27 @@ if not LIGHTWEIGHT:
 class ContextDetector:
     """Detect sensitive context topics"""
     
-    def __init__(self, assets_path=None):
+    def __init__(self, assets_path=None, cache_size: int = 4096):
         self.model = None
-        self.anchor_embeddings = None
+        self.anchor_matrix = None
         self.topic_anchors = {
             "health": "public health advice medical treatment vaccine medicine",
             "election": "election voting candidates political campaign ballot results",
             "communal": "communal tension religious conflict ethnic violence riots",
             "disaster": "disaster emergency natural calamity earthquake flood fire"
         }
+        self.anchor_topics = list(self.topic_anchors.keys())
         
         # Load model if available
         if HAS_EMBEDDINGS:
             try:
-                self.model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-                # Pre-compute anchor embeddings
-                self.anchor_embeddings = {
-                    topic: self.model.encode(text, convert_to_tensor=True)
-                    for topic, text in self.topic_anchors.items()
-                }
+                # Shared with any other embedding-based signal
+                self.model = get_encoder()
+                # Pre-compute unit-length anchor embeddings as one (topics, dim) matrix
+                self.anchor_matrix = F.normalize(
+                    self.model.encode(list(self.topic_anchors.values()), convert_to_tensor=True),
+                    dim=1
+                )
             except Exception as e:
                 print(f"Could not load embedding model: {e}")
                 self.model = None
@@ -76,38 +84,64 @@ class ContextDetector:
                     self.sensitive_keywords.update(loaded)
             except:
                 pass
+        
+        # One scan finds the keywords of every topic; scores are
+        # min(count * 0.2, 0.8) per topic
+        self._keyword_categories = KeywordCategories(
+            self.sensitive_keywords,
+            weights=dict.fromkeys(self.sensitive_keywords, 0.2),
+            caps=dict.fromkeys(self.sensitive_keywords, 0.8)
+        )
+        
+        # Exact duplicate texts (reposts, spam) reuse the previous result
+        self._cache = ResultCache(cache_size) if cache_size > 0 else None
     
-    def detect(self, text: str) -> dict:
+    def detect(self, text: Union[str, SignalInput]) -> dict:
         """
         Detect context sensitivity
         
         Args:
-            text: Input text
+            text: Input text or prepared SignalInput
             
         Returns:
             dict with context_score, context_topic, matched_keywords
         """
-        text_lower = text.lower()
-        matched_keywords = []
+        inp = as_signal_input(text)
+        if self._cache is None:
+            return self._detect(inp)
+        
+        result = self._cache.get(inp.text)
+        if result is None:
+            result = self._detect(inp)
+            self._cache.put(inp.text, result)
+        return result
+    
+    def _detect(self, inp: SignalInput) -> dict:
+        """Context detection on a prepared input (no cache)"""
+        text, text_lower = inp.text, inp.text_lower
+        matched_keywords = {}  # unique, in order of discovery
         detected_topics = []
         keyword_scores = {}
         
         # Keyword matching
-        for topic, keywords in self.sensitive_keywords.items():
-            matches = [kw for kw in keywords if kw in text_lower]
+        topic_matches, topic_scores = self._keyword_categories.match(text_lower)
+        for topic, matches in topic_matches.items():
             if matches:
-                keyword_scores[topic] = min(len(matches) * 0.2, 0.8)
-                matched_keywords.extend(matches[:3])
+                keyword_scores[topic] = topic_scores[topic]
+                add_unique(matched_keywords, matches[:3], 8)
                 detected_topics.append(topic)
         
         # Embedding similarity (if model available)
         embedding_scores = {}
-        if self.model and self.anchor_embeddings:
+        if self.model and self.anchor_matrix is not None:
             try:
-                text_embedding = self.model.encode(text[:512], convert_to_tensor=True)
+                text_embedding = F.normalize(
+                    self.model.encode(text[:512], convert_to_tensor=True), dim=0
+                )
                 
-                for topic, anchor_emb in self.anchor_embeddings.items():
-                    similarity = util.cos_sim(text_embedding, anchor_emb).item()
+                # Cosine similarity to every anchor in one matmul
+                similarities = (self.anchor_matrix @ text_embedding).tolist()
+                for topic, similarity in zip(self.anchor_topics, similarities):
                     # Convert similarity (-1 to 1) to score (0 to 1)
                     embedding_scores[topic] = max((similarity + 1) / 2 - 0.5, 0) * 2
                     
@@ -135,6 +169,6 @@ class ContextDetector:
         return {
             "context_score": round(context_score, 3),
             "context_topic": top_topic,
-            "matched_keywords": list(set(matched_keywords))[:8],
+            "matched_keywords": list(matched_keywords),
             "all_topics": detected_topics
         }
@@ -4,6 +4,10 @@ Detects mobilization and urging behavior
 """
 
 import re
+from typing import Union
+
+from ._input import SignalInput, as_signal_input
+from ._keywords import KeywordCategories, add_unique
 
 
 class CTADetector:
@@ -38,45 +42,67 @@ class CTADetector:
             r'\bwe\s+need\s+to\s+\w+',
             r'\blet\'?s\s+\w+',
         ]
+        
+        # Literal word each directive pattern needs; a pattern whose anchor
+        # is absent from the text cannot match and is not run
+        self.directive_anchors = ["must", "need", "don", "stop", "everyone", "need", "let"]
+        
+        # Compiled once; each pattern's matches are collected separately so
+        # overlapping directives (e.g. "need to" inside "we need to") still count
+        self._directive_res = [
+            (anchor, re.compile(p))
+            for anchor, p in zip(self.directive_anchors, self.directive_patterns)
+        ]
+        
+        # One scan finds every action verb, urgency term and directive
+        # anchor; scores are min(count * weight, cap) per list
+        self._keyword_categories = KeywordCategories(
+            {'action': self.action_verbs, 'urgency': self.urgency_terms},
+            weights={'action': 0.2, 'urgency': 0.15},
+            caps={'action': 0.6, 'urgency': 0.4},
+            extra_keywords=self.directive_anchors
+        )
     
-    def detect(self, text: str) -> dict:
+    def detect(self, text: Union[str, SignalInput]) -> dict:
         """
         Detect call-to-action strength
         
         Args:
-            text: Input text
+            text: Input text or prepared SignalInput
             
         Returns:
             dict with cta_score, cta_triggers
         """
-        text_lower = text.lower()
-        triggers = []
+        inp = as_signal_input(text)
+        text, text_lower = inp.text, inp.text_lower
+        triggers = {}  # unique, in order of discovery
         score_components = []
         
+        found = self._keyword_categories.scan(text_lower)
+        matches, keyword_scores = self._keyword_categories.match(text_lower, found)
+        
         # Check action verbs
-        action_matches = [verb for verb in self.action_verbs if verb in text_lower]
+        action_matches = matches['action']
         if action_matches:
-            action_score = min(len(action_matches) * 0.2, 0.6)
-            score_components.append(action_score)
-            triggers.extend(action_matches[:5])  # Limit triggers
+            score_components.append(keyword_scores['action'])
+            add_unique(triggers, action_matches[:5], 8)  # Limit triggers
         
         # Check urgency terms
-        urgency_matches = [term for term in self.urgency_terms if term in text_lower]
+        urgency_matches = matches['urgency']
         if urgency_matches:
-            urgency_score = min(len(urgency_matches) * 0.15, 0.4)
-            score_components.append(urgency_score)
-            triggers.extend(urgency_matches[:3])
+            score_components.append(keyword_scores['urgency'])
+            add_unique(triggers, urgency_matches[:3], 8)
         
         # Check directive patterns (imperative mood)
         directive_matches = []
-        for pattern in self.directive_patterns:
-            matches = re.findall(pattern, text_lower)
-            directive_matches.extend(matches)
+        for anchor, pattern in self._directive_res:
+            if anchor in found:
+                directive_matches.extend(pattern.findall(text_lower))
         
         if directive_matches:
             directive_score = min(len(directive_matches) * 0.2, 0.5)
             score_components.append(directive_score)
-            triggers.extend(directive_matches[:3])
+            add_unique(triggers, directive_matches[:3], 8)
         
         # Check for exclamation marks (intensity indicator)
         exclamation_count = text.count('!')
@@ -91,5 +117,5 @@ class CTADetector:
         
         return {
             "cta_score": round(cta_score, 3),
-            "cta_triggers": list(set(triggers))[:8]  # Unique, limited
+            "cta_triggers": list(triggers)  # Unique, limited
         }
@@ -5,6 +5,13 @@ Uses emotion classification to detect fear/anger/urgency
 
 import os
 import re
+from typing import Union
+
+import numpy as np
+
+from ._cache import ResultCache
+from ._input import SignalInput, as_signal_input
+from ._keywords import KeywordCategories
 
 # LIGHTWEIGHT MODE: Skip heavy ML models to prevent crashes
 # Set HARMLENS_LIGHTWEIGHT=0 to use ML models (needs ~2GB RAM)
@@ -22,7 +29,7 @@ if not LIGHTWEIGHT:
 class EmotionDetector:
     """Detect emotional intensity in text"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 4096):
         self.model = None
         if HAS_TRANSFORMERS:
             try:
@@ -42,24 +49,54 @@ class EmotionDetector:
             "asap", "right now", "today", "tonight", "must act",
             "time is running out", "before it's too late", "act now"
         ]
+        
+        # Rule-based fallback vocabulary
+        self.emotion_keywords = {
+            'fear': ['afraid', 'scared', 'terrified', 'panic', 'fear', 'worry', 'danger', 'threat', 'risk'],
+            'anger': ['angry', 'furious', 'outrage', 'hate', 'rage', 'mad', 'disgusting', 'unacceptable'],
+            'sadness': ['sad', 'tragic', 'devastated', 'heartbroken', 'awful', 'terrible']
+        }
+        
+        # One scan finds urgency and emotion keywords; scores are
+        # min(count * weight, cap) per list
+        categories = {'urgency': self.urgency_keywords, **self.emotion_keywords}
+        self._keyword_categories = KeywordCategories(
+            categories,
+            weights={name: 0.15 if name == 'urgency' else 0.25 for name in categories},
+            caps={name: 0.5 if name == 'urgency' else 1.0 for name in categories}
+        )
+        
+        # Exact duplicate texts (reposts, spam) reuse the previous result
+        self._cache = ResultCache(cache_size) if cache_size > 0 else None
     
-    def detect(self, text: str) -> dict:
+    def detect(self, text: Union[str, SignalInput]) -> dict:
         """
         Detect emotion intensity
         
         Args:
-            text: Input text
+            text: Input text or prepared SignalInput
             
         Returns:
             dict with emotion_score, emotion_labels, trigger_words
         """
-        text_lower = text.lower()
+        inp = as_signal_input(text)
+        if self._cache is None:
+            return self._detect(inp)
         
-        # Detect urgency bonus
-        urgency_count = sum(1 for kw in self.urgency_keywords if kw in text_lower)
-        urgency_bonus = min(urgency_count * 0.15, 0.5)  # Cap at 0.5
+        result = self._cache.get(inp.text)
+        if result is None:
+            result = self._detect(inp)
+            self._cache.put(inp.text, result)
+        return result
+    
+    def _detect(self, inp: SignalInput) -> dict:
+        """Emotion detection on a prepared input (no cache)"""
+        text, text_lower = inp.text, inp.text_lower
+        matches, keyword_scores = self._keyword_categories.match(text_lower)
         
-        urgency_triggers = [kw for kw in self.urgency_keywords if kw in text_lower]
+        # Detect urgency bonus
+        urgency_triggers = matches['urgency']
+        urgency_bonus = keyword_scores['urgency']  # Cap at 0.5
         
         # If model available, use it
         if self.model:
@@ -67,7 +104,9 @@ class EmotionDetector:
                 results = self.model(text[:512])[0]  # Truncate to model limit
                 
                 # Extract scores
-                emotion_dict = {r['label']: r['score'] for r in results}
+                labels = [r['label'] for r in results]
+                scores = np.fromiter((r['score'] for r in results), dtype=np.float64, count=len(results))
+                emotion_dict = dict(zip(labels, scores.tolist()))
                 
                 # Focus on fear, anger, sadness (high-intensity emotions)
                 fear_score = emotion_dict.get('fear', 0)
@@ -77,9 +116,15 @@ class EmotionDetector:
                 base_score = max(fear_score, anger_score, sadness_score * 0.7)
                 emotion_score = min(base_score * (1 + urgency_bonus), 1.0)
                 
-                # Get top emotions
-                sorted_emotions = sorted(results, key=lambda x: x['score'], reverse=True)
-                top_emotions = [e['label'] for e in sorted_emotions[:3] if e['score'] > 0.1]
+                # Get top emotions: partial select of the 3rd-highest score,
+                # then order only the candidates (ties keep model order)
+                top_emotions = []
+                k = min(3, len(labels))
+                if k:
+                    kth_score = -np.partition(-scores, k - 1)[k - 1]
+                    top = np.flatnonzero(scores >= kth_score)
+                    top = top[np.argsort(-scores[top], kind='stable')][:k]
+                    top_emotions = [labels[i] for i in top if scores[i] > 0.1]
                 
                 return {
                     "emotion_score": round(emotion_score, 3),
@@ -92,19 +137,12 @@ class EmotionDetector:
                 # Fall through to rule-based
         
         # Fallback: rule-based emotion detection
-        emotion_keywords = {
-            'fear': ['afraid', 'scared', 'terrified', 'panic', 'fear', 'worry', 'danger', 'threat', 'risk'],
-            'anger': ['angry', 'furious', 'outrage', 'hate', 'rage', 'mad', 'disgusting', 'unacceptable'],
-            'sadness': ['sad', 'tragic', 'devastated', 'heartbroken', 'awful', 'terrible']
-        }
-        
         emotion_scores = {}
         detected_labels = []
         
-        for emotion, keywords in emotion_keywords.items():
-            count = sum(1 for kw in keywords if kw in text_lower)
-            if count > 0:
-                emotion_scores[emotion] = min(count * 0.25, 1.0)
+        for emotion in self.emotion_keywords:
+            if matches[emotion]:
+                emotion_scores[emotion] = keyword_scores[emotion]
                 detected_labels.append(emotion)
         
         base_score = max(emotion_scores.values()) if emotion_scores else 0.2
@@ -4,7 +4,66 @@ CRITICAL: Aggressive detection for child exploitation, trafficking, grooming
 """
 
 import re
-from typing import Dict, List
+from typing import Dict, List, Union
+
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick unavailable; whole words use the union regex and each
+    # substring keyword a substring check
+    ahocorasick = None
+
+from ._input import SignalInput, as_signal_input
+
+
+def _is_word_char(char: str) -> bool:
+    """Same definition of a word character as regex \\w"""
+    return char.isalnum() or char == '_'
+
+
+class _GapPattern:
+    """
+    A 'head.*tail' regex matched in linear time
+    
+    re.search tries the '.*' from every head match and rescans the rest of
+    the line each time, which is quadratic on long text with many heads and
+    no tail. Since '.' stops at newlines, the pattern matches exactly when
+    tail matches between some head's end and the end of that line; a later
+    head ending on a line already searched cannot do better, so each line
+    is searched for the tail at most once.
+    """
+    
+    def __init__(self, pattern: str, flags: int = 0):
+        self.pattern = pattern
+        head, tail = pattern.split('.*')
+        self._head = re.compile(head, flags)
+        self._tail = re.compile(tail, flags)
+    
+    def search(self, text: str):
+        """Return a truthy match where the full pattern matches text, else None"""
+        pos = 0
+        searched_to = -1  # tail is absent up to here on its line
+        while True:
+            head = self._head.search(text, pos)
+            if head is None:
+                return None
+            end = head.end()
+            if end > searched_to:
+                line_end = text.find('\n', end)
+                if line_end == -1:
+                    line_end = len(text)
+                tail = self._tail.search(text, end, line_end)
+                if tail is not None:
+                    return tail
+                searched_to = line_end
+            pos = head.start() + 1
+
+
+def _compile(pattern: str):
+    """Compile a pattern, using _GapPattern for one with a '.*' gap"""
+    if '.*' in pattern:
+        return _GapPattern(pattern, re.IGNORECASE)
+    return re.compile(pattern, re.IGNORECASE)
 
 
 class EnhancedChildSafetyDetector:
@@ -64,19 +123,35 @@ class EnhancedChildSafetyDetector:
             r'\balone\b.*\b(meet|contact)\b'
         ]
         
+        # Literals each exploitation pattern needs (any one of them must occur
+        # in the text for the pattern to match), in the same order
+        self.exploitation_anchors = [
+            ('child', 'kid', 'minor', 'young'), ('child', 'kid', 'minor', 'young'),
+            ('labor',), ('child',),
+            ('salary',), ('salary',),
+            ('child', 'kid', 'minor'), ('$',),
+            ('secret',), ("don't",), ('keep',), ('hide',),
+            ('meet',), ('meet',), ('come',), ('private',),
+            ('special',), ('mature',), ("don't",), ('between',), ('secret',),
+            ('travel',), ('take',), ('pick',), ('alone',)
+        ]
+        
         # CRITICAL: Combined danger patterns
+        # Each leg holds when any of its whole-word tokens occurs. The two
+        # legs that are not plain words keep a regex alternative: a '$'
+        # between word characters, and the "don't tell ... parent" phrase.
         self.danger_combinations = [
             # Child + work + money
-            (r'\b(child|kid|minor)\b', r'\b(work|job|labor)\b', r'\b(salary|pay|money|\$)\b'),
+            ({'child', 'kid', 'minor'}, {'work', 'job', 'labor'}, ({'salary', 'pay', 'money'}, r'\b\$\b')),
             
             # Child + secret + location
-            (r'\b(child|kid|minor)\b', r'\bsecret\b', r'\b(location|place|meet)\b'),
+            ({'child', 'kid', 'minor'}, {'secret'}, {'location', 'place', 'meet'}),
             
             # Child + don't tell parents + money
-            (r'\b(child|kid|minor)\b', r'\bdon\'t\s+(tell|inform)\b.*\bparent', r'\b(money|pay|salary)\b'),
+            ({'child', 'kid', 'minor'}, (set(), r'\bdon\'t\s+(tell|inform)\b.*\bparent'), {'money', 'pay', 'salary'}),
             
             # Work + secret + location
-            (r'\b(work|job)\b', r'\bsecret\b', r'\b(location|place|address)\b'),
+            ({'work', 'job'}, {'secret'}, {'location', 'place', 'address'}),
         ]
         
         # Vulnerable context
@@ -85,28 +160,117 @@ class EnhancedChildSafetyDetector:
             'harm', 'danger', 'unsafe', 'missing', 'runaway',
             'recruit', 'recruiting', 'opportunity', 'easy money'
         ]
+        
+        # Every danger combination leg as (token set, optional compiled regex)
+        self._danger_combinations = [
+            tuple(
+                (frozenset(leg[0]), _compile(leg[1]))
+                if isinstance(leg, tuple) else (frozenset(leg), None)
+                for leg in combo
+            )
+            for combo in self.danger_combinations
+        ]
+        
+        # Every child term is a plain \bword\b, and so is every combination
+        # token, so all of them fit in one \b(word|word|...)\b alternation: a
+        # single findall pass finds every whole word of interest (whole words
+        # never overlap).
+        self._child_names = [
+            p.replace(r'\b', '').replace('\\', '') for p in self.child_terms
+        ]
+        combination_tokens = sorted(
+            {token for combo in self._danger_combinations for tokens, _ in combo for token in tokens}
+        )
+        self._words = list(dict.fromkeys(self._child_names + combination_tokens))
+        self._word_re = re.compile(r'\b(' + '|'.join(self._words) + r')\b')
+        
+        # Vulnerable keywords and exploitation anchors match as plain
+        # substrings. The anchors decide which exploitation patterns can
+        # possibly match; only those are run, so safe text (which usually
+        # contains none of them) skips the regex work entirely.
+        self._substrings = list(dict.fromkeys(
+            self.vulnerable_keywords +
+            [literal for anchors in self.exploitation_anchors for literal in anchors]
+        ))
+        
+        # With pyahocorasick, whole words and substring keywords are all found
+        # in one automaton pass; whole words then get the \b check
+        self._term_automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            words, substrings = set(self._words), set(self._substrings)
+            for word in dict.fromkeys(self._words + self._substrings):
+                automaton.add_word(word, (word, word in words, word in substrings))
+            automaton.make_automaton()
+            self._term_automaton = automaton
+        
+        # Compile every pattern once instead of going through re's cache on
+        # each call ('.*' patterns match in linear time, see _GapPattern)
+        self._exploit_patterns = [_compile(p) for p in self.exploitation_patterns]
+        
+        # Anything that scores needs at least a child term or a vulnerable
+        # keyword, so shorter text returns the empty result without a scan
+        self._min_text_len = min(len(word) for word in self._child_names + self.vulnerable_keywords)
+        self._empty_result = {
+            'child_score': 0.0,
+            'child_flag': False,
+            'severity': 'none',
+            'triggers': [],
+            'exploitation_matches': 0,
+            'combination_matches': 0,
+            'requires_immediate_action': False
+        }
+    
+    def _scan_terms(self, text_lower: str) -> tuple:
+        """
+        Find child terms and combination tokens (whole words), vulnerable
+        keywords and exploitation anchors (substrings)
+        
+        Args:
+            text_lower: Lowercased text
+        
+        Returns:
+            (set of whole words matched, set of substring keywords found)
+        """
+        if self._term_automaton is None:
+            matched_tokens = set(self._word_re.findall(text_lower))
+            substrings_found = {kw for kw in self._substrings if kw in text_lower}
+            return matched_tokens, substrings_found
+        
+        matched_tokens, substrings_found = set(), set()
+        text_len = len(text_lower)
+        for end, (word, is_word, is_substring) in self._term_automaton.iter(text_lower):
+            if is_substring:
+                substrings_found.add(word)
+            if is_word:
+                start = end - len(word) + 1
+                if ((start == 0 or not _is_word_char(text_lower[start - 1])) and
+                        (end + 1 == text_len or not _is_word_char(text_lower[end + 1]))):
+                    matched_tokens.add(word)
+        return matched_tokens, substrings_found
     
-    def detect(self, text: str) -> Dict:
+    def detect(self, text: Union[str, SignalInput]) -> Dict:
         """
         Detect child safety concerns with AGGRESSIVE scoring
         
         Args:
-            text: Input text
+            text: Input text or prepared SignalInput
         
         Returns:
             dict with child_score, child_flag, severity, triggers
         """
-        text_lower = text.lower()
+        text_lower = as_signal_input(text).text_lower
+        if len(text_lower) < self._min_text_len:
+            return dict(self._empty_result, triggers=[])
+        
         triggers = []
         score = 0.0
         severity = 'none'
         matched_patterns = []
         
-        # Check for child/minor mentions
-        child_mentions = []
-        for pattern in self.child_terms:
-            if re.search(pattern, text_lower):
-                child_mentions.append(pattern.replace(r'\b', '').replace('\\', ''))
+        # Check for child/minor mentions (reported in child_terms order)
+        matched_tokens, substrings_found = self._scan_terms(text_lower)
+        child_mentions = [name for name in self._child_names if name in matched_tokens]
         
         has_child_mention = len(child_mentions) > 0
         
@@ -116,10 +280,10 @@ class EnhancedChildSafetyDetector:
         
         # CRITICAL: Check exploitation patterns
         exploitation_matches = 0
-        for pattern in self.exploitation_patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
+        for pattern, anchors in zip(self._exploit_patterns, self.exploitation_anchors):
+            if any(anchor in substrings_found for anchor in anchors) and pattern.search(text_lower):
                 exploitation_matches += 1
-                matched_patterns.append(pattern[:50])
+                matched_patterns.append(pattern.pattern[:50])
                 score += 0.3  # Each match adds 30%
         
         if exploitation_matches > 0:
@@ -127,8 +291,9 @@ class EnhancedChildSafetyDetector:
         
         # CRITICAL: Check danger combinations
         combination_matches = 0
-        for combo in self.danger_combinations:
-            if all(re.search(pattern, text_lower, re.IGNORECASE) for pattern in combo):
+        for combo in self._danger_combinations:
+            if all(tokens & matched_tokens or (pattern is not None and pattern.search(text_lower))
+                   for tokens, pattern in combo):
                 combination_matches += 1
                 score += 0.4  # Each combination adds 40%
         
@@ -136,7 +301,7 @@ class EnhancedChildSafetyDetector:
             triggers.append(f"{combination_matches} danger combinations")
         
         # Check vulnerable keywords
-        vulnerable_matches = [kw for kw in self.vulnerable_keywords if kw in text_lower]
+        vulnerable_matches = [kw for kw in self.vulnerable_keywords if kw in substrings_found]
         if vulnerable_matches:
             score += min(len(vulnerable_matches) * 0.15, 0.5)
             triggers.extend(vulnerable_matches[:2])
@@ -3,6 +3,9 @@ Image Content Moderation with OCR
 Analyzes both visual content AND text extracted from images
 """
 
+import hashlib
+import os
+import sys
 import torch
 import torch.nn as nn
 from transformers import (
@@ -13,10 +16,23 @@ from transformers import (
 )
 from PIL import Image
 import numpy as np
+from dataclasses import dataclass, field, fields
+from functools import cached_property
 from typing import Dict, List, Optional, Union
 import warnings
 warnings.filterwarnings('ignore')
 
+from ._cache import ResultCache
+from .enhanced_child_safety import get_child_safety_detector
+
+# INT8 MODE: dynamically quantize the NSFW classifier's Linear layers on CPU
+# Set HARMLENS_INT8=1 to enable (faster, scores shift slightly)
+QUANTIZE_CPU = os.getenv('HARMLENS_INT8', '0') == '1'
+
+# COMPILE MODE: torch.compile the image encoders (slow first call, faster after)
+# Set HARMLENS_TORCH_COMPILE=1 to enable
+COMPILE_MODELS = os.getenv('HARMLENS_TORCH_COMPILE', '0') == '1'
+
 # Import text moderation for OCR text
 try:
     from core.signals.advanced_toxicity import AdvancedToxicityDetector
@@ -24,6 +40,32 @@ try:
 except:
     HAS_TEXT_DETECTOR = False
 
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class ModerationResult:
+    """Analysis of one image while it is being built (attribute access instead of dict lookups)"""
+    risk_score: int = 0
+    risk_label: str = 'Low'
+    categories: list = field(default_factory=list)
+    detections: dict = field(default_factory=dict)
+    nsfw_score: float = 0
+    violence_score: float = 0
+    hate_score: float = 0
+    child_safety_score: float = 0
+    self_harm_score: float = 0
+    drugs_score: float = 0
+    disturbing_score: float = 0
+    text_content: str = ''
+    text_toxicity_score: float = 0
+    text_categories: list = field(default_factory=list)
+    
+    def to_dict(self) -> dict:
+        """Convert to the result dict returned by analyze_image()"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
 
 class ImageModerationModel:
     """
@@ -39,13 +81,38 @@ class ImageModerationModel:
     6. Advanced text toxicity detection on extracted text
     """
     
-    def __init__(self, device: str = None, enable_ocr: bool = True):
+    # Skip OCR when CLIP's text probe gives "no text" more than this probability
+    NO_TEXT_SKIP_OCR = 0.8
+    
+    # OCR text shorter than this (file names, watermarks, OCR noise) only goes
+    # to the text models if the toxicity patterns or the child-safety keyword
+    # scan flag it
+    SHORT_OCR_TEXT = 40
+    
+    # Largest input side of the processor-based models (TrOCR 384, CLIP/NSFW
+    # 224); bigger images are shrunk once so the shorter side is this long
+    # before preprocessing. RapidOCR and EasyOCR detect text at full
+    # resolution and always get the original image.
+    MAX_INPUT_SIDE = 384
+    
+    # Weighted scoring for visual content (weights in the same order as keys)
+    VISUAL_KEYS = (
+        'nsfw_score', 'violence_score', 'child_safety_score', 'hate_score',
+        'self_harm_score', 'drugs_score', 'disturbing_score'
+    )
+    VISUAL_WEIGHTS = np.array(
+        [0.20, 0.15, 0.25, 0.08, 0.08, 0.02, 0.02],  # child safety has the highest weight
+        dtype=np.float64
+    )
+    
+    def __init__(self, device: str = None, enable_ocr: bool = True, cache_size: int = 4096):
         """
-        Initialize image moderation models
+        Initialize image moderation (each model loads on first use)
         
         Args:
             device: 'cuda', 'mps', or 'cpu'. Auto-detects if None.
             enable_ocr: Whether to enable OCR text extraction
+            cache_size: Results kept for repeated images (0 disables the cache)
         """
         # Auto-detect device
         if device is None:
@@ -60,25 +127,22 @@ class ImageModerationModel:
         
         self.enable_ocr = enable_ocr
         
-        print(f"🖼️  Loading image moderation models on {self.device}...")
+        # Reposts and re-uploads repeat the same picture; results are cached
+        # by a digest of the exact pixels so identical copies skip every model
+        self._cache = ResultCache(cache_size) if cache_size > 0 else None
         
-        # Load CLIP for zero-shot classification
-        self._load_clip_model()
+        # Half precision on CUDA (Tensor Cores, half the memory traffic);
+        # the CPU keeps float32
+        self.dtype = torch.float16 if self.device == "cuda" else torch.float32
         
-        # Load NSFW detection model
-        self._load_nsfw_model()
+        # Side stream for host-to-device copies, so an upload can overlap
+        # another model's forward pass
+        self._copy_stream = torch.cuda.Stream() if self.device == "cuda" else None
         
-        # Load OCR model
-        if self.enable_ocr:
-            self._load_ocr_model()
-            
-            # Load text toxicity detector
-            if HAS_TEXT_DETECTOR:
-                self.text_detector = AdvancedToxicityDetector(device=self.device)
-                print("  ✓ Text toxicity detector loaded")
-            else:
-                self.text_detector = None
-                print("  ⚠️  Text toxicity detector not available")
+        # CLIP, NSFW, OCR and the text detector are cached properties: each
+        # one loads the first time an analysis needs it, so a caller that
+        # never reaches OCR never pays for TrOCR + the text models
+        print(f"🖼️  Image moderation on {self.device} (models load on first use)")
         
         # Define harmful content categories
         self.harmful_categories = {
@@ -112,19 +176,138 @@ class ImageModerationModel:
             ]
         }
         
-        print("✅ Image moderation models loaded")
+        # Every category's prompts flattened into one list, so they are all
+        # scored against the image in a single pass. Row c of the index
+        # holds category c's prompt positions, padded with the position of
+        # an extra -inf logit so all categories are reduced at once.
+        self._clip_prompts = []
+        self._clip_categories = list(self.harmful_categories)
+        groups = []
+        for descriptions in self.harmful_categories.values():
+            start = len(self._clip_prompts)
+            self._clip_prompts.extend(descriptions)
+            groups.append(list(range(start, len(self._clip_prompts))))
+        
+        # Text probe scored in the same pass: [has text, no text]. OCR is
+        # skipped on images CLIP is confident contain no text (most photos).
+        self._text_probe_index = len(self._clip_prompts)
+        self._clip_prompts.extend(["image with legible written text", "image with no text"])
+        
+        pad = len(self._clip_prompts)
+        width = max(len(group) for group in groups)
+        self._clip_category_index = torch.tensor(
+            [group + [pad] * (width - len(group)) for group in groups], device=self.device
+        )
+    
+    @cached_property
+    def clip_model(self):
+        """CLIP model, loaded on first access (None if loading failed)"""
+        return self._load_clip_model()
+    
+    @cached_property
+    def nsfw_model(self):
+        """NSFW classifier, loaded on first access (None if loading failed)"""
+        return self._load_nsfw_model()
+    
+    @cached_property
+    def ocr_model(self):
+        """'rapidocr', TrOCR model or 'easyocr', loaded on first access (None if all failed)"""
+        return self._load_ocr_model()
+    
+    @cached_property
+    def _clip_text_features(self):
+        """Normalized CLIP embeddings of every category prompt (encoded once)"""
+        model = self.clip_model  # loads CLIP (and clip_processor) if needed
+        inputs = self.clip_processor(
+            text=self._clip_prompts, return_tensors="pt", padding=True
+        ).to(self.device)
+        with torch.inference_mode():
+            # Same projection of the pooled output as CLIPModel.forward
+            pooled = model.text_model(
+                input_ids=inputs['input_ids'], attention_mask=inputs['attention_mask']
+            )[1]
+            text_features = model.text_projection(pooled).float()
+        return text_features / text_features.norm(dim=-1, keepdim=True)
+    
+    @cached_property
+    def text_detector(self):
+        """Text toxicity detector for OCR text, loaded on first access"""
+        if not HAS_TEXT_DETECTOR:
+            print("  ⚠️  Text toxicity detector not available")
+            return None
+        detector = AdvancedToxicityDetector(device=self.device)
+        print("  ✓ Text toxicity detector loaded")
+        return detector
+    
+    @cached_property
+    def pattern_detector(self):
+        """Pattern-only toxicity checks for short OCR text (no models loaded)"""
+        if not HAS_TEXT_DETECTOR:
+            return None
+        return AdvancedToxicityDetector(device='cpu', cache_size=0, load_models=False)
+    
+    def _prepare_model(self, model: nn.Module) -> nn.Module:
+        """Move a loaded model to the device in inference precision"""
+        model = model.to(self.device, dtype=self.dtype)
+        model.eval()
+        return model
+    
+    def _start_upload(self, processor, images: List[Image.Image]) -> tuple:
+        """
+        Preprocess images and start copying the pixel values to the device
+        
+        Args:
+            processor: Image processor of the model that will consume them
+            images: List of PIL Images
+        
+        Returns:
+            (pixel values on the device, CUDA event recorded after the copy or None)
+        """
+        pixel_values = processor(images=images, return_tensors="pt").pixel_values
+        if self._copy_stream is None:
+            return pixel_values.to(self.device, dtype=self.dtype), None
+        
+        # Pinned memory makes the copy truly asynchronous; the fp16 cast
+        # then runs on the device, on the same side stream
+        pixel_values = pixel_values.pin_memory()
+        with torch.cuda.stream(self._copy_stream):
+            pixel_values = pixel_values.to(self.device, non_blocking=True).to(self.dtype)
+            copied = torch.cuda.Event()
+            copied.record()
+        return pixel_values, copied
+    
+    def _finish_upload(self, upload: tuple) -> torch.Tensor:
+        """Make the compute stream wait for an upload from _start_upload"""
+        pixel_values, copied = upload
+        if copied is not None:
+            stream = torch.cuda.current_stream()
+            stream.wait_event(copied)
+            # The tensor was allocated on the copy stream but is used here
+            pixel_values.record_stream(stream)
+        return pixel_values
+    
+    def _compile(self, module: nn.Module) -> nn.Module:
+        """torch.compile a module's forward when HARMLENS_TORCH_COMPILE is set"""
+        if not COMPILE_MODELS or not hasattr(torch, 'compile'):
+            return module
+        # CUDA graphs ("reduce-overhead") cut launch overhead at small batches
+        return torch.compile(
+            module, mode="reduce-overhead" if self.device == "cuda" else "default", fullgraph=False
+        )
     
     def _load_clip_model(self):
         """Load CLIP model for zero-shot classification"""
         try:
             model_name = "openai/clip-vit-base-patch32"
             self.clip_processor = CLIPProcessor.from_pretrained(model_name)
-            self.clip_model = CLIPModel.from_pretrained(model_name).to(self.device)
-            self.clip_model.eval()
+            model = self._prepare_model(CLIPModel.from_pretrained(model_name))
+            # Only the vision tower runs per image (prompts are encoded once)
+            model.vision_model = self._compile(model.vision_model)
             print("  ✓ CLIP model loaded")
+            return model
         except Exception as e:
             print(f"  ⚠️  CLIP model failed: {e}")
-            self.clip_model = None
+            return None
     
     def _load_nsfw_model(self):
         """Load NSFW detection model"""
@@ -132,32 +315,52 @@ class ImageModerationModel:
             # Using a fine-tuned NSFW classifier
             model_name = "Falconsai/nsfw_image_detection"
             self.nsfw_processor = AutoImageProcessor.from_pretrained(model_name)
-            self.nsfw_model = AutoModelForImageClassification.from_pretrained(model_name).to(self.device)
-            self.nsfw_model.eval()
+            model = self._prepare_model(AutoModelForImageClassification.from_pretrained(model_name))
+            if self.device == "cpu" and QUANTIZE_CPU:
+                # Only gates one probability; int8 weights are 4x smaller and
+                # use the CPU's int8 dot-product instructions
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            model = self._compile(model)
             print("  ✓ NSFW detection model loaded")
+            return model
         except Exception as e:
             print(f"  ⚠️  NSFW model failed: {e}")
-            self.nsfw_model = None
+            return None
     
     def _load_ocr_model(self):
         """Load OCR model for text extraction"""
+        try:
+            # RapidOCR (text detector + CTC recognizer on ONNX Runtime) reads
+            # scene text such as memes and signs, and skips TrOCR's
+            # autoregressive decoding
+            from rapidocr_onnxruntime import RapidOCR
+            self.ocr_reader = RapidOCR()
+            print("  ✓ OCR model loaded (RapidOCR)")
+            return 'rapidocr'
+        except Exception as e:
+            print(f"  ⚠️  RapidOCR not available: {e}, using TrOCR...")
+        
         try:
             # Using TrOCR for text extraction
             model_name = "microsoft/trocr-base-printed"
             self.ocr_processor = TrOCRProcessor.from_pretrained(model_name)
-            self.ocr_model = VisionEncoderDecoderModel.from_pretrained(model_name).to(self.device)
-            self.ocr_model.eval()
+            model = self._prepare_model(VisionEncoderDecoderModel.from_pretrained(model_name))
+            # generate() decodes with growing shapes; compile the encoder only
+            model.encoder = self._compile(model.encoder)
             print("  ✓ OCR model loaded (TrOCR)")
+            return model
         except Exception as e:
             print(f"  ⚠️  OCR model failed: {e}, trying EasyOCR...")
             try:
                 import easyocr
                 self.ocr_reader = easyocr.Reader(['en'], gpu=(self.device == 'cuda'), verbose=False)
-                self.ocr_model = 'easyocr'
                 print("  ✓ OCR model loaded (EasyOCR)")
+                return 'easyocr'
             except Exception as e2:
                 print(f"  ⚠️  EasyOCR also failed: {e2}")
-                self.ocr_model = None
+                return None
     
     def extract_text_from_image(self, image: Image.Image) -> str:
         """
@@ -169,25 +372,49 @@ class ImageModerationModel:
         Returns:
             Extracted text string
         """
-        if not self.enable_ocr or self.ocr_model is None:
-            return ""
+        return self.extract_text_from_images([image])[0]
+    
+    def extract_text_from_images(self, images: List[Image.Image]) -> List[str]:
+        """
+        Extract text from several images (TrOCR runs them as one batch)
+        
+        Args:
+            images: List of PIL Images
+        
+        Returns:
+            Extracted text string per image
+        """
+        if not images or not self.enable_ocr or self.ocr_model is None:
+            return [""] * len(images)
         
         try:
-            if self.ocr_model == 'easyocr':
+            if self.ocr_model == 'rapidocr':
+                # RapidOCR: one (box, text, score) entry per detected line;
+                # it expects OpenCV's BGR channel order
+                texts = []
+                for image in images:
+                    img_array = np.asarray(image.convert('RGB'))[:, :, ::-1]
+                    results, _ = self.ocr_reader(img_array)
+                    texts.append('\n'.join(line[1] for line in (results or [])).strip())
+                return texts
+            elif self.ocr_model == 'easyocr':
                 # EasyOCR
-                import numpy as np
-                img_array = np.array(image.convert('RGB'))
-                results = self.ocr_reader.readtext(img_array, detail=0, paragraph=True)
-                return '\n'.join(results).strip()
+                texts = []
+                for image in images:
+                    img_array = np.array(image.convert('RGB'))
+                    results = self.ocr_reader.readtext(img_array, detail=0, paragraph=True)
+                    texts.append('\n'.join(results).strip())
+                return texts
             else:
                 # TrOCR
-                pixel_values = self.ocr_processor(images=image, return_tensors="pt").pixel_values.to(self.device)
-                generated_ids = self.ocr_model.generate(pixel_values)
-                generated_text = self.ocr_processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
-                return generated_text.strip()
+                pixel_values = self._finish_upload(self._start_upload(self.ocr_processor, images))
+                with torch.inference_mode():
+                    generated_ids = self.ocr_model.generate(pixel_values)
+                generated_texts = self.ocr_processor.batch_decode(generated_ids, skip_special_tokens=True)
+                return [text.strip() for text in generated_texts]
         except Exception as e:
             print(f"OCR extraction error: {e}")
-            return ""
+            return [""] * len(images)
     
     def analyze_image(self, image: Union[str, Image.Image]) -> Dict:
         """
@@ -199,151 +426,224 @@ class ImageModerationModel:
         Returns:
             Dictionary with risk scores and detected categories
         """
-        # Load image if path provided
+        return self.batch_analyze([image])[0]
+    
+    def _load_image(self, image: Union[str, Image.Image]) -> Image.Image:
+        """Open an image path as RGB (or take a PIL Image)"""
         if isinstance(image, str):
-            image = Image.open(image).convert('RGB')
+            image = Image.open(image)
+            if not self.enable_ocr:
+                # Without OCR nothing needs full resolution: JPEGs decode
+                # directly at a reduced scale that still covers the size
+                image.draft('RGB', (self.MAX_INPUT_SIDE, self.MAX_INPUT_SIDE))
+            image = image.convert('RGB')
         elif not isinstance(image, Image.Image):
             raise ValueError("Image must be PIL Image or file path")
-        
-        results = {
-            'risk_score': 0,
-            'risk_label': 'Low',
-            'categories': [],
-            'detections': {},
-            'nsfw_score': 0,
-            'violence_score': 0,
-            'hate_score': 0,
-            'child_safety_score': 0,
-            'self_harm_score': 0,
-            'drugs_score': 0,
-            'disturbing_score': 0,
-            'text_content': '',
-            'text_toxicity_score': 0,
-            'text_categories': []
-        }
+        return image
+    
+    def _shrink(self, image: Image.Image) -> Image.Image:
+        """Copy of the image shrunk to MAX_INPUT_SIDE for the CLIP, NSFW and TrOCR processors"""
+        # Those processors resize down to at most 384px anyway; doing it once
+        # here spares each of them resampling a multi-megapixel original
+        width, height = image.size
+        scale = self.MAX_INPUT_SIDE / min(width, height)
+        if scale < 1:
+            image = image.resize(
+                (max(1, round(width * scale)), max(1, round(height * scale))),
+                Image.Resampling.BILINEAR
+            )
+        return image
+    
+    def _image_key(self, image: Image.Image) -> str:
+        """Cache key: digest of the exact pixels (a perceptual hash would merge different images)"""
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16).hexdigest()
+        return f"pixels:{image.mode}:{image.size}:{digest}"
+    
+    def _analyze_batch(self, originals: List[Image.Image]) -> List[Dict]:
+        """Analyze loaded images with one forward pass per model"""
+        images = [self._shrink(image) for image in originals]
+        batch_results = [ModerationResult() for _ in images]
+        
+        # On CUDA, start the NSFW upload before CLIP runs so the copy
+        # overlaps CLIP's forward pass
+        nsfw_upload = None
+        if self.nsfw_model is not None and self._copy_stream is not None:
+            try:
+                nsfw_upload = self._start_upload(self.nsfw_processor, images)
+            except Exception:
+                nsfw_upload = None  # _analyze_nsfw retries and reports the error
         
         # Run CLIP zero-shot classification
-        if self.clip_model:
-            clip_results = self._analyze_with_clip(image)
-            results['detections']['clip'] = clip_results
-            
-            # Extract category scores
-            results['violence_score'] = clip_results.get('violence', 0)
-            results['hate_score'] = clip_results.get('hate_symbols', 0)
-            results['child_safety_score'] = clip_results.get('child_safety', 0)
-            results['self_harm_score'] = clip_results.get('self_harm', 0)
-            results['drugs_score'] = clip_results.get('drugs', 0)
-            results['disturbing_score'] = clip_results.get('disturbing', 0)
+        no_text_probs = [0.0] * len(images)
+        if self.clip_model is not None:
+            clip_batch, no_text_probs = self._analyze_with_clip(images)
+            for results, clip_results in zip(batch_results, clip_batch):
+                results.detections['clip'] = clip_results
+                
+                # Extract category scores
+                results.violence_score = clip_results.get('violence', 0)
+                results.hate_score = clip_results.get('hate_symbols', 0)
+                results.child_safety_score = clip_results.get('child_safety', 0)
+                results.self_harm_score = clip_results.get('self_harm', 0)
+                results.drugs_score = clip_results.get('drugs', 0)
+                results.disturbing_score = clip_results.get('disturbing', 0)
         
         # Run NSFW detection
-        if self.nsfw_model:
-            nsfw_result = self._analyze_nsfw(image)
-            results['detections']['nsfw'] = nsfw_result
-            results['nsfw_score'] = nsfw_result.get('nsfw_probability', 0)
+        if self.nsfw_model is not None:
+            for results, nsfw_result in zip(batch_results, self._analyze_nsfw(images, nsfw_upload)):
+                results.detections['nsfw'] = nsfw_result
+                results.nsfw_score = nsfw_result.get('nsfw_probability', 0)
         
         # NEW: Extract and analyze text from image
         if self.enable_ocr:
-            extracted_text = self.extract_text_from_image(image)
-            results['text_content'] = extracted_text
+            # OCR only the images that may contain text
+            ocr_indices = [i for i, prob in enumerate(no_text_probs) if prob <= self.NO_TEXT_SKIP_OCR]
+            # Full-resolution text detectors read the originals, where small
+            # caption text is still legible; TrOCR takes the shrunk copies
+            ocr_images = originals if self.ocr_model in ('rapidocr', 'easyocr') else images
+            extracted_texts = self.extract_text_from_images([ocr_images[i] for i in ocr_indices])
             
-            if extracted_text and len(extracted_text) > 5:  # Only analyze if meaningful text
-                print(f"  📝 Extracted text: {extracted_text[:100]}...")
+            to_analyze = []
+            for i, extracted_text in zip(ocr_indices, extracted_texts):
+                results = batch_results[i]
+                results.text_content = extracted_text
                 
-                if self.text_detector:
-                    text_analysis = self.text_detector.detect(extracted_text)
-                    results['text_toxicity_score'] = text_analysis['tox_score'] * 100
-                    results['text_categories'] = text_analysis['categories']
-                    results['detections']['text'] = text_analysis
+                if extracted_text and len(extracted_text) > 5:  # Only analyze if meaningful text
+                    print(f"  📝 Extracted text: {extracted_text[:100]}...")
+                    
+                    if (len(extracted_text) < self.SHORT_OCR_TEXT and
+                            not self._short_text_flagged(extracted_text)):
+                        continue  # text_toxicity_score stays 0
+                    to_analyze.append(results)
+            
+            if to_analyze and self.text_detector:
+                text_analyses = self.text_detector.detect_batch(
+                    [results.text_content for results in to_analyze]
+                )
+                for results, text_analysis in zip(to_analyze, text_analyses):
+                    results.text_toxicity_score = text_analysis['tox_score'] * 100
+                    results.text_categories = text_analysis['categories']
+                    results.detections['text'] = text_analysis
                     
-                    print(f"  📊 Text toxicity: {results['text_toxicity_score']:.1f}/100")
+                    print(f"  📊 Text toxicity: {results.text_toxicity_score:.1f}/100")
         
-        # Calculate overall risk score (0-100)
-        risk_score = self._calculate_risk_score(results)
-        results['risk_score'] = risk_score
+        for results in batch_results:
+            # Calculate overall risk score (0-100)
+            risk_score = self._calculate_risk_score(results)
+            results.risk_score = risk_score
+            
+            # Determine risk label
+            if risk_score >= 70:
+                results.risk_label = 'High'
+            elif risk_score >= 40:
+                results.risk_label = 'Medium'
+            else:
+                results.risk_label = 'Low'
+            
+            # Identify detected categories
+            results.categories = self._identify_categories(results)
         
-        # Determine risk label
-        if risk_score >= 70:
-            results['risk_label'] = 'High'
-        elif risk_score >= 40:
-            results['risk_label'] = 'Medium'
-        else:
-            results['risk_label'] = 'Low'
+        return [results.to_dict() for results in batch_results]
+    
+    def _short_text_flagged(self, text: str) -> bool:
+        """
+        Cheap check whether short OCR text needs the text models
         
-        # Identify detected categories
-        results['categories'] = self._identify_categories(results)
+        Args:
+            text: Extracted text
         
-        return results
+        Returns:
+            True if the toxicity detector's own pattern pass or the
+            child-safety keyword scan finds anything
+        """
+        if self.pattern_detector is not None:
+            if self.pattern_detector.match_patterns(text)['pattern_score'] > 0:
+                return True
+        return get_child_safety_detector().detect(text)['severity'] != 'none'
     
-    def _analyze_with_clip(self, image: Image.Image) -> Dict:
-        """Use CLIP for zero-shot classification"""
-        category_scores = {}
+    def _analyze_with_clip(self, images: List[Image.Image]) -> tuple:
+        """
+        Use CLIP for zero-shot classification (one forward pass for the batch)
+        
+        Returns:
+            (category scores per image, "no text" probability per image)
+        """
+        category_scores = [{} for _ in images]
+        no_text_probs = [0.0] * len(images)
         
         try:
-            with torch.no_grad():
-                for category, descriptions in self.harmful_categories.items():
-                    # Prepare inputs
-                    inputs = self.clip_processor(
-                        text=descriptions,
-                        images=image,
-                        return_tensors="pt",
-                        padding=True
-                    ).to(self.device)
-                    
-                    # Get predictions
-                    outputs = self.clip_model(**inputs)
-                    logits_per_image = outputs.logits_per_image
-                    probs = logits_per_image.softmax(dim=1)
-                    
-                    # Get max probability for this category
-                    max_prob = probs.max().item()
-                    category_scores[category] = max_prob * 100
+            text_features = self._clip_text_features
+            with torch.inference_mode():
+                # Encode each image once and score it against every prompt
+                # (same logits as CLIPModel's logits_per_image); the
+                # similarities and softmax are computed in float32
+                pixel_values = self._finish_upload(self._start_upload(self.clip_processor, images))
+                pooled = self.clip_model.vision_model(pixel_values=pixel_values)[1]
+                image_features = self.clip_model.visual_projection(pooled).float()
+                image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+                logits = (image_features @ text_features.T) * self.clip_model.logit_scale.float().exp()
+                
+                # Max softmax probability within each category, without
+                # materialising the softmax: exp(max logit - logsumexp)
+                padded = torch.cat([logits, logits.new_full((logits.shape[0], 1), float('-inf'))], dim=1)
+                grouped = padded[:, self._clip_category_index]  # (images, categories, prompts)
+                max_probs = (grouped.max(dim=2).values - torch.logsumexp(grouped, dim=2)).exp()
+                for scores, row in zip(category_scores, (max_probs * 100).tolist()):
+                    scores.update(zip(self._clip_categories, row))
+                
+                # Two-way softmax of the text probe, as a sigmoid of the difference
+                has_text = logits[:, self._text_probe_index]
+                no_text_probs = torch.sigmoid(logits[:, self._text_probe_index + 1] - has_text).tolist()
         
         except Exception as e:
             print(f"CLIP analysis error: {e}")
+            category_scores = [{} for _ in images]
+            no_text_probs = [0.0] * len(images)
         
-        return category_scores
+        return category_scores, no_text_probs
     
-    def _analyze_nsfw(self, image: Image.Image) -> Dict:
-        """Analyze image for NSFW content"""
+    def _analyze_nsfw(self, images: List[Image.Image], upload: tuple = None) -> List[Dict]:
+        """Analyze images for NSFW content (one forward pass for the batch)"""
         try:
-            with torch.no_grad():
-                inputs = self.nsfw_processor(images=image, return_tensors="pt").to(self.device)
-                outputs = self.nsfw_model(**inputs)
-                logits = outputs.logits
-                probs = torch.nn.functional.softmax(logits, dim=-1)
+            with torch.inference_mode():
+                if upload is None:
+                    upload = self._start_upload(self.nsfw_processor, images)
+                pixel_values = self._finish_upload(upload)
+                outputs = self.nsfw_model(pixel_values=pixel_values)
+                logits = outputs.logits.float()
                 
                 # Get NSFW probability
                 # Model outputs: [normal, nsfw]
-                nsfw_prob = probs[0][1].item() if probs.shape[1] > 1 else probs[0][0].item()
+                if logits.shape[1] == 2:
+                    # Two-way softmax == sigmoid of the logit difference
+                    nsfw_probs = torch.sigmoid(logits[:, 1] - logits[:, 0]).tolist()
+                else:
+                    probs = torch.nn.functional.softmax(logits, dim=-1)
+                    nsfw_probs = (probs[:, 1] if probs.shape[1] > 1 else probs[:, 0]).tolist()
                 
-                return {
-                    'nsfw_probability': nsfw_prob * 100,
-                    'is_nsfw': nsfw_prob > 0.5
-                }
+                return [
+                    {
+                        'nsfw_probability': nsfw_prob * 100,
+                        'is_nsfw': nsfw_prob > 0.5
+                    }
+                    for nsfw_prob in nsfw_probs
+                ]
         
         except Exception as e:
             print(f"NSFW analysis error: {e}")
-            return {'nsfw_probability': 0, 'is_nsfw': False}
+            return [{'nsfw_probability': 0, 'is_nsfw': False} for _ in images]
     
-    def _calculate_risk_score(self, results: Dict) -> int:
+    def _calculate_risk_score(self, results: ModerationResult) -> int:
         """Calculate overall risk score from all detections INCLUDING text"""
         # Weighted scoring for visual content
-        visual_weights = {
-            'nsfw_score': 0.20,
-            'violence_score': 0.15,
-            'child_safety_score': 0.25,  # Highest weight
-            'hate_score': 0.08,
-            'self_harm_score': 0.08,
-            'drugs_score': 0.02,
-            'disturbing_score': 0.02
-        }
-        
-        visual_score = 0
-        for key, weight in visual_weights.items():
-            visual_score += results.get(key, 0) * weight
+        scores = np.fromiter(
+            (getattr(results, key) for key in self.VISUAL_KEYS),
+            dtype=np.float64, count=len(self.VISUAL_KEYS)
+        )
+        visual_score = float(self.VISUAL_WEIGHTS @ scores)
         
         # NEW: Add text toxicity score (20% weight)
-        text_score = results.get('text_toxicity_score', 0) * 0.20
+        text_score = results.text_toxicity_score * 0.20
         
         # Combined score
         risk_score = visual_score + text_score
@@ -355,35 +655,35 @@ class ImageModerationModel:
         # Cap at 100
         return min(int(risk_score), 100)
     
-    def _identify_categories(self, results: Dict) -> List[str]:
+    def _identify_categories(self, results: ModerationResult) -> List[str]:
         """Identify which categories were detected"""
         categories = []
         threshold = 30  # 30% confidence threshold
         
         # Visual categories
-        if results['nsfw_score'] > threshold:
+        if results.nsfw_score > threshold:
             categories.append('NSFW/Sexual Content')
         
-        if results['violence_score'] > threshold:
+        if results.violence_score > threshold:
             categories.append('Violence/Gore')
         
-        if results['hate_score'] > threshold:
+        if results.hate_score > threshold:
             categories.append('Hate Symbols')
         
-        if results['child_safety_score'] > threshold:
+        if results.child_safety_score > threshold:
             categories.append('Child Safety Concern')
         
-        if results['self_harm_score'] > threshold:
+        if results.self_harm_score > threshold:
             categories.append('Self-Harm')
         
-        if results['drugs_score'] > threshold:
+        if results.drugs_score > threshold:
             categories.append('Drugs/Substances')
         
-        if results['disturbing_score'] > threshold:
+        if results.disturbing_score > threshold:
             categories.append('Disturbing Content')
         
         # NEW: Text categories
-        text_categories = results.get('text_categories', [])
+        text_categories = results.text_categories
         if text_categories and text_categories != ['Safe']:
             for cat in text_categories:
                 if cat not in categories:
@@ -391,20 +691,36 @@ class ImageModerationModel:
         
         return categories if categories else ['Safe']
     
-    def batch_analyze(self, images: List[Union[str, Image.Image]]) -> List[Dict]:
+    def batch_analyze(self, images: List[Union[str, Image.Image]], batch_size: int = 16,
+                      use_cache: bool = True) -> List[Dict]:
         """
         Analyze multiple images in batch
         
         Args:
             images: List of PIL Images or file paths
+            batch_size: Images per forward pass of each model
+            use_cache: Look up and store results in the result cache (video
+                frames pass False: they seldom repeat and would evict uploads)
         
         Returns:
             List of analysis results
         """
         results = []
-        for image in images:
-            result = self.analyze_image(image)
-            results.append(result)
+        for start in range(0, len(images), batch_size):
+            batch = [self._load_image(image) for image in images[start:start + batch_size]]
+            if self._cache is None or not use_cache:
+                results.extend(self._analyze_batch(batch))
+                continue
+            
+            keys = [self._image_key(image) for image in batch]
+            batch_results = [self._cache.get(key) for key in keys]
+            pending = [i for i, result in enumerate(batch_results) if result is None]
+            if pending:
+                fresh = self._analyze_batch([batch[i] for i in pending])
+                for i, result in zip(pending, fresh):
+                    self._cache.put(keys[i], result)
+                    batch_results[i] = result
+            results.extend(batch_results)
         return results
 
 
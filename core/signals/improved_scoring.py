@@ -3,6 +3,227 @@ Improved Harm Risk Scoring
 More aggressive scoring that properly flags problematic content
 """
 
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+try:
+    # Optional AOT build of the score core: cythonize -i core/signals/_scoring_cy.pyx
+    from ._scoring_cy import score_core as _score_core_compiled
+except ImportError:
+    _score_core_compiled = None
+
+from core.signals._numba import HAS_NUMBA, guvectorize, njit, warm_up
+
+# Toxicity categories that trigger severity overrides
+_SEVERE_CATEGORIES = frozenset({
+    'Threats/Violence', 'Hate Speech', 'Sexual Harassment',
+    'Extremist Content', 'Slurs/Derogatory Language'
+})
+
+# Toxicity category label -> bit of toxicity_categories_mask
+_CAT_BITS = {
+    label: 1 << bit for bit, label in enumerate([
+        'Threats/Violence', 'Hate Speech', 'Harassment', 'Sexual Harassment',
+        'Slurs/Derogatory Language', 'Extremist Content', 'Self-Harm'
+    ])
+}
+_SEVERE_MASK = sum(_CAT_BITS[label] for label in _SEVERE_CATEGORIES)
+
+# Context topic -> harm category label
+_CONTEXT_CATEGORY_MAP = {
+    'health': 'Health Misinformation Risk',
+    'election': 'Election Misinformation Risk',
+    'communal': 'Communal Tension Risk',
+    'disaster': 'Disaster/Emergency Misinformation'
+}
+
+# Batch categories: context topic -> int8 code (0 = none; unknown topics
+# -> len(_CONTEXT_TOPICS), 'Sensitive Context') and emotion label bits
+_CONTEXT_TOPICS = {topic: code for code, topic in enumerate(['none'] + list(_CONTEXT_CATEGORY_MAP))}
+_EMOTION_BITS = {'fear': 1, 'anger': 2, 'sadness': 4}
+
+# Harm category id -> label, in the order get_improved_harm_categories emits them
+HARM_CATEGORY_NAMES = np.array(
+    list(_CAT_BITS) +
+    ['Panic/Fear-mongering', 'High Emotional Intensity', 'Mobilization/Call-to-Action'] +
+    list(_CONTEXT_CATEGORY_MAP.values()) +
+    ['Sensitive Context', 'Child Safety Concern', 'General Content'],
+    dtype=object
+)
+
+# Severity string -> int8 code used by _score_core and the batch scorer
+_SEVERITY_LEVELS = {'none': 0, 'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+_HIGH = _SEVERITY_LEVELS['high']
+_CRITICAL = _SEVERITY_LEVELS['critical']
+_SEVERITY_NAMES = np.array(list(_SEVERITY_LEVELS))
+
+# SignalFrame.flags bits
+_FLAG_CHILD = 1
+_FLAG_IMMEDIATE = 2
+
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# IMPROVED THRESHOLDS: More aggressive
+# Low: 0-49 (was 0-39)
+# Medium: 50-74 (was 40-69)
+# High: 75-100 (was 70-100)
+# Risk score -> label, indexed by the integer 0-100 score
+_RISK_LABELS = ('Low',) * 50 + ('Medium',) * 25 + ('High',) * 26
+_RISK_LABEL_ARRAY = np.array(_RISK_LABELS)
+
+@njit(cache=True)
+def _score_core(child, tox, emotion, cta, context, child_sev, child_flag, req_action,
+                tox_sev, severe_count, child_expl, child_comb):
+    """
+    Numeric core of calculate_improved_harm_score (weights + overrides)
+    
+    Args:
+        child_sev, tox_sev: _SEVERITY_LEVELS codes
+        severe_count: Number of severe toxicity categories
+        child_expl, child_comb: Child exploitation / combination match counts
+    
+    Returns:
+        (int risk score 0-100, requires immediate action)
+    """
+    # IMPROVED WEIGHTS: Child safety is now most important
+    # 35% Child Safety, 30% Toxicity, 20% Emotion, 10% CTA, 5% Context
+    risk_score = (
+        0.35 * child +
+        0.30 * tox +
+        0.20 * emotion +
+        0.10 * cta +
+        0.05 * context
+    ) * 100
+    
+    # ===== CRITICAL OVERRIDES - CHILD SAFETY =====
+    
+    # Override 1: CRITICAL child safety (exploitation/trafficking)
+    if child_sev == 4 or child_comb >= 1:
+        risk_score = max(risk_score, 95.0)
+        req_action = True
+    # Override 2: HIGH child safety (multiple exploitation patterns)
+    elif child_sev == 3 or child_expl >= 2:
+        risk_score = max(risk_score, 85.0)
+        req_action = True
+    # Override 3: Child flag with high score
+    elif child_flag and child > 0.6:
+        risk_score = max(risk_score, 80.0)
+    # Override 4: Child flag with any exploitation
+    elif child_flag and child_expl >= 1:
+        risk_score = max(risk_score, 85.0)
+        req_action = True
+    
+    # ===== TOXICITY OVERRIDES =====
+    
+    # Override 5: Immediate action required (threats, violence, etc.)
+    if req_action and not child_flag:
+        risk_score = max(risk_score, 85.0)
+    # Override 6: Critical toxicity severity
+    if tox_sev == 4:
+        risk_score = max(risk_score, 90.0)
+    elif tox_sev == 3:
+        risk_score = max(risk_score, 75.0)
+    # Override 7: Multiple severe categories
+    if severe_count >= 2:
+        risk_score = max(risk_score, 85.0)
+    elif severe_count >= 1:
+        risk_score = max(risk_score, 70.0)
+    
+    # ===== COMBINATION MULTIPLIERS =====
+    
+    # The multipliers only cap a score that is already at 100
+    if risk_score < 100.0:
+        # Override 8: High toxicity + high emotion = very dangerous
+        if tox > 0.7 and emotion > 0.6:
+            risk_score = min(risk_score * 1.2, 100.0)
+        # Override 9: High toxicity + CTA = mobilization for harm
+        if tox > 0.7 and cta > 0.6:
+            risk_score = min(risk_score * 1.25, 100.0)
+        # Override 10: Child safety + any other high signal
+        # (any child floor of 80+ is already past the cap: 80 * 1.3 > 100)
+        if child_flag and (tox > 0.6 or emotion > 0.6):
+            risk_score = 100.0 if risk_score >= 80.0 else min(risk_score * 1.3, 100.0)
+    
+    # Cap at 100
+    return min(int(round(risk_score)), 100), req_action
+
+
+def categories_to_mask(categories) -> int:
+    """
+    Pack toxicity category labels into a toxicity_categories_mask
+    
+    Args:
+        categories: Toxicity detector category labels (unknown labels are ignored)
+    
+    Returns:
+        int bitmask of the known categories (see _CAT_BITS)
+    """
+    mask = 0
+    for label in categories:
+        mask |= _CAT_BITS.get(label, 0)
+    return mask
+
+
+# Prefer the compiled extension; otherwise the Numba (or plain Python) kernel
+_score_impl = _score_core_compiled if _score_core_compiled is not None else _score_core
+
+if _score_core_compiled is None:
+    warm_up(_score_core, 0.0, 0.0, 0.0, 0.0, 0.0, 0, False, False, 1, 0, 0, 0)
+
+
+# Batches at least this large are scored on all cores (Numba only);
+# below it thread start-up costs more than the NumPy path
+PARALLEL_MIN_ITEMS = 4096
+
+
+@lru_cache(maxsize=1)
+def _parallel_scorer():
+    """
+    Build (once) _score_core as a gufunc whose loop over the items Numba
+    threads across all cores
+    
+    Built on first use rather than at import: compiling it while this module
+    is still importing can deadlock with the _score_core warm-up thread
+    
+    Returns:
+        gufunc(child, tox, emotion, cta, context, child_sev, flags, tox_sev,
+        severe_count, child_expl, child_comb) -> (risk_score, req_action),
+        or None without Numba
+    """
+    if not HAS_NUMBA:
+        return None
+    
+    @guvectorize(
+        ['void(f8[:], f8[:], f8[:], f8[:], f8[:], i1[:], u1[:], i1[:], i1[:], i2[:], i2[:], i2[:], b1[:])'],
+        '(),(),(),(),(),(),(),(),(),(),()->(),()',
+        target='parallel', nopython=True, cache=True
+    )
+    def score_parallel(child, tox, emotion, cta, context, child_sev, flags, tox_sev,
+                       severe_count, child_expl, child_comb, risk_score, req_action):
+        score, action = _score_core(
+            child[0], tox[0], emotion[0], cta[0], context[0], child_sev[0],
+            (flags[0] & _FLAG_CHILD) != 0, (flags[0] & _FLAG_IMMEDIATE) != 0,
+            tox_sev[0], severe_count[0], child_expl[0], child_comb[0]
+        )
+        risk_score[0] = score
+        req_action[0] = action
+    
+    return score_parallel
+
+
+@lru_cache(maxsize=16384)
+def _cached_core(key: tuple) -> tuple:
+    """
+    _score_core memoized on its arguments
+    
+    Reposts, retries and evaluation sweeps re-score identical signals; the
+    key holds every input that affects the score, so cached results are exact
+    """
+    return _score_impl(*key)
+
 
 def calculate_improved_harm_score(signals: dict) -> dict:
     """
@@ -20,6 +241,8 @@ def calculate_improved_harm_score(signals: dict) -> dict:
             - requires_immediate_action (optional)
             - child_severity (optional) - NEW
             - child_exploitation_matches (optional) - NEW
+            - toxicity_categories_mask (optional) - categories_to_mask()
+              of toxicity_categories, used instead of the list when given
     
     Returns:
         dict with risk_score (0-100), risk_label, breakdown
@@ -42,90 +265,23 @@ def calculate_improved_harm_score(signals: dict) -> dict:
     child_exploitation_matches = signals.get('child_exploitation_matches', 0)
     child_combination_matches = signals.get('child_combination_matches', 0)
     
-    # IMPROVED WEIGHTS: Child safety is now most important
-    # 35% Child Safety, 30% Toxicity, 20% Emotion, 10% CTA, 5% Context
-    base_score = (
-        0.35 * child +
-        0.30 * tox +
-        0.20 * emotion +
-        0.10 * cta +
-        0.05 * context
-    )
-    
-    # Convert to 0-100 scale
-    risk_score = base_score * 100
-    
-    # ===== CRITICAL OVERRIDES - CHILD SAFETY =====
-    
-    # Override 1: CRITICAL child safety (exploitation/trafficking)
-    if child_severity == 'critical' or child_combination_matches >= 1:
-        risk_score = max(risk_score, 95)
-        requires_immediate_action = True
-    
-    # Override 2: HIGH child safety (multiple exploitation patterns)
-    elif child_severity == 'high' or child_exploitation_matches >= 2:
-        risk_score = max(risk_score, 85)
-        requires_immediate_action = True
-    
-    # Override 3: Child flag with high score
-    elif child_flag and child > 0.6:
-        risk_score = max(risk_score, 80)
-    
-    # Override 4: Child flag with any exploitation
-    elif child_flag and child_exploitation_matches >= 1:
-        risk_score = max(risk_score, 85)
-        requires_immediate_action = True
-    
-    # ===== TOXICITY OVERRIDES =====
-    
-    # Override 5: Immediate action required (threats, violence, etc.)
-    if requires_immediate_action and not child_flag:
-        risk_score = max(risk_score, 85)
-    
-    # Override 6: Critical toxicity severity
-    if toxicity_severity == 'critical':
-        risk_score = max(risk_score, 90)
-    elif toxicity_severity == 'high':
-        risk_score = max(risk_score, 75)
-    
-    # Override 7: Multiple severe categories
-    severe_categories = [
-        'Threats/Violence', 'Hate Speech', 'Sexual Harassment',
-        'Extremist Content', 'Slurs/Derogatory Language'
-    ]
-    severe_count = sum(1 for cat in toxicity_categories if cat in severe_categories)
-    if severe_count >= 2:
-        risk_score = max(risk_score, 85)
-    elif severe_count >= 1:
-        risk_score = max(risk_score, 70)
-    
-    # ===== COMBINATION MULTIPLIERS =====
-    
-    # Override 8: High toxicity + high emotion = very dangerous
-    if tox > 0.7 and emotion > 0.6:
-        risk_score = min(risk_score * 1.2, 100)
-    
-    # Override 9: High toxicity + CTA = mobilization for harm
-    if tox > 0.7 and cta > 0.6:
-        risk_score = min(risk_score * 1.25, 100)
+    # Severe toxicity categories (Override 7)
+    toxicity_categories_mask = signals.get('toxicity_categories_mask')
+    if toxicity_categories_mask is not None:
+        severe_count = (toxicity_categories_mask & _SEVERE_MASK).bit_count()
+    else:
+        severe_count = sum(1 for cat in toxicity_categories if cat in _SEVERE_CATEGORIES)
     
-    # Override 10: Child safety + any other high signal
-    if child_flag and (tox > 0.6 or emotion > 0.6):
-        risk_score = min(risk_score * 1.3, 100)
+    # Weighted score + child safety / toxicity overrides (see _score_core)
+    risk_score, requires_immediate_action = _cached_core((
+        float(child), float(tox), float(emotion), float(cta), float(context),
+        _SEVERITY_LEVELS.get(child_severity, 0), bool(child_flag), bool(requires_immediate_action),
+        _SEVERITY_LEVELS.get(toxicity_severity, 0), severe_count,
+        int(child_exploitation_matches), int(child_combination_matches)
+    ))
     
-    # Cap at 100
-    risk_score = min(int(round(risk_score)), 100)
-    
-    # IMPROVED THRESHOLDS: More aggressive
-    # Low: 0-49 (was 0-39)
-    # Medium: 50-74 (was 40-69)
-    # High: 75-100 (was 70-100)
-    if risk_score <= 49:
-        risk_label = "Low"
-    elif risk_score <= 74:
-        risk_label = "Medium"
-    else:
-        risk_label = "High"
+    # Label lookup (scores only go below 0 for out-of-range inputs)
+    risk_label = _RISK_LABELS[max(risk_score, 0)]
     
     # Score breakdown for visualization
     breakdown = {
@@ -147,6 +303,111 @@ def calculate_improved_harm_score(signals: dict) -> dict:
     }
 
 
+# Score cache statistics / reset (batch scoring does not use the cache)
+calculate_improved_harm_score.cache_info = _cached_core.cache_info
+calculate_improved_harm_score.cache_clear = _cached_core.cache_clear
+
+
+# Signal key -> (local name in the scorer, default when the key is absent)
+_SIGNAL_FIELDS = {
+    'emotion_score': ('emotion', 0),
+    'cta_score': ('cta', 0),
+    'tox_score': ('tox', 0),
+    'context_score': ('context', 0),
+    'child_score': ('child', 0),
+    'child_flag': ('child_flag', False),
+    'toxicity_severity': ('toxicity_severity', 'low'),
+    'requires_immediate_action': ('requires_immediate_action', False),
+    'toxicity_categories': ('toxicity_categories', []),
+    'toxicity_categories_mask': ('toxicity_categories_mask', None),
+    'child_severity': ('child_severity', 'none'),
+    'child_exploitation_matches': ('child_exploitation_matches', 0),
+    'child_combination_matches': ('child_combination_matches', 0),
+}
+
+_SPECIALIZED_TEMPLATE = '''
+def specialized_scorer(signals):
+{reads}
+    risk_score, requires_immediate_action = _cached_core((
+        float(child), float(tox), float(emotion), float(cta), float(context),
+        {child_sev}, bool(child_flag), bool(requires_immediate_action),
+        {tox_sev}, {severe_count},
+        int(child_exploitation_matches), int(child_combination_matches)
+    ))
+    return {{
+        "risk_score": risk_score,
+        "risk_label": _RISK_LABELS[max(risk_score, 0)],
+        "breakdown": {{
+            "Child Safety": child,
+            "Toxicity": tox,
+            "Emotion": emotion,
+            "Call-to-Action": cta,
+            "Context Sensitivity": context
+        }},
+        "child_escalation": child_flag and child > 0.5,
+        "immediate_action_required": requires_immediate_action or {child_immediate},
+        "toxicity_severity": toxicity_severity,
+        "child_severity": child_severity
+    }}
+'''
+
+
+def make_specialized_scorer(schema):
+    """
+    Generate calculate_improved_harm_score for a fixed signals schema
+    
+    The generated function indexes the keys in the schema directly and
+    folds the defaults of the absent ones into constants, so a pipeline
+    that always builds the same signals dict skips the .get() fallbacks.
+    
+    Args:
+        schema: Signal keys every signals dict will contain (keys that do
+            not affect the score are ignored); a present
+            toxicity_categories_mask must not be None
+    
+    Returns:
+        function(signals: dict) -> dict, same result as calculate_improved_harm_score
+    """
+    schema = set(schema)
+    reads = []
+    for key, (name, default) in _SIGNAL_FIELDS.items():
+        if key in schema:
+            reads.append(f"    {name} = signals[{key!r}]")
+        elif key not in ('toxicity_categories', 'toxicity_categories_mask'):
+            reads.append(f"    {name} = {default!r}")
+    
+    if 'child_severity' in schema:
+        child_sev = "_SEVERITY_LEVELS.get(child_severity, 0)"
+        child_immediate = "child_severity in ('critical', 'high')"
+    else:
+        child_sev = repr(_SEVERITY_LEVELS['none'])
+        child_immediate = "False"
+    if 'toxicity_severity' in schema:
+        tox_sev = "_SEVERITY_LEVELS.get(toxicity_severity, 0)"
+    else:
+        tox_sev = repr(_SEVERITY_LEVELS['low'])
+    if 'toxicity_categories_mask' in schema:
+        severe_count = "(toxicity_categories_mask & _SEVERE_MASK).bit_count()"
+    elif 'toxicity_categories' in schema:
+        severe_count = "sum(1 for cat in toxicity_categories if cat in _SEVERE_CATEGORIES)"
+    else:
+        severe_count = "0"
+    
+    source = _SPECIALIZED_TEMPLATE.format(
+        reads="\n".join(reads), child_sev=child_sev, tox_sev=tox_sev,
+        severe_count=severe_count, child_immediate=child_immediate
+    )
+    namespace = {
+        '_cached_core': _cached_core,
+        '_SEVERITY_LEVELS': _SEVERITY_LEVELS,
+        '_RISK_LABELS': _RISK_LABELS,
+        '_SEVERE_MASK': _SEVERE_MASK,
+        '_SEVERE_CATEGORIES': _SEVERE_CATEGORIES,
+    }
+    exec(compile(source, '<specialized>', 'exec'), namespace)
+    return namespace['specialized_scorer']
+
+
 def get_improved_harm_categories(signals: dict, threshold: float = 0.3) -> list:
     """
     Get multi-label harm categories with lower threshold
@@ -181,13 +442,7 @@ def get_improved_harm_categories(signals: dict, threshold: float = 0.3) -> list:
     if signals.get('context_score', 0) >= threshold:
         context_topic = signals.get('context_topic', 'none')
         if context_topic != 'none':
-            category_map = {
-                'health': 'Health Misinformation Risk',
-                'election': 'Election Misinformation Risk',
-                'communal': 'Communal Tension Risk',
-                'disaster': 'Disaster/Emergency Misinformation'
-            }
-            categories.append(category_map.get(context_topic, 'Sensitive Context'))
+            categories.append(_CONTEXT_CATEGORY_MAP.get(context_topic, 'Sensitive Context'))
     
     # Check child safety
     if signals.get('child_flag', False):
@@ -195,12 +450,7 @@ def get_improved_harm_categories(signals: dict, threshold: float = 0.3) -> list:
             categories.append("Child Safety Concern")
     
     # Remove duplicates while preserving order
-    seen = set()
-    unique_categories = []
-    for cat in categories:
-        if cat not in seen:
-            seen.add(cat)
-            unique_categories.append(cat)
+    unique_categories = list(dict.fromkeys(categories))
     
     # Default if no categories
     if not unique_categories:
@@ -209,6 +459,349 @@ def get_improved_harm_categories(signals: dict, threshold: float = 0.3) -> list:
     return unique_categories
 
 
+def _batch_column(signals, name: str, default, dtype, n: int) -> np.ndarray:
+    """One signals column as an array (the scalar default when the column is missing)"""
+    if name not in signals:
+        return np.full(n, default, dtype=dtype)
+    return np.asarray(signals[name]).astype(dtype, copy=False)
+
+
+def _severity_codes(signals, name: str, default: str, n: int) -> np.ndarray:
+    """Severity column as int8 codes (string columns are encoded, unknown values -> 0)"""
+    if name not in signals:
+        return np.full(n, _SEVERITY_LEVELS[default], dtype=np.int8)
+    values = np.asarray(signals[name])
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int8, copy=False)
+    return np.fromiter(
+        (_SEVERITY_LEVELS.get(value, 0) for value in values.tolist()), dtype=np.int8, count=n
+    )
+
+
+def _severe_counts(mask: np.ndarray) -> np.ndarray:
+    """Severe toxicity categories per item from toxicity_categories_mask values"""
+    severe = mask.astype(np.int64) & _SEVERE_MASK
+    return sum((severe >> bit) & 1 for bit in range(_SEVERE_MASK.bit_length())).astype(np.int8)
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class SignalFrame:
+    """
+    Scoring inputs for many items, one contiguous array per signal
+    
+    Scores are float64 by default so batch results match the single-item
+    scorer exactly; float16 storage (from_columns(..., dtype=np.float16))
+    quarters the score columns at the cost of ~1e-3 precision, which can
+    move items that sit right at a threshold or a .5 rounding boundary.
+    Severities are _SEVERITY_LEVELS codes, toxicity categories a
+    categories_to_mask() bitmask and the booleans one uint8 bitfield.
+    """
+    emotion: np.ndarray
+    tox: np.ndarray
+    cta: np.ndarray
+    context: np.ndarray
+    child: np.ndarray
+    # child_flag (_FLAG_CHILD) | requires_immediate_action (_FLAG_IMMEDIATE)
+    flags: np.ndarray
+    toxicity_severity: np.ndarray
+    child_severity: np.ndarray
+    toxicity_cat_mask: np.ndarray
+    child_exploitation_matches: np.ndarray
+    child_combination_matches: np.ndarray
+    # Severe category count per item when it cannot be derived from the
+    # mask (a category list with repeated labels); None -> from the mask
+    severe_count: np.ndarray = None
+    # Category inputs (get_improved_harm_categories_batch): emotion label
+    # bits (_EMOTION_BITS) and context topic codes (_CONTEXT_TOPICS)
+    emotion_labels_mask: np.ndarray = None
+    context_topic: np.ndarray = None
+    
+    def __len__(self) -> int:
+        return len(self.tox)
+    
+    @property
+    def child_flag(self) -> np.ndarray:
+        return (self.flags & _FLAG_CHILD) != 0
+    
+    @property
+    def requires_immediate_action(self) -> np.ndarray:
+        return (self.flags & _FLAG_IMMEDIATE) != 0
+    
+    @classmethod
+    def from_columns(cls, signals, dtype=np.float64) -> 'SignalFrame':
+        """
+        Build from columns keyed like the single-item signals dict
+        
+        Args:
+            signals: dict of equal-length arrays, or a DataFrame. Severities
+                may be strings or int8 codes; toxicity_categories may be
+                replaced by a toxicity_categories_mask column. Missing columns
+                use the same defaults as the single-item scorer.
+            dtype: Storage dtype of the score columns (float64 or float16)
+        
+        Returns:
+            SignalFrame
+        """
+        n = len(signals[next(iter(signals))]) if len(signals) else 0
+        severe_count = None
+        if 'toxicity_categories_mask' in signals:
+            mask = _batch_column(signals, 'toxicity_categories_mask', 0, np.int32, n)
+        elif 'toxicity_categories' in signals:
+            categories = list(signals['toxicity_categories'])
+            mask = np.fromiter((categories_to_mask(cats) for cats in categories), dtype=np.int32, count=n)
+            severe_count = np.fromiter(
+                (sum(1 for cat in cats if cat in _SEVERE_CATEGORIES) for cats in categories),
+                dtype=np.int8, count=n
+            )
+        else:
+            mask = np.zeros(n, dtype=np.int32)
+        
+        if 'emotion_labels' in signals:
+            emotion_labels_mask = np.fromiter(
+                (sum(_EMOTION_BITS.get(label, 0) for label in set(labels)) for labels in signals['emotion_labels']),
+                dtype=np.int8, count=n
+            )
+        else:
+            emotion_labels_mask = np.zeros(n, dtype=np.int8)
+        if 'context_topic' in signals:
+            context_topic = np.fromiter(
+                (_CONTEXT_TOPICS.get(topic, len(_CONTEXT_TOPICS)) for topic in signals['context_topic']),
+                dtype=np.int8, count=n
+            )
+        else:
+            context_topic = np.zeros(n, dtype=np.int8)
+        
+        return cls(
+            emotion=_batch_column(signals, 'emotion_score', 0, dtype, n),
+            tox=_batch_column(signals, 'tox_score', 0, dtype, n),
+            cta=_batch_column(signals, 'cta_score', 0, dtype, n),
+            context=_batch_column(signals, 'context_score', 0, dtype, n),
+            child=_batch_column(signals, 'child_score', 0, dtype, n),
+            flags=(
+                _batch_column(signals, 'child_flag', False, bool, n) * np.uint8(_FLAG_CHILD) |
+                _batch_column(signals, 'requires_immediate_action', False, bool, n) * np.uint8(_FLAG_IMMEDIATE)
+            ),
+            toxicity_severity=_severity_codes(signals, 'toxicity_severity', 'low', n),
+            child_severity=_severity_codes(signals, 'child_severity', 'none', n),
+            toxicity_cat_mask=mask,
+            child_exploitation_matches=_batch_column(signals, 'child_exploitation_matches', 0, np.int16, n),
+            child_combination_matches=_batch_column(signals, 'child_combination_matches', 0, np.int16, n),
+            severe_count=severe_count,
+            emotion_labels_mask=emotion_labels_mask,
+            context_topic=context_topic
+        )
+    
+    @classmethod
+    def from_signals(cls, signals_list, dtype=np.float64) -> 'SignalFrame':
+        """
+        Build from per-item signals dicts
+        
+        Args:
+            signals_list: Iterable of single-item signals dicts
+            dtype: Storage dtype of the score columns (float64 or float16)
+        
+        Returns:
+            SignalFrame
+        """
+        signals_list = list(signals_list)
+        names = dict.fromkeys(name for signals in signals_list for name in signals)
+        defaults = {
+            'toxicity_severity': 'low', 'child_severity': 'none',
+            'toxicity_categories': (), 'child_flag': False, 'requires_immediate_action': False,
+            'emotion_labels': (), 'context_topic': 'none'
+        }
+        return cls.from_columns({
+            name: [signals.get(name, defaults.get(name, 0)) for signals in signals_list]
+            for name in names
+        }, dtype=dtype)
+
+
+def _score_frame(signals: SignalFrame, severe_count: np.ndarray) -> tuple:
+    """
+    NumPy score core over a SignalFrame (weights + overrides)
+    
+    Returns:
+        (int16 risk scores, requires immediate action)
+    """
+    emotion = signals.emotion
+    cta = signals.cta
+    tox = signals.tox
+    context = signals.context
+    child = signals.child
+    flags = signals.flags
+    child_flag = (flags & _FLAG_CHILD) != 0
+    child_exploitation_matches = signals.child_exploitation_matches
+    child_combination_matches = signals.child_combination_matches
+    toxicity_severity = signals.toxicity_severity
+    child_severity = signals.child_severity
+    
+    # Same weights as the single-item scorer, on the 0-100 scale (compact
+    # float16 columns are upcast here; thresholds compare the stored values)
+    risk_score = (
+        0.35 * child.astype(np.float64, copy=False) +
+        0.30 * tox.astype(np.float64, copy=False) +
+        0.20 * emotion.astype(np.float64, copy=False) +
+        0.10 * cta.astype(np.float64, copy=False) +
+        0.05 * context.astype(np.float64, copy=False)
+    ) * 100
+    
+    # ===== CRITICAL OVERRIDES - CHILD SAFETY =====
+    # Mutually exclusive like the single-item if/elif ladder: the first
+    # matching rule sets the floor and whether immediate action is required
+    child_ladder = [
+        (child_severity == _CRITICAL) | (child_combination_matches >= 1),
+        (child_severity == _HIGH) | (child_exploitation_matches >= 2),
+        child_flag & (child > 0.6),
+        child_flag & (child_exploitation_matches >= 1),
+    ]
+    child_floor = np.select(child_ladder, [95.0, 85.0, 80.0, 85.0], default=-np.inf)
+    requires_immediate_action = ((flags & _FLAG_IMMEDIATE) != 0) | np.select(
+        child_ladder, [True, True, False, True], default=False
+    )
+    
+    # Every override is a floor; mask the inapplicable ones to -inf and
+    # apply them all with one reduction
+    floors = np.stack([
+        child_floor,
+        # ===== TOXICITY OVERRIDES =====
+        np.where(requires_immediate_action & ~child_flag, 85.0, -np.inf),
+        np.where(toxicity_severity == _CRITICAL, 90.0, -np.inf),
+        np.where(toxicity_severity == _HIGH, 75.0, -np.inf),
+        np.where(severe_count >= 2, 85.0, -np.inf),
+        np.where(severe_count >= 1, 70.0, -np.inf),
+    ])
+    risk_score = np.maximum(risk_score, floors.max(axis=0, initial=-np.inf))
+    
+    # ===== COMBINATION MULTIPLIERS =====
+    # Compare each signal against each threshold once and reuse the masks
+    tox_gt7 = tox > 0.7
+    tox_gt6 = tox > 0.6
+    emotion_gt6 = emotion > 0.6
+    cta_gt6 = cta > 0.6
+    risk_score = np.where(tox_gt7 & emotion_gt6, np.minimum(risk_score * 1.2, 100), risk_score)
+    risk_score = np.where(tox_gt7 & cta_gt6, np.minimum(risk_score * 1.25, 100), risk_score)
+    risk_score = np.where(child_flag & (tox_gt6 | emotion_gt6), np.minimum(risk_score * 1.3, 100), risk_score)
+    
+    # Round half to even (like round()) and cap at 100 in place, then keep
+    # the 0-100 scores as int16 so the label thresholds compare integers
+    np.rint(risk_score, out=risk_score)
+    np.minimum(risk_score, 100, out=risk_score)
+    return risk_score.astype(np.int16), requires_immediate_action
+
+
+def calculate_improved_harm_score_batch(signals) -> dict:
+    """
+    Vectorized calculate_improved_harm_score for many items at once
+    
+    Args:
+        signals: SignalFrame, or dict of equal-length arrays (or a DataFrame)
+            accepted by SignalFrame.from_columns
+    
+    Returns:
+        dict of arrays: risk_score (int16), risk_label, child_escalation,
+        immediate_action_required, toxicity_severity, child_severity
+    """
+    if not isinstance(signals, SignalFrame):
+        signals = SignalFrame.from_columns(signals)
+    
+    severe_count = signals.severe_count
+    if severe_count is None:
+        severe_count = _severe_counts(signals.toxicity_cat_mask)
+    
+    # Large float64 batches run _score_core on every core; otherwise NumPy.
+    # Narrower float columns stay on NumPy, which compares the thresholds at
+    # their stored precision; integer columns of any width are cast to the
+    # gufunc's signature.
+    scores = (signals.child, signals.tox, signals.emotion, signals.cta, signals.context)
+    score_parallel = _parallel_scorer() if len(signals) >= PARALLEL_MIN_ITEMS else None
+    if score_parallel is not None and all(column.dtype == np.float64 for column in scores):
+        risk_score, requires_immediate_action = score_parallel(
+            *scores,
+            np.asarray(signals.child_severity, dtype=np.int8),
+            np.asarray(signals.flags, dtype=np.uint8),
+            np.asarray(signals.toxicity_severity, dtype=np.int8),
+            np.asarray(severe_count, dtype=np.int8),
+            np.asarray(signals.child_exploitation_matches, dtype=np.int16),
+            np.asarray(signals.child_combination_matches, dtype=np.int16)
+        )
+    else:
+        risk_score, requires_immediate_action = _score_frame(signals, severe_count)
+    
+    risk_label = _RISK_LABEL_ARRAY[np.maximum(risk_score, 0)]
+    
+    child_flag = signals.child_flag
+    return {
+        "risk_score": risk_score,
+        "risk_label": risk_label,
+        "child_escalation": child_flag & (signals.child > 0.5),
+        "immediate_action_required": requires_immediate_action | (signals.child_severity >= _HIGH),
+        "toxicity_severity": _SEVERITY_NAMES[signals.toxicity_severity],
+        "child_severity": _SEVERITY_NAMES[signals.child_severity]
+    }
+
+
+def get_improved_harm_categories_batch(signals, threshold: float = 0.3) -> tuple:
+    """
+    Vectorized get_improved_harm_categories as ragged integer category ids
+    
+    Args:
+        signals: SignalFrame, or columns accepted by SignalFrame.from_columns
+            (toxicity categories come from the mask, in detector order)
+        threshold: minimum score to include category
+    
+    Returns:
+        (codes, offsets): int32 HARM_CATEGORY_NAMES ids of item i are
+        codes[offsets[i]:offsets[i + 1]] (see codes_to_strings)
+    """
+    if not isinstance(signals, SignalFrame):
+        signals = SignalFrame.from_columns(signals)
+    
+    n = len(signals)
+    emotion_labels = signals.emotion_labels_mask
+    if emotion_labels is None:
+        emotion_labels = np.zeros(n, dtype=np.int8)
+    context_topic = signals.context_topic
+    if context_topic is None:
+        context_topic = np.zeros(n, dtype=np.int8)
+    
+    # One boolean column per category id, in emission order
+    toxicity = (signals.toxicity_cat_mask[:, None] >> np.arange(len(_CAT_BITS))) & 1 != 0
+    emotional = signals.emotion >= threshold
+    fear_anger = (emotion_labels & (_EMOTION_BITS['fear'] | _EMOTION_BITS['anger'])) != 0
+    sadness = (emotion_labels & _EMOTION_BITS['sadness']) != 0
+    sensitive_context = signals.context >= threshold
+    columns = np.column_stack([
+        toxicity,
+        emotional & fear_anger,
+        emotional & ~fear_anger & sadness,
+        signals.cta >= threshold,
+        sensitive_context[:, None] & (context_topic[:, None] == np.arange(1, len(_CONTEXT_TOPICS) + 1)),
+        signals.child_flag,
+    ])
+    # Default if no categories
+    columns = np.column_stack([columns, ~columns.any(axis=1)])
+    
+    # Row-major nonzero keeps every item's ids together and in column order
+    codes = np.nonzero(columns)[1].astype(np.int32)
+    offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(columns.sum(axis=1), out=offsets[1:])
+    return codes, offsets
+
+
+def codes_to_strings(codes: np.ndarray, offsets: np.ndarray) -> list:
+    """
+    Render get_improved_harm_categories_batch output as category labels
+    
+    Args:
+        codes, offsets: Ragged category ids
+    
+    Returns:
+        list with a list of harm category strings per item
+    """
+    names = HARM_CATEGORY_NAMES[codes].tolist()
+    return [names[start:end] for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
 # Compatibility function for existing code
 def calculate_harm_score(signals: dict) -> dict:
     """Wrapper for backward compatibility"""
@@ -3,15 +3,93 @@ Advanced Toxicity Detection
 Uses multiple pretrained models + ensemble for better accuracy
 """
 
+import os
 import torch
 from transformers import (
     AutoTokenizer, AutoModelForSequenceClassification,
     pipeline
 )
 import re
-from typing import Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Union
 import warnings
 warnings.filterwarnings('ignore')
+try:
+    import hyperscan
+except ImportError:
+    # python-hyperscan unavailable; patterns run through the re module
+    hyperscan = None
+
+from ._cache import ResultCache
+from ._input import SignalInput, as_signal_input
+
+# INT8 MODE: dynamically quantize Linear layers for CPU inference
+# Set HARMLENS_INT8=1 to enable (faster, scores shift slightly)
+QUANTIZE_CPU = os.getenv('HARMLENS_INT8', '0') == '1'
+
+# COMPILE MODE: torch.compile the model forwards (slow first call, faster after)
+# Set HARMLENS_TORCH_COMPILE=1 to enable
+COMPILE_MODELS = os.getenv('HARMLENS_TORCH_COMPILE', '0') == '1'
+
+# PREWARM MODE: start loading the shared detector in the background at import
+# Set HARMLENS_PREWARM=1 to enable (first get_toxicity_detector() call waits less)
+PREWARM = os.getenv('HARMLENS_PREWARM', '0') == '1'
+
+
+def _optimize_for_device(model: torch.nn.Module, device: str) -> torch.nn.Module:
+    """
+    Half precision on CUDA; optional int8 dynamic quantization on CPU;
+    optional torch.compile of the forward pass
+    """
+    if device == "cuda":
+        model = model.half()
+    elif device == "cpu" and QUANTIZE_CPU:
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    
+    if COMPILE_MODELS and hasattr(torch, 'compile'):
+        # CUDA graphs ("reduce-overhead") cut launch overhead at small batches
+        model = torch.compile(
+            model, mode="reduce-overhead" if device == "cuda" else "default", fullgraph=False
+        )
+    return model
+
+
+@lru_cache(maxsize=4)
+def _load_pipeline(model_id: str, device: str, top_k=False):
+    """
+    Load a text-classification pipeline once per (model, device)
+    
+    Repeated detector instances share the same weights. Weights are
+    loaded straight into place (low_cpu_mem_usage), in float16 on CUDA,
+    which avoids a full extra host copy during from_pretrained.
+    """
+    kwargs = {} if top_k is False else {'top_k': top_k}
+    model_kwargs = {"low_cpu_mem_usage": True}
+    if device == "cuda":
+        model_kwargs["torch_dtype"] = torch.float16
+    
+    classifier = pipeline(
+        "text-classification",
+        model=model_id,
+        device=0 if device == "cuda" else -1,
+        model_kwargs=model_kwargs,
+        **kwargs
+    )
+    classifier.model = _optimize_for_device(classifier.model, device)
+    return classifier
+
+
+@lru_cache(maxsize=2)
+def _load_detoxify(variant: str, device: str):
+    """Load a Detoxify model once per (variant, device); its checkpoint is cached by torch.hub"""
+    from detoxify import Detoxify
+    detoxify = Detoxify(variant, device=device)
+    detoxify.model = _optimize_for_device(detoxify.model, device)
+    return detoxify
 
 
 class AdvancedToxicityDetector:
@@ -20,13 +98,55 @@ class AdvancedToxicityDetector:
     Much more aggressive and accurate than single model
     """
     
-    def __init__(self, device: str = None):
+    # Transformer checkpoints in the ensemble. Toxic-BERT (BERT-base) and the
+    # hate-speech model (RoBERTa-large) are separately fine-tuned encoders with
+    # different tokenizers, so no backbone or tokenization can be shared
+    # between them without changing their scores; they only share the device.
+    MODEL_IDS = {
+        'toxic_bert': "unitary/toxic-bert",
+        'hate_speech': "facebook/roberta-hate-speech-dynabench-r4-target",
+    }
+    
+    # A pattern score this high (with an immediate-action category) already
+    # makes the text critical; the models cannot change the outcome
+    PATTERN_SHORT_CIRCUIT = 0.9
+    
+    # Pattern category -> (reported label, pattern score, targeted,
+    # requires immediate action), checked in this order
+    PATTERN_CATEGORIES = {
+        'threats': ('Threats/Violence', 0.9, False, True),
+        'hate': ('Hate Speech', 0.85, True, False),
+        'harassment': ('Harassment', 0.8, True, False),
+        'sexual_harassment': ('Sexual Harassment', 0.95, False, True),
+        'slurs': ('Slurs/Derogatory Language', 0.9, False, False),
+        'extremist': ('Extremist Content', 0.95, False, True),
+        'self_harm': ('Self-Harm', 0.85, False, True),
+    }
+    
+    def __init__(self, device: str = None, cache_size: int = 4096, strict_mode: bool = False,
+                 enabled_categories=None, load_models: bool = True):
         """
         Initialize multiple toxicity models
         
         Args:
             device: 'cuda', 'mps', or 'cpu'
+            cache_size: Results kept for repeated texts (0 disables the cache)
+            strict_mode: Always run the models, even when the patterns alone
+                already make a text critical (for evaluation runs)
+            enabled_categories: Pattern categories to check (keys of
+                PATTERN_CATEGORIES); None checks all of them
+            load_models: Load the model ensemble; False gives a pattern-only
+                detector (for match_patterns prefilters)
         """
+        self.strict_mode = strict_mode
+        
+        if enabled_categories is None:
+            enabled_categories = self.PATTERN_CATEGORIES
+        unknown = set(enabled_categories) - set(self.PATTERN_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown toxicity categories: {sorted(unknown)}")
+        self.enabled_categories = set(enabled_categories)
+        
         # Auto-detect device
         if device is None:
             if torch.cuda.is_available():
@@ -38,15 +158,37 @@ class AdvancedToxicityDetector:
         else:
             self.device = device
         
-        print(f"🔍 Loading advanced toxicity models on {self.device}...")
+        # Texts per forward pass; CPU inference gains little from large batches
+        self.batch_size = 32 if self.device == "cuda" else 8
         
-        # Load multiple models for ensemble
-        self._load_models()
+        if load_models:
+            print(f"🔍 Loading advanced toxicity models on {self.device}...")
+            
+            # Load multiple models for ensemble
+            self._load_models()
+        else:
+            self.models = {}
+        
+        # The ensemble models run concurrently (forward passes release the
+        # GIL); on GPU each one gets its own CUDA stream so kernels overlap
+        self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="toxicity-model")
+        self._streams = (
+            {name: torch.cuda.Stream() for name in self.models}
+            if self.device == "cuda" else {}
+        )
         
         # Comprehensive harmful patterns
         self._load_patterns()
         
-        print("✅ Advanced toxicity detection ready")
+        # Exact duplicate texts (reposts, spam) reuse the previous result
+        self._cache = ResultCache(cache_size) if cache_size > 0 else None
+        
+        # Compilation happens on the first forward; pay it now, not on a request
+        if COMPILE_MODELS and self.models:
+            self._run_models_batch(["HarmLens warmup"])
+        
+        if load_models:
+            print("✅ Advanced toxicity detection ready")
     
     def _load_models(self):
         """Load multiple toxicity detection models"""
@@ -54,11 +196,8 @@ class AdvancedToxicityDetector:
         
         # Model 1: Toxic-BERT (Unitary)
         try:
-            self.models['toxic_bert'] = pipeline(
-                "text-classification",
-                model="unitary/toxic-bert",
-                device=0 if self.device == "cuda" else -1,
-                top_k=None
+            self.models['toxic_bert'] = _load_pipeline(
+                self.MODEL_IDS['toxic_bert'], self.device, top_k=None
             )
             print("  ✓ Toxic-BERT loaded")
         except Exception as e:
@@ -66,10 +205,8 @@ class AdvancedToxicityDetector:
         
         # Model 2: Hate Speech Detection
         try:
-            self.models['hate_speech'] = pipeline(
-                "text-classification",
-                model="facebook/roberta-hate-speech-dynabench-r4-target",
-                device=0 if self.device == "cuda" else -1
+            self.models['hate_speech'] = _load_pipeline(
+                self.MODEL_IDS['hate_speech'], self.device
             )
             print("  ✓ Hate Speech model loaded")
         except Exception as e:
@@ -77,8 +214,7 @@ class AdvancedToxicityDetector:
         
         # Model 3: Detoxify (multi-label)
         try:
-            from detoxify import Detoxify
-            self.models['detoxify'] = Detoxify('original', device=self.device)
+            self.models['detoxify'] = _load_detoxify('original', self.device)
             print("  ✓ Detoxify loaded")
         except Exception as e:
             print(f"  ⚠️  Detoxify failed: {e}")
@@ -143,19 +279,333 @@ class AdvancedToxicityDetector:
             r'\b(cutting|self harm|self-harm)\b',
             r'\bsuicide (plan|method|note)\b'
         ]
+        
+        # Compile once, and only the enabled categories. Each category's
+        # union pattern rules out the common no-match case in one scan; the
+        # individual patterns are only counted when the union hits. The
+        # patterns are all lowercase and only ever see lowercased text, so
+        # no case folding is needed.
+        category_patterns = {
+            'threats': self.threat_patterns,
+            'hate': self.hate_patterns,
+            'harassment': self.harassment_patterns,
+            'sexual_harassment': self.sexual_harassment_patterns,
+            'slurs': self.slur_patterns,
+            'extremist': self.extremist_patterns,
+            'self_harm': self.self_harm_patterns,
+        }
+        self._compiled_patterns = {
+            name: (
+                re.compile('|'.join(f'(?:{p})' for p in patterns)),
+                [re.compile(p) for p in patterns]
+            )
+            for name, patterns in category_patterns.items()
+            if name in self.enabled_categories
+        }
+        
+        # With Hyperscan, every pattern of every category goes into one
+        # database and an ASCII text is scanned once (Hyperscan's \b and \w
+        # are ASCII-only, so other texts keep using the re patterns)
+        self._hs_db = None
+        if hyperscan is not None and self._compiled_patterns:
+            self._build_hyperscan()
+    
+    def _build_hyperscan(self):
+        """Compile all categories' patterns into one Hyperscan block database"""
+        expressions, categories = [], []
+        for name, (_, patterns) in self._compiled_patterns.items():
+            for pattern in patterns:
+                expressions.append(pattern.pattern.encode('utf-8'))
+                categories.append(name)
+        
+        # Without start-of-match tracking (and with HS_FLAG_SINGLEMATCH) the
+        # multi-pattern database misses some .* matches that re finds, so
+        # SOM_LEFTMOST is set and matched ids are deduplicated instead
+        flags = hyperscan.HS_FLAG_SOM_LEFTMOST
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[flags] * len(expressions)
+            )
+        except Exception as e:
+            print(f"  ⚠️  Hyperscan compile failed, using re patterns: {e}")
+            return
+        
+        self._hs_db = db
+        self._hs_categories = categories
+        # A database's scratch space is not safe for concurrent scans
+        self._hs_lock = threading.Lock()
+    
+    def _count_pattern_matches(self, category: str, text_lower: str) -> int:
+        """Number of a category's patterns that match the text"""
+        union, patterns = self._compiled_patterns[category]
+        if not union.search(text_lower):
+            return 0
+        return sum(1 for pattern in patterns if pattern.search(text_lower))
+    
+    def _pattern_match_counts(self, text_lower: str) -> Dict[str, int]:
+        """
+        Number of matching patterns per category
+        
+        Args:
+            text_lower: Lowercased input text
+        
+        Returns:
+            Dictionary of category -> matching pattern count
+        """
+        if self._hs_db is None or not text_lower.isascii():
+            return {
+                category: self._count_pattern_matches(category, text_lower)
+                for category in self._compiled_patterns
+            }
+        
+        matched_ids = set()
+        with self._hs_lock:
+            self._hs_db.scan(
+                text_lower.encode('ascii'),
+                match_event_handler=lambda id, frm, to, flags, ctx: ctx.add(id),
+                context=matched_ids
+            )
+        
+        counts = dict.fromkeys(self._compiled_patterns, 0)
+        for pattern_id in matched_ids:
+            counts[self._hs_categories[pattern_id]] += 1
+        return counts
     
-    def detect(self, text: str) -> Dict:
+    def detect(self, text: Union[str, SignalInput]) -> Dict:
         """
         Comprehensive toxicity detection
         
         Args:
-            text: Input text
+            text: Input text or prepared SignalInput
         
         Returns:
             Dictionary with detailed toxicity scores
         """
-        text_lower = text.lower()
+        return self.detect_batch([text])[0]
+    
+    def match_patterns(self, text: Union[str, SignalInput]) -> Dict:
+        """
+        Rule-based pattern checks only (no model forwards)
         
+        Works on a detector built with load_models=False, so callers can use
+        it as a cheap prefilter before deciding to run the models.
+        
+        Args:
+            text: Input text or prepared SignalInput
+        
+        Returns:
+            Dictionary with pattern_score, categories, pattern_matches,
+            targeted and requires_immediate_action
+        """
+        results, pattern_score = self._match_patterns(as_signal_input(text).text_lower)
+        return {
+            'pattern_score': pattern_score,
+            'categories': results['categories'],
+            'pattern_matches': results['pattern_matches'],
+            'targeted': results['targeted'],
+            'requires_immediate_action': results['requires_immediate_action'],
+        }
+    
+    def _classify(self, name: str, texts: List[str]):
+        """
+        Run a pipeline's tokenizer and model directly, one batch at a time
+        
+        Each text is tokenized once into padded input_ids/attention_mask
+        and fed straight to the model, skipping the pipeline's per-item
+        pre/post-processing. Scores match the pipeline: sigmoid for
+        multi-label models, softmax otherwise.
+        
+        Args:
+            name: Key of a loaded pipeline in self.models
+            texts: Input texts
+        
+        Returns:
+            (float32 probabilities tensor of shape [texts, labels], id2label)
+        """
+        classifier = self.models[name]
+        tokenizer, model = classifier.tokenizer, classifier.model
+        config = model.config
+        multi_label = config.problem_type == "multi_label_classification" or config.num_labels == 1
+        device = "cuda" if self.device == "cuda" else "cpu"  # pipelines only use CUDA or CPU
+        
+        probabilities = []
+        with torch.inference_mode():
+            for start in range(0, len(texts), self.batch_size):
+                encoded = tokenizer(
+                    [text[:512] for text in texts[start:start + self.batch_size]],
+                    truncation=True, max_length=512, padding=True, return_tensors='pt'
+                ).to(device)
+                logits = model(**encoded).logits.float()
+                probabilities.append(logits.sigmoid() if multi_label else logits.softmax(-1))
+        return torch.cat(probabilities).cpu(), config.id2label
+    
+    def _run_toxic_bert(self, texts: List[str]) -> Dict[str, List]:
+        """Model 1: Toxic-BERT over a batch of (truncated) texts"""
+        try:
+            probabilities, id2label = self._classify('toxic_bert', texts)
+            toxic_index = next((i for i, label in id2label.items() if label == 'toxic'), None)
+            if toxic_index is None:
+                return {'toxic_bert': [0] * len(texts)}
+            return {'toxic_bert': probabilities[:, toxic_index].tolist()}
+        except Exception as e:
+            print(f"Toxic-BERT error: {e}")
+            return {}
+    
+    def _run_hate_speech(self, texts: List[str]) -> Dict[str, List]:
+        """Model 2: Hate speech classifier over a batch of (truncated) texts"""
+        try:
+            probabilities, id2label = self._classify('hate_speech', texts)
+            top_scores, top_indices = probabilities.max(dim=-1)
+            return {
+                'hate_speech': [
+                    score if id2label[index] == 'hate' else 0
+                    for score, index in zip(top_scores.tolist(), top_indices.tolist())
+                ]
+            }
+        except Exception as e:
+            print(f"Hate Speech error: {e}")
+            return {}
+    
+    def _run_detoxify(self, texts: List[str]) -> Dict[str, List]:
+        """Model 3: Detoxify (predict on a list returns a list per label)"""
+        try:
+            detox_result = self.models['detoxify'].predict(list(texts))
+            breakdowns = [
+                {label: values[i] for label, values in detox_result.items()}
+                for i in range(len(texts))
+            ]
+            return {
+                'detoxify': [
+                    max(
+                        b['toxicity'],
+                        b['severe_toxicity'],
+                        b['obscene'],
+                        b['threat'],
+                        b['insult'],
+                        b['identity_attack']
+                    )
+                    for b in breakdowns
+                ],
+                'detoxify_breakdown': breakdowns
+            }
+        except Exception as e:
+            print(f"Detoxify error: {e}")
+            return {}
+    
+    _MODEL_RUNNERS = {
+        'toxic_bert': _run_toxic_bert,
+        'hate_speech': _run_hate_speech,
+        'detoxify': _run_detoxify,
+    }
+    
+    def _run_model(self, name: str, texts: List[str]) -> Dict[str, List]:
+        """Run one model, on its own CUDA stream when running on GPU"""
+        runner = self._MODEL_RUNNERS[name]
+        stream = self._streams.get(name)
+        if stream is None:
+            return runner(self, texts)
+        
+        with torch.cuda.stream(stream):
+            model_scores = runner(self, texts)
+        stream.synchronize()
+        return model_scores
+    
+    def _submit_models(self, texts: List[str]) -> list:
+        """Start every loaded model on the batch concurrently"""
+        return [
+            self._pool.submit(self._run_model, name, texts)
+            for name in self._MODEL_RUNNERS
+            if name in self.models
+        ]
+    
+    def _run_models_batch(self, texts: List[str]) -> Dict[str, List]:
+        """
+        Run every loaded model once over the whole batch (models in parallel)
+        
+        Args:
+            texts: Input texts
+        
+        Returns:
+            Dictionary of model name -> per-text scores (models that failed
+            are left out; 'detoxify_breakdown' holds per-text label dicts)
+        """
+        model_scores = {}
+        for future in self._submit_models(texts):
+            model_scores.update(future.result())
+        return model_scores
+    
+    def detect_batch(self, texts: List[Union[str, SignalInput]]) -> List[Dict]:
+        """
+        Comprehensive toxicity detection for many texts at once
+        
+        The cheap pattern checks run first. Each model then does one batched
+        pass over the texts that still need it (the models run concurrently);
+        texts the patterns already mark critical skip the models unless
+        strict_mode is set.
+        
+        Args:
+            texts: Input texts (strings or prepared SignalInputs)
+        
+        Returns:
+            List of detection dictionaries, in the same order as texts
+        """
+        if not texts:
+            return []
+        
+        inputs = [as_signal_input(text) for text in texts]
+        if self._cache is None:
+            return self._detect_inputs(inputs)
+        
+        detections = [self._cache.get(inp.text) for inp in inputs]
+        pending = [i for i, detection in enumerate(detections) if detection is None]
+        if pending:
+            fresh = self._detect_inputs([inputs[i] for i in pending])
+            for i, detection in zip(pending, fresh):
+                self._cache.put(inputs[i].text, detection)
+                detections[i] = detection
+        return detections
+    
+    def _detect_inputs(self, inputs: List[SignalInput]) -> List[Dict]:
+        """Run the pattern checks, then the models where still needed (no cache)"""
+        pattern_results = [self._match_patterns(inp.text_lower) for inp in inputs]
+        
+        # Texts the patterns already settle skip the model forwards
+        if self.strict_mode:
+            model_indices = list(range(len(inputs)))
+        else:
+            model_indices = [
+                i for i, (results, pattern_score) in enumerate(pattern_results)
+                if not (pattern_score >= self.PATTERN_SHORT_CIRCUIT and results['requires_immediate_action'])
+            ]
+        
+        batch_scores = {}
+        if model_indices:
+            for future in self._submit_models([inputs[i].text for i in model_indices]):
+                batch_scores.update(future.result())
+        
+        text_model_scores = [{} for _ in inputs]
+        for position, i in enumerate(model_indices):
+            text_model_scores[i] = {name: scores[position] for name, scores in batch_scores.items()}
+        
+        return [
+            self._combine_scores(results, pattern_score, text_model_scores[i])
+            for i, (results, pattern_score) in enumerate(pattern_results)
+        ]
+    
+    def _match_patterns(self, text_lower: str) -> tuple:
+        """
+        Rule-based pattern checks for one text
+        
+        Args:
+            text_lower: Lowercased input text
+        
+        Returns:
+            (partial results dictionary, pattern score)
+        """
         results = {
             'tox_score': 0.0,
             'risk_level': 'low',
@@ -167,108 +617,42 @@ class AdvancedToxicityDetector:
             'requires_immediate_action': False
         }
         
-        # Run all models
-        model_scores = []
-        
-        # Model 1: Toxic-BERT
-        if 'toxic_bert' in self.models:
-            try:
-                result = self.models['toxic_bert'](text[:512])
-                if isinstance(result[0], list):
-                    toxic_score = next((r['score'] for r in result[0] if r['label'] == 'toxic'), 0)
-                else:
-                    toxic_score = result[0]['score'] if result[0]['label'] == 'toxic' else 1 - result[0]['score']
-                
-                results['model_scores']['toxic_bert'] = toxic_score
-                model_scores.append(toxic_score)
-            except Exception as e:
-                print(f"Toxic-BERT error: {e}")
-        
-        # Model 2: Hate Speech
-        if 'hate_speech' in self.models:
-            try:
-                result = self.models['hate_speech'](text[:512])
-                hate_score = result[0]['score'] if result[0]['label'] == 'hate' else 0
-                results['model_scores']['hate_speech'] = hate_score
-                model_scores.append(hate_score)
-            except Exception as e:
-                print(f"Hate Speech error: {e}")
-        
-        # Model 3: Detoxify
-        if 'detoxify' in self.models:
-            try:
-                detox_result = self.models['detoxify'].predict(text)
-                detox_score = max(
-                    detox_result['toxicity'],
-                    detox_result['severe_toxicity'],
-                    detox_result['obscene'],
-                    detox_result['threat'],
-                    detox_result['insult'],
-                    detox_result['identity_attack']
-                )
-                results['model_scores']['detoxify'] = detox_score
-                results['model_scores']['detoxify_breakdown'] = detox_result
-                model_scores.append(detox_score)
-            except Exception as e:
-                print(f"Detoxify error: {e}")
-        
         # Pattern matching (rule-based boost)
         pattern_score = 0.0
+        match_counts = self._pattern_match_counts(text_lower)
+        
+        for category, match_count in match_counts.items():
+            if match_count == 0:
+                continue
+            label, category_score, targeted, immediate = self.PATTERN_CATEGORIES[category]
+            results['categories'].append(label)
+            results['pattern_matches'][category] = match_count
+            pattern_score = max(pattern_score, category_score)
+            if targeted:
+                results['targeted'] = True
+            if immediate:
+                results['requires_immediate_action'] = True
+        
+        return results, pattern_score
+    
+    def _combine_scores(self, results: Dict, pattern_score: float, text_model_scores: Dict) -> Dict:
+        """
+        Combine one text's pattern results with its model scores
         
-        # Check threats
-        threat_matches = sum(1 for pattern in self.threat_patterns if re.search(pattern, text_lower, re.IGNORECASE))
-        if threat_matches > 0:
-            results['categories'].append('Threats/Violence')
-            results['pattern_matches']['threats'] = threat_matches
-            pattern_score = max(pattern_score, 0.9)
-            results['requires_immediate_action'] = True
-        
-        # Check hate speech
-        hate_matches = sum(1 for pattern in self.hate_patterns if re.search(pattern, text_lower, re.IGNORECASE))
-        if hate_matches > 0:
-            results['categories'].append('Hate Speech')
-            results['pattern_matches']['hate'] = hate_matches
-            results['targeted'] = True
-            pattern_score = max(pattern_score, 0.85)
-        
-        # Check harassment
-        harassment_matches = sum(1 for pattern in self.harassment_patterns if re.search(pattern, text_lower, re.IGNORECASE))
-        if harassment_matches > 0:
-            results['categories'].append('Harassment')
-            results['pattern_matches']['harassment'] = harassment_matches
-            results['targeted'] = True
-            pattern_score = max(pattern_score, 0.8)
-        
-        # Check sexual harassment
-        sexual_matches = sum(1 for pattern in self.sexual_harassment_patterns if re.search(pattern, text_lower, re.IGNORECASE))
-        if sexual_matches > 0:
-            results['categories'].append('Sexual Harassment')
-            results['pattern_matches']['sexual_harassment'] = sexual_matches
-            pattern_score = max(pattern_score, 0.95)
-            results['requires_immediate_action'] = True
-        
-        # Check slurs
-        slur_matches = sum(1 for pattern in self.slur_patterns if re.search(pattern, text_lower, re.IGNORECASE))
-        if slur_matches > 0:
-            results['categories'].append('Slurs/Derogatory Language')
-            results['pattern_matches']['slurs'] = slur_matches
-            pattern_score = max(pattern_score, 0.9)
-        
-        # Check extremist content
-        extremist_matches = sum(1 for pattern in self.extremist_patterns if re.search(pattern, text_lower, re.IGNORECASE))
-        if extremist_matches > 0:
-            results['categories'].append('Extremist Content')
-            results['pattern_matches']['extremist'] = extremist_matches
-            pattern_score = max(pattern_score, 0.95)
-            results['requires_immediate_action'] = True
-        
-        # Check self-harm
-        self_harm_matches = sum(1 for pattern in self.self_harm_patterns if re.search(pattern, text_lower, re.IGNORECASE))
-        if self_harm_matches > 0:
-            results['categories'].append('Self-Harm')
-            results['pattern_matches']['self_harm'] = self_harm_matches
-            pattern_score = max(pattern_score, 0.85)
-            results['requires_immediate_action'] = True
+        Args:
+            results: Partial results from _match_patterns
+            pattern_score: Pattern score from _match_patterns
+            text_model_scores: This text's entry from the model runs
+        
+        Returns:
+            Dictionary with detailed toxicity scores
+        """
+        results['model_scores'] = text_model_scores
+        model_scores = [
+            text_model_scores[name]
+            for name in ('toxic_bert', 'hate_speech', 'detoxify')
+            if name in text_model_scores
+        ]
         
         # Ensemble scoring: Take max of (average model score, pattern score)
         if model_scores:
@@ -311,15 +695,37 @@ class AdvancedToxicityDetector:
 
 # Singleton instance
 _detector_instance = None
+_detector_lock = threading.Lock()
 
 def get_toxicity_detector():
-    """Get or create singleton detector instance"""
+    """Get or create singleton detector instance (waits for a prewarm in progress)"""
     global _detector_instance
     if _detector_instance is None:
-        _detector_instance = AdvancedToxicityDetector()
+        with _detector_lock:
+            if _detector_instance is None:
+                _detector_instance = AdvancedToxicityDetector()
     return _detector_instance
 
 
+def prewarm_toxicity_detector() -> threading.Thread:
+    """
+    Build the singleton detector in a daemon thread
+    
+    Model downloads/loads then overlap with the rest of application
+    startup; get_toxicity_detector() blocks only until the load finishes.
+    
+    Returns:
+        The started thread
+    """
+    thread = threading.Thread(target=get_toxicity_detector, name="toxicity-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+if PREWARM:
+    prewarm_toxicity_detector()
+
+
 # Example usage
 if __name__ == "__main__":
     detector = AdvancedToxicityDetector()
@@ -3,6 +3,10 @@ Video Content Moderation with Speech Recognition
 Analyzes visual content, actions, AND speech/audio from videos
 """
 
+import itertools
+import os
+import queue
+import threading
 import torch
 import torch.nn as nn
 from transformers import (
@@ -13,9 +17,18 @@ from transformers import (
 from PIL import Image
 import numpy as np
 import cv2
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 import warnings
 warnings.filterwarnings('ignore')
+try:
+    import av
+except ImportError:
+    # PyAV unavailable; frames are decoded with cv2.VideoCapture
+    av = None
+
+# INT8 MODE: dynamically quantize the VideoMAE and speech models' Linear
+# layers on CPU. Set HARMLENS_INT8=1 to enable (faster, outputs shift slightly)
+QUANTIZE_CPU = os.getenv('HARMLENS_INT8', '0') == '1'
 
 # Import text moderation for speech analysis
 try:
@@ -25,6 +38,53 @@ except:
     HAS_TEXT_DETECTOR = False
 
 
+def _prefetch(items: Iterable, depth: int) -> Iterator:
+    """
+    Run an iterable on a background thread, buffering up to depth items ahead
+    
+    Args:
+        items: Iterable to consume (e.g. a frame decoder)
+        depth: Maximum number of items decoded but not yet taken
+    
+    Returns:
+        Iterator over the same items in order
+    """
+    buffer = queue.Queue(maxsize=depth)
+    done = object()
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        # Give up once the consumer is gone instead of blocking on a full queue
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put(item):
+                    break
+        finally:
+            if hasattr(iterator, 'close'):
+                iterator.close()
+            put(done)
+    
+    threading.Thread(target=produce, name="frame-prefetch", daemon=True).start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
 class VideoModerationModel:
     """
     Video content moderation using temporal analysis + speech recognition
@@ -37,6 +97,10 @@ class VideoModerationModel:
     5. Temporal pattern detection
     """
     
+    # Frames per batched image-model forward pass: large batches keep a GPU
+    # busy, while on the CPU bigger batches only add peak memory
+    FRAME_BATCH_SIZE = {'cuda': 32, 'mps': 16, 'cpu': 8}
+    
     def __init__(self, device: str = None, enable_speech: bool = True):
         """
         Initialize video moderation models
@@ -57,6 +121,15 @@ class VideoModerationModel:
             self.device = device
         
         self.enable_speech = enable_speech
+        self.frame_batch_size = self.FRAME_BATCH_SIZE.get(self.device, 8)
+        
+        # Half precision on CUDA (Tensor Cores, half the memory traffic):
+        # bfloat16 where supported, whose float32 exponent range cannot
+        # overflow in the audio models' norms; the CPU and MPS keep float32
+        if self.device == "cuda":
+            self.dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        else:
+            self.dtype = torch.float32
         
         print(f"🎬 Loading video moderation models on {self.device}...")
         
@@ -101,17 +174,28 @@ class VideoModerationModel:
         
         print("✅ Video moderation models loaded")
     
+    def _prepare_model(self, model: nn.Module) -> nn.Module:
+        """Move a loaded model to the device in inference precision (int8 on CPU with HARMLENS_INT8)"""
+        model = model.to(self.device, dtype=self.dtype)
+        model.eval()
+        if self.device == "cpu" and QUANTIZE_CPU:
+            # Transformer and CTC-head Linears dominate these models; int8
+            # weights are 4x smaller and use the CPU's int8 dot products
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {nn.Linear}, dtype=torch.qint8
+            )
+        return model
+    
     def _load_video_model(self):
         """Load video understanding model"""
         try:
             # Using VideoMAE for video classification
             model_name = "MCG-NJU/videomae-base"
             self.video_processor = VideoMAEImageProcessor.from_pretrained(model_name)
-            self.video_model = VideoMAEForVideoClassification.from_pretrained(
+            self.video_model = self._prepare_model(VideoMAEForVideoClassification.from_pretrained(
                 model_name,
                 ignore_mismatched_sizes=True
-            ).to(self.device)
-            self.video_model.eval()
+            ))
             print("  ✓ VideoMAE model loaded")
         except Exception as e:
             print(f"  ⚠️  VideoMAE model failed: {e}")
@@ -123,8 +207,7 @@ class VideoModerationModel:
             # Using Wav2Vec2 for speech-to-text
             model_name = "facebook/wav2vec2-base-960h"
             self.speech_processor = Wav2Vec2Processor.from_pretrained(model_name)
-            self.speech_model = Wav2Vec2ForCTC.from_pretrained(model_name).to(self.device)
-            self.speech_model.eval()
+            self.speech_model = self._prepare_model(Wav2Vec2ForCTC.from_pretrained(model_name))
             print("  ✓ Wav2Vec2 speech model loaded")
         except Exception as e:
             print(f"  ⚠️  Speech model failed: {e}, trying Whisper...")
@@ -132,8 +215,9 @@ class VideoModerationModel:
                 from transformers import WhisperProcessor, WhisperForConditionalGeneration
                 model_name = "openai/whisper-base"
                 self.speech_processor = WhisperProcessor.from_pretrained(model_name)
-                self.speech_model = WhisperForConditionalGeneration.from_pretrained(model_name).to(self.device)
-                self.speech_model.eval()
+                self.speech_model = self._prepare_model(
+                    WhisperForConditionalGeneration.from_pretrained(model_name)
+                )
                 print("  ✓ Whisper speech model loaded")
             except Exception as e2:
                 print(f"  ⚠️  Whisper also failed: {e2}")
@@ -193,9 +277,10 @@ class VideoModerationModel:
                     audio, 
                     sampling_rate=16000, 
                     return_tensors="pt"
-                ).input_features.to(self.device)
+                ).input_features.to(self.device, dtype=self.dtype)
                 
-                predicted_ids = self.speech_model.generate(input_features)
+                with torch.inference_mode():
+                    predicted_ids = self.speech_model.generate(input_features)
                 transcription = self.speech_processor.batch_decode(
                     predicted_ids, 
                     skip_special_tokens=True
@@ -206,9 +291,9 @@ class VideoModerationModel:
                     audio, 
                     sampling_rate=16000, 
                     return_tensors="pt"
-                ).input_values.to(self.device)
+                ).input_values.to(self.device, dtype=self.dtype)
                 
-                with torch.no_grad():
+                with torch.inference_mode():
                     logits = self.speech_model(input_values).logits
                 
                 predicted_ids = torch.argmax(logits, dim=-1)
@@ -254,25 +339,28 @@ class VideoModerationModel:
             'speech_categories': []
         }
         
-        # Extract frames from video
-        frames, fps, duration = self._extract_frames(
-            video_path, 
-            sample_rate=sample_rate,
-            max_frames=max_frames
+        cap, fps, duration = self._open_video(video_path)
+        if cap is None:
+            print("⚠️  No frames extracted from video")
+            return results
+        
+        # Decode on a background thread while the image detector runs on the
+        # previous batch, so decoding and inference overlap
+        frames = _prefetch(
+            self._frame_stream(cap, sample_rate=sample_rate, max_frames=max_frames),
+            depth=2 * self.frame_batch_size
         )
+        frame_results, frame_count = self._analyze_frames(frames)
         
         results['duration_seconds'] = duration
-        results['total_frames'] = len(frames)
-        results['analyzed_frames'] = min(len(frames), max_frames)
+        results['total_frames'] = frame_count
+        results['analyzed_frames'] = min(frame_count, max_frames)
         
-        if not frames:
+        if not frame_count:
             print("⚠️  No frames extracted from video")
             return results
         
-        print(f"  Extracted {len(frames)} frames (FPS: {fps}, Duration: {duration}s)")
-        
-        # Analyze frames using image detector
-        frame_results = self._analyze_frames(frames)
+        print(f"  Analyzed {frame_count} frames (FPS: {fps}, Duration: {duration}s)")
         results['frame_analysis'] = frame_results
         
         # Detect temporal patterns
@@ -336,56 +424,160 @@ class VideoModerationModel:
         Returns:
             Tuple of (frames, fps, duration)
         """
-        frames = []
+        cap, fps, duration = self._open_video(video_path)
+        if cap is None:
+            return [], 0, 0
+        return list(self._frame_stream(cap, sample_rate, max_frames)), fps, duration
+    
+    def _open_video(self, video_path: str) -> tuple:
+        """
+        Open a video for decoding (PyAV when installed, otherwise OpenCV)
+        
+        Args:
+            video_path: Path to video file
+        
+        Returns:
+            Tuple of (PyAV container / cv2.VideoCapture, or None on failure, fps, duration)
+        """
+        if av is not None:
+            try:
+                container = av.open(video_path)
+                stream = container.streams.video[0]
+                fps = float(stream.average_rate or 0)
+                if stream.frames and fps > 0:
+                    duration = stream.frames / fps
+                elif stream.duration is not None:
+                    duration = float(stream.duration * stream.time_base)
+                else:
+                    duration = (container.duration or 0) / av.time_base
+                return container, fps, duration
+            except Exception as e:
+                print(f"  ⚠️  PyAV could not open video ({e}), trying OpenCV")
         
         try:
             cap = cv2.VideoCapture(video_path)
             
             if not cap.isOpened():
                 print(f"❌ Could not open video: {video_path}")
-                return [], 0, 0
+                return None, 0, 0
             
             fps = cap.get(cv2.CAP_PROP_FPS)
             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             duration = total_frames / fps if fps > 0 else 0
-            
+            return cap, fps, duration
+        
+        except Exception as e:
+            print(f"❌ Error extracting frames: {e}")
+            return None, 0, 0
+    
+    def _frame_stream(self, cap, sample_rate: int = 30,
+                      max_frames: int = 100) -> Iterator[Image.Image]:
+        """
+        Decode sampled frames one at a time (releases the capture when done)
+        
+        Args:
+            cap: Opened PyAV container or cv2.VideoCapture from _open_video
+            sample_rate: Sample every Nth frame
+            max_frames: Maximum frames to yield
+        
+        Returns:
+            Iterator of RGB PIL Images
+        """
+        if not isinstance(cap, cv2.VideoCapture):
+            yield from self._frame_stream_av(cap, sample_rate, max_frames)
+            return
+        
+        try:
             frame_count = 0
             extracted_count = 0
             
             while cap.isOpened() and extracted_count < max_frames:
+                # Sample frames; skipped frames are only grabbed (decoded,
+                # but never copied out or color-converted)
+                if frame_count % sample_rate != 0:
+                    if not cap.grab():
+                        break
+                    frame_count += 1
+                    continue
+                
                 ret, frame = cap.read()
                 
                 if not ret:
                     break
                 
-                # Sample frames
-                if frame_count % sample_rate == 0:
-                    # Convert BGR to RGB
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    # Convert to PIL Image
-                    pil_image = Image.fromarray(frame_rgb)
-                    frames.append(pil_image)
-                    extracted_count += 1
-                
+                # Convert BGR to RGB
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                # Convert to PIL Image
+                yield Image.fromarray(frame_rgb)
+                extracted_count += 1
                 frame_count += 1
-            
+        
+        except Exception as e:
+            print(f"❌ Error extracting frames: {e}")
+        finally:
             cap.release()
+    
+    def _frame_stream_av(self, container, sample_rate: int,
+                         max_frames: int) -> Iterator[Image.Image]:
+        """PyAV version of _frame_stream (closes the container when done)"""
+        try:
+            stream = container.streams.video[0]
+            # Frame-threaded decoding in FFmpeg's own worker threads
+            stream.thread_type = 'AUTO'
             
-            return frames, fps, duration
+            extracted_count = 0
+            for frame_count, frame in enumerate(container.decode(stream)):
+                if extracted_count >= max_frames:
+                    break
+                # Only sampled frames are converted out of YUV
+                if frame_count % sample_rate == 0:
+                    yield frame.to_image()
+                    extracted_count += 1
         
         except Exception as e:
             print(f"❌ Error extracting frames: {e}")
-            return [], 0, 0
+        finally:
+            container.close()
     
-    def _analyze_frames(self, frames: List[Image.Image]) -> List[Dict]:
-        """Analyze each frame using image detector"""
+    def _analyze_frames(self, frames: Iterable[Image.Image]) -> tuple:
+        """
+        Analyze the frames with the image detector, one batched pass per chunk
+        
+        Args:
+            frames: Frames in order (a list, or a stream consumed as it decodes)
+        
+        Returns:
+            Tuple of (per-frame results, number of frames taken from the input)
+        """
         frame_results = []
         
-        print(f"  Analyzing {len(frames)} frames...")
+        print("  Analyzing frames...")
         
-        for i, frame in enumerate(frames):
+        batch_size = self.frame_batch_size
+        frames = iter(frames)
+        start = 0
+        while True:
+            batch = list(itertools.islice(frames, batch_size))
+            if not batch:
+                break
             try:
-                result = self.image_detector.analyze_image(frame)
+                results = self.image_detector.batch_analyze(
+                    batch, batch_size=batch_size, use_cache=False
+                )
+            except Exception as e:
+                # Retry the chunk frame by frame so one bad frame only drops itself
+                print(f"  ⚠️  Batch analysis failed ({e}), retrying frames one by one")
+                results = []
+                for i, frame in enumerate(batch, start):
+                    try:
+                        results.append(self.image_detector.batch_analyze([frame], use_cache=False)[0])
+                    except Exception as e:
+                        print(f"  ⚠️  Frame {i} analysis failed: {e}")
+                        results.append(None)
+            
+            for i, result in enumerate(results, start):
+                if result is None:
+                    continue
                 frame_results.append({
                     'frame_index': i,
                     'risk_score': result['risk_score'],
@@ -395,10 +587,9 @@ class VideoModerationModel:
                     'hate_score': result['hate_score'],
                     'child_safety_score': result['child_safety_score']
                 })
-            except Exception as e:
-                print(f"  ⚠️  Frame {i} analysis failed: {e}")
+            start += len(batch)
         
-        return frame_results
+        return frame_results, start
     
     def _analyze_temporal_patterns(self, frame_results: List[Dict]) -> Dict:
         """
@@ -658,8 +658,8 @@ def dashboard_page():
     
     # Get real stats from database
     try:
-        from core.database import ModerationDatabase
-        db = ModerationDatabase()
+        from core.database import get_database
+        db = get_database()
         stats = db.get_stats()
         
         # Get queue counts
@@ -1125,7 +1125,7 @@ def blockchain_page():
             
             Currently using local blockchain simulator:
             - No network connection required
-            - Records stored in `blockchain_sim/audit_chain.json`
+            - Records stored in `blockchain_sim/audit_chain.jsonl`
             - Perfect for development and testing
             
             **To enable real blockchain:**
@@ -1276,8 +1276,8 @@ def escalations_page():
     
     # Get escalations from database
     try:
-        from core.database import ModerationDatabase
-        db = ModerationDatabase()
+        from core.database import get_database
+        db = get_database()
         
         # Filter options
         col1, col2, col3 = st.columns(3)
@@ -7,10 +7,10 @@ import streamlit as st
 import requests
 from datetime import datetime
 import pandas as pd
-from core.database import ModerationDatabase
+from core.database import get_database
 
 # Initialize database
-db = ModerationDatabase()
+db = get_database()
 
 # Page config
 st.set_page_config(
@@ -0,0 +1,179 @@
+"""
+Test Audit Queue
+Verifies the background blockchain audit pipeline with a stubbed writer
+"""
+
+import threading
+import time
+
+from core.blockchain import BlockchainAuditManager
+
+ANALYSIS = {
+    "risk_score": 85,
+    "risk_label": "High",
+    "action": "Human Review Required",
+    "priority": "HIGH",
+    "categories": ["Test"],
+    "reasons": ["Test reason"]
+}
+
+
+def make_manager(write, uploads=None, **kwargs):
+    """
+    Manager whose IPFS upload + transaction is replaced by write(content_id)
+    
+    Batch uploads are recorded in uploads (lists of content_ids) and give
+    each record the CID "cid:<content_id>".
+    """
+    manager = BlockchainAuditManager(provider_url="http://127.0.0.1:1", **kwargs)
+    # Pretend a contract and account are configured; nothing reaches the node
+    manager.contract = object()
+    manager.account = object()
+
+    def store_batch(items):
+        ids = [item["content_id"] for item in items]
+        if uploads is not None:
+            uploads.append(ids)
+        return [f"cid:{content_id}" for content_id in ids]
+
+    def log_sync(content_id, analysis, audit_data, ipfs_hash=None):
+        assert ipfs_hash in (None, f"cid:{content_id}")
+        return write(content_id)
+
+    manager.store_batch_to_ipfs = store_batch
+    manager._log_analysis_sync = log_sync
+    return manager
+
+
+def test_queued_log_resolves_and_flushes():
+    """Queued audits resolve to the writer's result and flush() waits for them"""
+    print("Testing queued audit logging...")
+
+    written = []
+
+    def write(content_id):
+        time.sleep(0.01)
+        written.append(content_id)
+        return f"0x{content_id}"
+
+    manager = make_manager(write, ipfs_workers=2)
+    try:
+        futures = [
+            manager.log_analysis_to_blockchain(f"post_{i}", ANALYSIS, "Test content")
+            for i in range(10)
+        ]
+        manager.flush(5)
+
+        assert sorted(written) == sorted(f"post_{i}" for i in range(10))
+        assert [f.result(0) for f in futures] == [f"0x{'post_' + str(i)}" for i in range(10)]
+    finally:
+        manager.close()
+
+    print("✓ Queued audits written and flushed")
+
+
+def test_queued_audits_share_one_upload():
+    """Audits waiting together go to IPFS in one batch request"""
+    print("Testing batched IPFS uploads...")
+
+    release = threading.Event()
+    started = threading.Event()
+    uploads = []
+
+    def write(content_id):
+        if content_id == "blocker":
+            started.set()
+            release.wait(5)
+        return content_id
+
+    manager = make_manager(write, uploads, ipfs_workers=1)
+    try:
+        manager.log_analysis_to_blockchain("blocker", ANALYSIS, "Test content")
+        assert started.wait(5)
+        futures = [
+            manager.log_analysis_to_blockchain(f"post_{i}", ANALYSIS, "Test content")
+            for i in range(5)
+        ]
+        release.set()
+        manager.flush(5)
+
+        assert [f.result(0) for f in futures] == [f"post_{i}" for i in range(5)]
+        assert uploads == [[f"post_{i}" for i in range(5)]]
+    finally:
+        release.set()
+        manager.close()
+
+    print("✓ Waiting audits uploaded together")
+
+
+def test_full_queue_logs_synchronously():
+    """With every queue slot taken the caller logs the record itself"""
+    print("Testing a full audit queue...")
+
+    release = threading.Event()
+    threads = {}
+
+    def write(content_id):
+        threads[content_id] = threading.current_thread()
+        if content_id == "blocker":
+            release.wait(5)
+        return content_id
+
+    manager = make_manager(write, ipfs_workers=1, queue_size=1)
+    try:
+        blocker = manager.log_analysis_to_blockchain("blocker", ANALYSIS, "Test content")
+        while "blocker" not in threads:
+            time.sleep(0.01)
+        queued = manager.log_analysis_to_blockchain("queued", ANALYSIS, "Test content")
+        overflow = manager.log_analysis_to_blockchain("overflow", ANALYSIS, "Test content")
+
+        # Resolved before returning, in the caller's thread
+        assert overflow.result(0) == "overflow"
+        assert threads["overflow"] is threading.current_thread()
+
+        release.set()
+        manager.flush(5)
+        assert blocker.result(0) == "blocker"
+        assert queued.result(0) == "queued"
+    finally:
+        release.set()
+        manager.close()
+
+    print("✓ Overflow logged synchronously")
+
+
+def test_cancelled_log_is_skipped():
+    """A cancelled Future is skipped and the worker keeps draining"""
+    print("Testing a cancelled audit...")
+
+    release = threading.Event()
+    written = []
+
+    def write(content_id):
+        if content_id == "blocker":
+            release.wait(5)
+        written.append(content_id)
+        return content_id
+
+    manager = make_manager(write, ipfs_workers=1)
+    try:
+        manager.log_analysis_to_blockchain("blocker", ANALYSIS, "Test content")
+        cancelled = manager.log_analysis_to_blockchain("cancelled", ANALYSIS, "Test content")
+        assert cancelled.cancel()
+        release.set()
+
+        after = manager.log_analysis_to_blockchain("after", ANALYSIS, "Test content")
+        assert after.result(5) == "after"
+        assert written == ["blocker", "after"]
+    finally:
+        release.set()
+        manager.close()
+
+    print("✓ Cancelled audit skipped")
+
+
+if __name__ == "__main__":
+    test_queued_log_resolves_and_flushes()
+    test_queued_audits_share_one_upload()
+    test_full_queue_logs_synchronously()
+    test_cancelled_log_is_skipped()
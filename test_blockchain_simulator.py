@@ -0,0 +1,156 @@
+"""
+Test Local Blockchain Simulator
+Verifies the JSONL chain, its sidecar index and sharing one storage_path
+"""
+
+import json
+import multiprocessing
+import tempfile
+from pathlib import Path
+
+from core.blockchain import LocalBlockchainSimulator
+
+ANALYSIS = {
+    "risk_score": 85,
+    "risk_label": "High",
+    "action": "Human Review Required",
+    "priority": "HIGH",
+    "categories": ["Test"],
+    "reasons": ["Test reason"]
+}
+
+
+def read_chain(storage_path) -> list:
+    """Blocks of a simulator chain, asserting the hashes link up"""
+    sim = LocalBlockchainSimulator(storage_path)
+    try:
+        lines = (Path(storage_path) / "audit_chain.jsonl").read_text().splitlines()
+        blocks = [json.loads(line) for line in lines]
+        previous_hash = "0" * 64
+        for number, block in enumerate(blocks):
+            assert block["block_number"] == number
+            assert block["previous_hash"] == previous_hash
+            stored_hash = block.pop("hash")
+            assert sim.hash_data(block).hex() == stored_hash
+            block["hash"] = previous_hash = stored_hash
+        return blocks
+    finally:
+        sim.close()
+
+
+def _log_from_process(storage_path: str, worker: int, count: int):
+    sim = LocalBlockchainSimulator(storage_path)
+    for i in range(count):
+        sim.log_analysis(f"proc{worker}_{i}", ANALYSIS, "Test content")
+    sim.close()
+
+
+def test_shared_storage_path():
+    """Two simulators on one path append to a single valid chain"""
+    print("Testing two simulators on one storage_path...")
+
+    with tempfile.TemporaryDirectory() as storage_path:
+        first = LocalBlockchainSimulator(storage_path)
+        second = LocalBlockchainSimulator(storage_path)
+        for i in range(5):
+            first.log_analysis(f"first_{i}", ANALYSIS, "Test content")
+            second.log_analysis(f"second_{i}", ANALYSIS, "Test content")
+
+        # Each sees the other's records
+        assert first.get_audit_record("second_4")["content_id"] == "second_4"
+        assert second.get_audit_record("first_0")["block_number"] == 0
+        assert first.get_blockchain_stats()["total_blocks"] == 10
+        first.close()
+        second.close()
+
+        assert len(read_chain(storage_path)) == 10
+
+    print("✓ Shared chain is valid")
+
+
+def test_concurrent_processes():
+    """Processes appending at the same time keep the chain linked"""
+    print("Testing concurrent appends from several processes...")
+
+    with tempfile.TemporaryDirectory() as storage_path:
+        LocalBlockchainSimulator(storage_path).close()
+        processes = [
+            multiprocessing.Process(target=_log_from_process, args=(storage_path, worker, 25))
+            for worker in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            assert process.exitcode == 0
+
+        blocks = read_chain(storage_path)
+        assert len(blocks) == 100
+        assert len({block["content_id"] for block in blocks}) == 100
+
+    print("✓ Concurrent appends stay on one chain")
+
+
+def test_index_reload():
+    """close() saves the index and the next simulator starts from it"""
+    print("Testing index reload...")
+
+    with tempfile.TemporaryDirectory() as storage_path:
+        sim = LocalBlockchainSimulator(storage_path)
+        for i in range(3):
+            sim.log_analysis(f"post_{i}", ANALYSIS, "Test content")
+        sim.close()
+
+        saved = json.loads((Path(storage_path) / "audit_chain.idx.json").read_text())
+        assert saved["block_count"] == 3
+        assert set(saved["index"]) == {"post_0", "post_1", "post_2"}
+
+        class NoRescanSimulator(LocalBlockchainSimulator):
+            def _rebuild_index(self):
+                raise AssertionError("index was rebuilt instead of loaded")
+
+        reloaded = NoRescanSimulator(storage_path)
+        try:
+            assert reloaded.get_audit_record("post_1")["block_number"] == 1
+            reloaded.log_analysis("post_3", ANALYSIS, "Test content")
+        finally:
+            reloaded.close()
+
+        assert len(read_chain(storage_path)) == 4
+
+    print("✓ Index reloaded without a rescan")
+
+
+def test_legacy_chain_migration():
+    """An old single-document audit_chain.json is converted to JSONL"""
+    print("Testing legacy chain migration...")
+
+    with tempfile.TemporaryDirectory() as storage_path:
+        # Build a valid two-block chain in the old format
+        sim = LocalBlockchainSimulator(storage_path)
+        sim.log_analysis("old_0", ANALYSIS, "Test content")
+        sim.log_analysis("old_1", ANALYSIS, "Test content")
+        sim.close()
+        blocks = read_chain(storage_path)
+        for name in ("audit_chain.jsonl", "audit_chain.idx.json"):
+            (Path(storage_path) / name).unlink()
+        (Path(storage_path) / "audit_chain.json").write_text(json.dumps({"blocks": blocks}))
+
+        sim = LocalBlockchainSimulator(storage_path)
+        try:
+            assert sim.get_audit_record("old_1")["hash"] == blocks[1]["hash"]
+            sim.log_analysis("new_0", ANALYSIS, "Test content")
+        finally:
+            sim.close()
+
+        migrated = read_chain(storage_path)
+        assert [block["content_id"] for block in migrated] == ["old_0", "old_1", "new_0"]
+
+    print("✓ Legacy chain migrated")
+
+
+if __name__ == "__main__":
+    test_shared_storage_path()
+    test_concurrent_processes()
+    test_index_reload()
+    test_legacy_chain_migration()
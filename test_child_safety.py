@@ -0,0 +1,69 @@
+"""
+Test Child Safety Detection
+Verifies long text is scanned in full and in linear time
+"""
+
+import re
+import time
+
+from core.signals.enhanced_child_safety import EnhancedChildSafetyDetector, _GapPattern
+
+CRITICAL_TEXT = (
+    "Kids can work to help parents, don't inform parents. "
+    "Salary $200 per month. Come to secret location"
+)
+
+
+def test_long_prefix_is_scanned():
+    """Padding in front of harmful text does not hide it"""
+    print("Testing a long benign prefix...")
+
+    detector = EnhancedChildSafetyDetector()
+    expected = detector.detect(CRITICAL_TEXT)
+    assert expected['child_score'] == 1.0
+
+    padded = detector.detect("hello world. " * 5000 + CRITICAL_TEXT)
+    assert padded['child_score'] == expected['child_score']
+    assert padded['child_flag'] and padded['severity'] == 'critical'
+
+    print("✓ Harmful text after 65k characters still detected")
+
+
+def test_gap_patterns_match_re():
+    """_GapPattern finds the same matches as re, including across lines"""
+    print("Testing '.*' patterns against re...")
+
+    detector = EnhancedChildSafetyDetector()
+    texts = [
+        "work with the kid", "kid\nwork", "work\nkid", "the kid will work\nnow",
+        "don't\ntell your parents", "don't tell\nyour parents", "salary salary child",
+        "$20 for the kid", "$ for the kid", "meet meet meet\nmeet the child",
+        "hide from parent", "coworker kids", "work" + " x" * 100 + " minor",
+    ]
+    for pattern in detector.exploitation_patterns:
+        if '.*' not in pattern:
+            continue
+        for text in texts:
+            expected = re.compile(pattern, re.IGNORECASE).search(text) is not None
+            assert (_GapPattern(pattern, re.IGNORECASE).search(text) is not None) == expected, (pattern, text)
+
+    print("✓ Same matches as re")
+
+
+def test_many_heads_without_tail_is_fast():
+    """A head repeated across long text without a tail stays linear"""
+    print("Testing a long text of repeated pattern heads...")
+
+    detector = EnhancedChildSafetyDetector()
+    start = time.perf_counter()
+    result = detector.detect("work meet secret alone " * 20000)
+    assert time.perf_counter() - start < 5
+    assert result['exploitation_matches'] > 0
+
+    print("✓ Long text scanned quickly")
+
+
+if __name__ == "__main__":
+    test_long_prefix_is_scanned()
+    test_gap_patterns_match_re()
+    test_many_heads_without_tail_is_fast()
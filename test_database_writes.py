@@ -0,0 +1,60 @@
+"""
+Test Database Audit Writes
+Verifies queued audit-log inserts survive a failing row
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from core.database import ModerationDatabase
+
+
+def test_bad_row_keeps_the_rest_of_the_batch():
+    """One failing insert does not drop the rows queued with it"""
+    print("Testing a batch with one bad row...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ModerationDatabase(os.path.join(tmp, "audit.db"), write_batch_window=1.0)
+        try:
+            db.log_action("post_1", "remove", "ok")
+            db.log_action("post_2", None, "ok")  # action_type is NOT NULL
+            db.log_webhook_delivery("post_3", "https://example.com/hook", 200, "ok")
+            db.log_action("post_4", "warn", "ok")
+            db.flush_writes()
+
+            conn = db._get_conn()
+            actions = [row[0] for row in conn.execute("SELECT content_id FROM action_log ORDER BY id")]
+            webhooks = [row[0] for row in conn.execute("SELECT content_id FROM webhook_log")]
+            assert actions == ["post_1", "post_4"]
+            assert webhooks == ["post_3"]
+        finally:
+            db.close()
+
+    print("✓ Only the bad row was lost")
+
+
+def test_inline_write_error_reaches_caller():
+    """An insert written in the caller's thread still raises on failure"""
+    print("Testing an inline write error...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ModerationDatabase(os.path.join(tmp, "audit.db"), write_queue_size=1)
+        try:
+            db._start_writer = lambda: False  # write every insert inline
+            db.log_action("post_1", "remove", "ok")
+            try:
+                db.log_action("post_2", None, "ok")
+            except sqlite3.IntegrityError:
+                pass
+            else:
+                raise AssertionError("inline write error was swallowed")
+        finally:
+            db.close()
+
+    print("✓ Inline write error raised")
+
+
+if __name__ == "__main__":
+    test_bad_row_keeps_the_rest_of_the_batch()
+    test_inline_write_error_reaches_caller()
@@ -0,0 +1,51 @@
+"""
+Test Compiled Score Core
+Verifies the Cython score core matches improved_scoring._score_core
+"""
+
+import random
+
+import pytest
+
+from core.signals.improved_scoring import _score_core
+
+# Threshold values of the cascade and their neighbours, plus the ends
+EDGE_SCORES = [0.0, 0.5, 0.6, 0.7, 1.0, 0.5000001, 0.5999999, 0.6000001, 0.6999999, 0.7000001]
+
+
+def load_score_core():
+    """The compiled score_core, built with pyximport if it is not built in place"""
+    try:
+        from core.signals._scoring_cy import score_core
+    except ImportError:
+        pyximport = pytest.importorskip("pyximport")
+        pyximport.install(language_level=3)
+        from core.signals._scoring_cy import score_core
+    return score_core
+
+
+def test_compiled_core_matches_score_core():
+    """score_core and _score_core agree on random and threshold inputs"""
+    print("Testing the compiled score core against _score_core...")
+
+    score_core = load_score_core()
+    rng = random.Random(0)
+
+    def score():
+        return rng.choice(EDGE_SCORES) if rng.random() < 0.5 else rng.random()
+
+    for _ in range(100000):
+        args = (
+            score(), score(), score(), score(), score(),
+            rng.randrange(5), rng.random() < 0.5, rng.random() < 0.3,
+            rng.randrange(5), rng.randrange(4), rng.randrange(4), rng.randrange(3)
+        )
+        expected_score, expected_action = _score_core(*args)
+        compiled_score, compiled_action = score_core(*args)
+        assert (compiled_score, compiled_action) == (expected_score, bool(expected_action)), args
+
+    print("✓ Compiled core matches")
+
+
+if __name__ == "__main__":
+    test_compiled_core_matches_score_core()
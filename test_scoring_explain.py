@@ -0,0 +1,114 @@
+"""
+Test Scoring + Explanations
+Verifies the improved scorer's output works with the explain module
+"""
+
+import json
+
+import numpy as np
+
+from core import scoring
+from core.explain import generate_causal_chain, generate_reasons
+from core.signals import improved_scoring
+from core.signals.improved_scoring import (
+    SignalFrame, calculate_improved_harm_score, make_specialized_scorer
+)
+
+SIGNALS = {
+    'emotion_score': 0.2,
+    'cta_score': 0.1,
+    'tox_score': 0.85,
+    'context_score': 0.0,
+    'child_score': 0.0,
+    'child_flag': False,
+    'toxicity_severity': 'high',
+    'requires_immediate_action': False,
+    'toxicity_categories': ['Hate Speech'],
+    'child_severity': 'none',
+    'child_exploitation_matches': 0,
+    'child_combination_matches': 0,
+    'emotions': {},
+    'cta_phrases': [],
+    'context_topic': 'general',
+}
+
+
+def test_breakdown_is_dict():
+    """The breakdown keeps the label -> score dict schema, also through JSON"""
+    print("Testing breakdown schema...")
+
+    for scorer in (calculate_improved_harm_score, make_specialized_scorer(SIGNALS)):
+        breakdown = scorer(SIGNALS)['breakdown']
+        assert isinstance(breakdown, dict)
+        assert list(breakdown) == [
+            'Child Safety', 'Toxicity', 'Emotion', 'Call-to-Action', 'Context Sensitivity'
+        ]
+        assert json.loads(json.dumps(breakdown)) == breakdown
+
+    print("✓ Breakdown is a label -> score dict")
+
+
+def test_causal_chain_on_scores():
+    """generate_causal_chain / generate_reasons accept the scorer's output"""
+    print("Testing explanations on scorer output...")
+
+    for scorer in (calculate_improved_harm_score, make_specialized_scorer(SIGNALS)):
+        result = scorer(SIGNALS)
+        chain = generate_causal_chain(SIGNALS, result)
+        assert chain.startswith(f"**Harm Pathway ({result['risk_label']} Risk):**")
+        assert generate_reasons(SIGNALS, result)
+
+    print("✓ Explanations generated")
+
+
+def test_batch_matches_single_item():
+    """Both scorers' batch functions take one SignalFrame and match their scalar scores"""
+    print("Testing batch scoring against single-item scoring...")
+
+    signals_list = [
+        SIGNALS,
+        dict(SIGNALS, tox_score=0.2, toxicity_severity='low', toxicity_categories=[]),
+        dict(SIGNALS, child_score=0.9, child_flag=True, child_severity='critical'),
+        dict(SIGNALS, emotion_score=0.7, cta_score=0.8, toxicity_categories=['Hate Speech', 'Threats/Violence']),
+    ]
+    frame = SignalFrame.from_signals(signals_list)
+    for module in (scoring, improved_scoring):
+        batch = module.calculate_improved_harm_score_batch(frame)
+        expected = [module.calculate_improved_harm_score(signals) for signals in signals_list]
+        assert batch['risk_score'].tolist() == [result['risk_score'] for result in expected]
+        assert batch['risk_label'].tolist() == [result['risk_label'] for result in expected]
+
+    print("✓ Batch scores match")
+
+
+def test_large_batch_with_int64_columns():
+    """A SignalFrame with int64 integer columns scores on the large-batch path too"""
+    print("Testing a large batch with int64 columns...")
+
+    n = improved_scoring.PARALLEL_MIN_ITEMS
+    rng = np.random.default_rng(0)
+    columns = dict(
+        emotion=rng.random(n), tox=rng.random(n), cta=rng.random(n),
+        context=rng.random(n), child=rng.random(n),
+        flags=rng.integers(0, 4, n),
+        toxicity_severity=rng.integers(0, 5, n),
+        child_severity=rng.integers(0, 5, n),
+        toxicity_cat_mask=rng.integers(0, 128, n),
+        child_exploitation_matches=rng.integers(0, 4, n),
+        child_combination_matches=rng.integers(0, 3, n),
+    )
+    batch = improved_scoring.calculate_improved_harm_score_batch(SignalFrame(**columns))
+
+    # Same scores as the first rows scored as a small (NumPy path) batch
+    small = SignalFrame(**{name: column[:100] for name, column in columns.items()})
+    expected = improved_scoring.calculate_improved_harm_score_batch(small)
+    assert batch['risk_score'][:100].tolist() == expected['risk_score'].tolist()
+
+    print("✓ int64 columns accepted")
+
+
+if __name__ == "__main__":
+    test_breakdown_is_dict()
+    test_causal_chain_on_scores()
+    test_batch_matches_single_item()
+    test_large_batch_with_int64_columns()